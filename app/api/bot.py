@@ -1,9 +1,21 @@
-from typing import Any, List, Type
+from typing import Any, List, Literal, Type
 
 from aiogram import BaseMiddleware, Bot, Dispatcher, Router
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.webhook import aiohttp_server
+from aiohttp import web
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
-__all__ = ["create_bot"]
+from app.api.middleware import middlewares as bot_middlewares
+from app.api.servises import report_executor
+from app.api.servises.fsm.postgres_storage import PostgresStorage
+from app.api.servises.partitions import PartitionMaintainer
+from app.core.config import settings
+from app.db.connector import PostgresConnector
+
+__all__ = ["create_bot", "create_storage", "create_webhook_app"]
 
 
 async def register_all_routers(dp: Dispatcher, routers: List[Router]):
@@ -33,22 +45,122 @@ async def register_all_middleware(
         dp.update.middleware(middleware(data))
 
 
+def create_storage(
+    storage_type: Literal["postgres", "memory"],
+    ttl: int,
+    flush_interval: float,
+    cache_size: int,
+) -> BaseStorage:
+    """
+    Создает хранилище состояний FSM.
+
+    :param storage_type: str - тип хранилища: postgres или memory.
+    :param ttl: int - срок хранения состояния без обращений, секунды.
+    :param flush_interval: float - период записи состояний в базу, секунды.
+    :param cache_size: int - количество состояний в кэше процесса.
+    :return: BaseStorage - хранилище состояний.
+    """
+    if storage_type == "memory":
+        return MemoryStorage()
+    connector = PostgresConnector()
+    return PostgresStorage(
+        session_maker=connector.async_session,
+        ttl=ttl,
+        flush_interval=flush_interval,
+        cache_size=cache_size,
+        engine=connector.engine,
+    )
+
+
 async def create_bot(
-    token: str, routers: List[Router], middlewares: List[BaseMiddleware], texts: dict
+    token: str,
+    routers: List[Router],
+    middlewares: List[BaseMiddleware],
+    texts: dict,
+    storage: BaseStorage = None,
+    session_maker: sessionmaker[AsyncSession] = None,
 ):
     """
     Создает экземпляры бота и диспетчера с зарегистрированными роутерами и миддлварами.
 
+    Последним регистрируется DBSessionMiddleware, поэтому сессия базы данных
+    открыта только на время работы обработчика. При старте диспетчера заранее
+    создаются секции таблицы трат на ближайшие месяцы, затем они проверяются
+    периодически. При остановке диспетчера останавливается пул построения отчетов.
+
     :param token: str - токен для бота.
     :param routers: List[Router] - список роутеров для регистрации.
     :param middlewares: List[BaseMiddleware] - список миддлваров для регистрации.
     :param texts: dict - словарь с текстами для миддлваров.
+    :param storage: BaseStorage - хранилище состояний FSM, по умолчанию MemoryStorage.
+    :param session_maker: sessionmaker - фабрика сессий базы данных, по умолчанию
+    фабрика PostgresConnector.
     :return: Tuple[Bot, Dispatcher] - объекты бота и диспетчера.
     """
     bot = Bot(token=token)
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+    dp = Dispatcher(storage=storage or MemoryStorage())
 
     await register_all_routers(dp=dp, routers=routers)
     await register_all_middleware(dp=dp, middlewares=middlewares, data=texts)
+    session_maker = session_maker or PostgresConnector().async_session
+    dp.update.middleware(
+        bot_middlewares.DBSessionMiddleware(session_maker=session_maker)
+    )
+    partitions = PartitionMaintainer(
+        session_maker=session_maker,
+        months_ahead=settings.PARTITIONS_MONTHS_AHEAD,
+        interval=settings.PARTITIONS_CHECK_INTERVAL,
+    )
+    dp.startup.register(partitions.start)
+    dp.shutdown.register(partitions.stop)
+    dp.shutdown.register(report_executor.shutdown)
     return bot, dp
+
+
+def create_webhook_app(
+    bot: Bot,
+    dp: Dispatcher,
+    path: str,
+    max_concurrency: int,
+    secret_token: str = None,
+    base_url: str = None,
+) -> web.Application:
+    """
+    Создает aiohttp-приложение, принимающее обновления через вебхук.
+
+    Обновления обрабатываются в фоне, одновременно не больше max_concurrency.
+    Если задан base_url, при старте приложения вебхук регистрируется в Telegram
+    по адресу base_url + path. Без base_url приложение можно проверять локально,
+    отправляя JSON обновления POST-запросом на path.
+
+    :param bot: Bot - объект бота.
+    :param dp: Dispatcher - объект диспетчера.
+    :param path: str - путь, на который приходят обновления.
+    :param max_concurrency: int - максимальное количество одновременно
+    обрабатываемых обновлений.
+    :param secret_token: str - секрет, который Telegram передает в заголовке
+    X-Telegram-Bot-Api-Secret-Token.
+    :param base_url: str - внешний адрес бота за обратным прокси.
+    :return: web.Application - приложение aiohttp.
+    """
+    dp.update.outer_middleware(
+        bot_middlewares.ConcurrencyLimitMiddleware(limit=max_concurrency)
+    )
+
+    if base_url:
+
+        async def set_webhook():
+            await bot.set_webhook(
+                url=f"{base_url.rstrip('/')}{path}",
+                secret_token=secret_token,
+                allowed_updates=dp.resolve_used_update_types(),
+            )
+
+        dp.startup.register(set_webhook)
+
+    app = web.Application()
+    aiohttp_server.SimpleRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=secret_token
+    ).register(app, path=path)
+    aiohttp_server.setup_application(app, dp, bot=bot)
+    return app
@@ -1,20 +1,49 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Callable
 
-from app.db.connector import PostgresConnector
+from sqlalchemy.ext.asyncio import AsyncSession
 
 __all__ = ["BaseController"]
 
 
 class BaseController:
-    _connector = PostgresConnector()
+    """
+    Базовый контроллер.
+
+    Контроллеры не открывают соединения сами: сессию базы данных на время
+    обработки обновления создает DBSessionMiddleware и передает ее в обработчик,
+    а тот - в методы контроллеров. Транзакция фиксируется один раз после
+    обработчика. Перед долгой работой без базы (построение и отправка файла)
+    контроллер может досрочно завершить транзакцию через _release_connection.
+    """
 
-    @classmethod
-    async def _get_connect(cls) -> sessionmaker[AsyncSession]:
+    @staticmethod
+    def _after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
         """
-        Получает объект сессии из пула коннектора.
+        Откладывает действие до успешной фиксации транзакции сессии.
+
+        Используется для обновления кэшей, чтобы они не расходились с базой при
+        откате транзакции.
+
+        :param session: Сессия обновления.
+        :param callback: Функция без аргументов, которую нужно вызвать после
+        фиксации.
+        :return: None
+        """
+        session.info.setdefault("after_commit", []).append(callback)
+
+    @staticmethod
+    async def _release_connection(session: AsyncSession) -> None:
+        """
+        Досрочно завершает транзакцию обновления и возвращает соединение в пул.
+
+        Изменения, сделанные до этого, фиксируются, отложенные действия
+        выполняются сразу. Следующий запрос к базе в этой же сессии возьмет
+        соединение из пула заново, а DBSessionMiddleware после обработчика
+        зафиксирует уже новую транзакцию.
 
-        :return: Объект сессии для работы с базой данных.
+        :param session: Сессия обновления.
+        :return: None
         """
-        async with cls._connector.get_session() as session:
-            return session
+        await session.commit()
+        for callback in session.info.pop("after_commit", []):
+            callback()
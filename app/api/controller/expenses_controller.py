@@ -1,17 +1,65 @@
-from collections import OrderedDict
-from datetime import timedelta
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Literal
 
 import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.controller import BaseController
+from app.api.controller import BaseController, UserController
+from app.api.servises import report_cache
 from app.api.servises.mapping.mapping import ExpenseArticleMapping
 from app.api.servises.validators.validators import (ArticleValidator,
                                                     InsertValidator)
-from app.db.models import BaseArticle
+from app.core.config import settings
+from app.db.models import Expense
 from app.db.repositories.expense_articles import ExpenseArticleRepository
 from app.utils import logged
 
 
+@dataclass
+class ExpensesPage:
+    """Страница трат статьи для удаления.
+
+    Записи (id, updated_at, summ) идут от новых к старым, labels - подписи
+    кнопок в том же порядке. По первой и последней записи строится соседняя
+    страница.
+    """
+
+    category_id: int
+    records: list[tuple[int, datetime, Decimal]]
+    labels: list[str]
+    has_newer: bool
+    has_older: bool
+
+    def to_state(self) -> dict:
+        """Преобразует страницу в словарь из JSON-типов для хранения в FSM."""
+        return {
+            "category_id": self.category_id,
+            "records": [
+                [expense_id, updated_at.isoformat(), str(summ)]
+                for expense_id, updated_at, summ in self.records
+            ],
+            "labels": self.labels,
+            "has_newer": self.has_newer,
+            "has_older": self.has_older,
+        }
+
+    @classmethod
+    def from_state(cls, data: dict) -> "ExpensesPage":
+        """Восстанавливает страницу из словаря, сохраненного в FSM."""
+        return cls(
+            category_id=data["category_id"],
+            records=[
+                (expense_id, datetime.fromisoformat(updated_at), Decimal(summ))
+                for expense_id, updated_at, summ in data["records"]
+            ],
+            labels=data["labels"],
+            has_newer=data["has_newer"],
+            has_older=data["has_older"],
+        )
+
+
 @logged()
 class ExpensesController(BaseController):
     """Контроллер для работы с затратами. Служит промежуточным слоем между роутером
@@ -19,63 +67,38 @@ class ExpensesController(BaseController):
     """
 
     _repository = ExpenseArticleRepository
-    _model: type[BaseArticle] | None = None
+    _model = Expense
+    _report_cache = report_cache
+    page_size = settings.DELETE_PAGE_SIZE
 
     @classmethod
-    def get_model(cls, article_name: str) -> None:
-        """По названию статьи на русском языке получает нужную модель БД."""
-        cls._model = ExpenseArticleMapping.get_class_from_article_name(
+    def get_category_id(cls, article_name: str) -> int | None:
+        """По названию статьи на русском языке получает идентификатор статьи."""
+        category_id = ExpenseArticleMapping.get_category_id_from_article_name(
             article_name=article_name
         )
-        cls.log.info(f"Метод get_model. Получена модель затрат: {cls._model}.")
+        cls.log.info(f"Метод get_category_id. Получена статья затрат: {category_id}.")
+        return category_id
 
     @classmethod
-    def make_a_dict(
-        cls, records: list[BaseArticle]
-    ) -> OrderedDict[BaseArticle, str] | None:
-        """Создает словарь из записей о затратах, форматируя дату с учетом
+    def make_labels(
+        cls, records: list[tuple[int, datetime, Decimal]], user_timezone: int
+    ) -> list[str]:
+        """Создает подписи записей о затратах, форматируя дату с учетом
         часового пояса пользователя.
         """
-        cls.log.info("Метод make_a_dict. Создаем словарь.")
-
-        if not records:
-            return None
-        formatted_records = OrderedDict()
-        user_timezone = records[0].user.timezone
-        for record in records:
-            dt_with_offset = record.updated_at + timedelta(hours=user_timezone)
-            formatted_time_with_offset = dt_with_offset.strftime("%d.%m.%Y %H:%M")
-            formatted_records[record] = (
-                f"Сумма: {record.summ}\nДата: {formatted_time_with_offset}"
-            )
-        return formatted_records
+        cls.log.info("Метод make_labels. Создаем подписи записей.")
 
-    @classmethod
-    def extract_article_id_from_dict(
-        cls, articles_dict: OrderedDict[BaseArticle, str], article_value: str
-    ) -> BaseArticle | None:
-        """Ищет ID статьи по ее значению в словаре статей."""
-        cls.log.info(
-            f"Метод extract_article_id_from_dict."
-            f"Поиск id затраты для значения: {article_value}."
-        )
-        for key in articles_dict.keys():
-            if articles_dict[key] == article_value:
-                cls.log.info(
-                    f"Метод extract_article_id_from_dict. "
-                    f"Найдено соответствие для {article_value}: {key}."
-                )
-                return key
-        cls.log.info(
-            f"Метод extract_article_id_from_dict."
-            f"Не найдено соответствия для {article_value}."
-        )
-        return None
+        offset = timedelta(hours=user_timezone)
+        return [
+            f"{summ} - {(updated_at + offset).strftime('%d.%m.%Y %H:%M')}"
+            for _, updated_at, summ in records
+        ]
 
     @classmethod
     async def add_expense(
-        cls, tg_id: int, article_name: str, amount: str
-    ) -> BaseArticle | str:
+        cls, session: AsyncSession, tg_id: int, article_name: str, amount: str
+    ) -> Expense | str:
         """Добавляет новую затратную статью после валидации данных."""
         cls.log.info(
             f"Метод add_expense."
@@ -91,53 +114,129 @@ class ExpensesController(BaseController):
             cls.log.error(f"Метод add_expense. Ошибка валидации: {ctx_error_message}.")
             return str(ctx_error_message)
 
-        cls.get_model(article_name=validated_data.article)
+        category_id = cls.get_category_id(article_name=validated_data.article)
 
-        async_session = await cls._get_connect()
-        async with async_session as session:
-            new_expense_article = cls._model(user_id=tg_id, summ=validated_data.amount)
-            record = await cls._repository.create(
-                session=session, item=new_expense_article
-            )
-            cls.log.info(
-                f"Метод add_expense. "
-                f"Успешно добавлена новая затратная статья: "
-                f"{tg_id=}, {validated_data.amount=}, {cls._model=}."
-            )
-            return record
+        new_expense_article = cls._model(
+            user_id=tg_id, category_id=category_id, summ=validated_data.amount
+        )
+        record = await cls._repository.create(session=session, item=new_expense_article)
+        cls._after_commit(
+            session=session, callback=lambda: cls._report_cache.bump(tg_id)
+        )
+        cls.log.info(
+            f"Метод add_expense. "
+            f"Успешно добавлена новая затратная статья: "
+            f"{tg_id=}, {validated_data.amount=}, {category_id=}."
+        )
+        return record
 
     @classmethod
-    async def delete_expense(
-        cls, articles_dict: OrderedDict[BaseArticle, str], article_value: str
-    ) -> BaseArticle | None:
-        """Удаляет статью затрат, если она найдена в словаре."""
+    def is_batch(cls, text: str | None) -> bool:
+        """Проверяет, что сообщение содержит траты в виде строк «статья сумма»,
+        а не только название статьи. У сообщений без текста (стикер, фото,
+        голосовое) text равен None, это не пакет трат.
+        """
+        if not text:
+            return False
+        lines = text.strip().splitlines()
+        if len(lines) > 1:
+            return True
+        parts = text.strip().rsplit(maxsplit=1)
+        if len(parts) < 2:
+            return False
+        try:
+            float(parts[1].replace(",", "."))
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def parse_batch(cls, text: str) -> tuple[list[InsertValidator], list[str]]:
+        """Разбирает строки «статья сумма» и валидирует каждую через
+        InsertValidator. Пустые строки пропускаются.
+
+        Возвращает валидные траты и ошибки с номерами строк.
+        """
+        expenses, errors = [], []
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            parts = line.strip().rsplit(maxsplit=1)
+            if len(parts) < 2:
+                errors.append(f"Строка {number}: нужно указать статью и сумму.")
+                continue
+            try:
+                expenses.append(InsertValidator(article=parts[0], amount=parts[1]))
+            except pydantic.ValidationError as exc:
+                ctx_error_message = exc.errors()[0]["ctx"]["error"].args[0]
+                errors.append(f"Строка {number}: {ctx_error_message}")
+        return expenses, errors
+
+    @classmethod
+    async def add_expenses(
+        cls, session: AsyncSession, tg_id: int, text: str
+    ) -> tuple[int, float] | str:
+        """Добавляет несколько трат из одного сообщения одним INSERT.
+
+        Траты добавляются, только если валидны все строки: иначе возвращается
+        текст ошибок по строкам, и ничего не записывается.
+        """
+        cls.log.info(f"Метод add_expenses. Запуск для {tg_id=}.")
+        expenses, errors = cls.parse_batch(text=text)
+        if errors:
+            cls.log.error(f"Метод add_expenses. Ошибки валидации: {errors}.")
+            return "\n".join(errors)
+
+        updated_at = datetime.utcnow()
+        rows = [
+            {
+                "user_id": tg_id,
+                "category_id": cls.get_category_id(article_name=expense.article),
+                "summ": expense.amount,
+                "updated_at": updated_at,
+            }
+            for expense in expenses
+        ]
+        count = await cls._repository.create_many(session=session, rows=rows)
+        cls._after_commit(
+            session=session, callback=lambda: cls._report_cache.bump(tg_id)
+        )
+        total = round(sum(expense.amount for expense in expenses), 2)
         cls.log.info(
-            f"Метод delete_expense. " f"Запуск удаления статьи: {article_value}."
+            f"Метод add_expenses. Добавлено трат: {count} на сумму {total} "
+            f"для {tg_id=}."
         )
+        return count, total
 
-        article = cls.extract_article_id_from_dict(
-            articles_dict=articles_dict, article_value=article_value
-        )
-        if not article:
+    @classmethod
+    async def delete_expense(
+        cls, session: AsyncSession, tg_id: int, page: ExpensesPage, index: int
+    ) -> bool:
+        """Удаляет трату, выбранную на странице, по ее первичному ключу."""
+        cls.log.info(f"Метод delete_expense. Запуск удаления записи №{index}.")
+
+        if not 0 <= index < len(page.records):
             cls.log.warning(
-                f"Метод delete_expense. "
-                f"Не найдено соответствующее значение для удаления: {article_value}."
+                f"Метод delete_expense. На странице нет записи №{index} для удаления."
             )
-            return None
+            return False
 
-        async_session = await cls._get_connect()
-        async with async_session as session:
-            delete_item = await ExpenseArticleRepository.delete(
-                session=session, item=article
+        expense_id, updated_at, _ = page.records[index]
+        deleted = await cls._repository.delete_by_key(
+            session=session, tg_id=tg_id, expense_id=expense_id, updated_at=updated_at
+        )
+        if deleted:
+            cls._after_commit(
+                session=session, callback=lambda: cls._report_cache.bump(tg_id)
             )
-            cls.log.info(f"Метод delete_expense. Затрата удалена: {article}.")
-            return delete_item
+        cls.log.info(f"Метод delete_expense. Затрата {expense_id} удалена: {deleted}.")
+        return deleted
 
     @classmethod
     async def get_expenses(
-        cls, tg_id: int, article_name: str
-    ) -> OrderedDict[BaseArticle, str] | str:
-        """Получает последние 100 записей о затратах пользователя."""
+        cls, session: AsyncSession, tg_id: int, article_name: str
+    ) -> ExpensesPage | str:
+        """Получает первую страницу последних записей о затратах пользователя."""
         try:
             validated_data = ArticleValidator(article=article_name)
             cls.log.info(
@@ -151,14 +250,61 @@ class ExpensesController(BaseController):
             )
             return str(ctx_error_message)
 
-        cls.get_model(article_name=validated_data.article)
+        category_id = cls.get_category_id(article_name=validated_data.article)
+        return await cls.get_expenses_page(
+            session=session, tg_id=tg_id, category_id=category_id
+        )
 
-        async_session = await cls._get_connect()
-        async with async_session as session:
-            records = await cls._repository.get_last_hundred_records(
-                session=session,
-                tg_id=tg_id,
-                model=cls._model,
-            )
-            cls.log.info(f"Метод get_expenses. " f"Получены записи: {len(records)}.")
-            return cls.make_a_dict(records=records)
+    @classmethod
+    async def get_expenses_page(
+        cls,
+        session: AsyncSession,
+        tg_id: int,
+        category_id: int,
+        page: ExpensesPage | None = None,
+        direction: Literal["newer", "older"] = "older",
+    ) -> ExpensesPage:
+        """Получает страницу записей о затратах, соседнюю с page в направлении
+        direction, или первую страницу, если page не передана.
+
+        Страница ищется по ключу (updated_at, id) крайней записи page, поэтому
+        ее получение не зависит от глубины истории. Запрашивается на одну запись
+        больше размера страницы, чтобы узнать, есть ли страница дальше.
+        """
+        before = after = None
+        if page and page.records and direction == "older":
+            expense_id, updated_at, _ = page.records[-1]
+            before = (updated_at, expense_id)
+        elif page and page.records:
+            expense_id, updated_at, _ = page.records[0]
+            after = (updated_at, expense_id)
+
+        records = await cls._repository.get_records_page(
+            session=session,
+            tg_id=tg_id,
+            category_id=category_id,
+            limit=cls.page_size + 1,
+            before=before,
+            after=after,
+        )
+        has_more = len(records) > cls.page_size
+        if after is not None:
+            records = records[-cls.page_size :]
+            has_newer, has_older = has_more, True
+        else:
+            records = records[: cls.page_size]
+            has_newer, has_older = before is not None, has_more
+        cls.log.info(
+            f"Метод get_expenses_page. Получены записи: {len(records)}, "
+            f"{has_newer=}, {has_older=}."
+        )
+
+        records = [tuple(record) for record in records]
+        user_timezone = await UserController.get_timezone(session=session, tg_id=tg_id)
+        return ExpensesPage(
+            category_id=category_id,
+            records=records,
+            labels=cls.make_labels(records=records, user_timezone=user_timezone),
+            has_newer=has_newer,
+            has_older=has_older,
+        )
@@ -0,0 +1,133 @@
+import asyncio
+import csv
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from typing import Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.controller.base_controller import BaseController
+from app.api.controller.user_controller import UserController
+from app.api.servises import ReportFile
+from app.api.servises.mapping.mapping import ExpenseArticleMapping
+from app.api.servises.report_builders.executor import ARCHIVE_DATE_TIME
+from app.core.config import settings
+from app.db.repositories.expense_articles import ExpenseArticleRepository
+from app.utils import logged
+
+__all__ = ["ExportController"]
+
+
+@logged()
+class ExportController(BaseController):
+    """
+    Контроллер выгрузки всей истории трат пользователя.
+
+    Траты читаются из базы частями по batch_size через курсор на стороне сервера
+    и сразу дописываются в CSV внутри ZIP-архива во временном файле. Ни вся
+    история, ни архив целиком в памяти не держатся, поэтому расход памяти не
+    зависит от количества трат. Файл совместим с импортом трат: дата по местному
+    времени пользователя, статья, сумма. После чтения транзакция обновления
+    завершается, чтобы соединение не занималось на время отправки архива.
+    """
+
+    _repository = ExpenseArticleRepository
+    batch_size = settings.EXPORT_BATCH_SIZE
+    columns = ("Дата", "Статья", "Сумма")
+    date_format = "%Y-%m-%d %H:%M:%S"
+    _articles = {
+        category: article for article, category in ExpenseArticleMapping.data.items()
+    }
+
+    @classmethod
+    async def export_expenses(cls, session: AsyncSession, tg_id: int) -> ReportFile:
+        """
+        Выгружает все траты пользователя в ZIP-архив с CSV.
+
+        :param session: Сессия базы данных.
+        :param tg_id: ID пользователя в Telegram.
+        :return: Архив во временном файле. Удалить его после отправки должен
+        вызывающий код (ReportFile.cleanup).
+        """
+        cls.log.info(f"Метод export_expenses. Выгрузка всех трат для {tg_id=}.")
+        timezone = await UserController.get_timezone(session=session, tg_id=tg_id)
+        folder = settings.REPORT_TEMP_DIR or tempfile.gettempdir()
+        os.makedirs(folder, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=".zip", dir=folder)
+        report = ReportFile(filename=f"expenses_{tg_id}.zip", path=path)
+
+        count = 0
+        try:
+            with os.fdopen(fd, "wb") as file, zipfile.ZipFile(
+                file, "w", compression=zipfile.ZIP_DEFLATED
+            ) as archive:
+                entry = zipfile.ZipInfo(
+                    f"expenses_{tg_id}.csv", date_time=ARCHIVE_DATE_TIME
+                )
+                entry.compress_type = zipfile.ZIP_DEFLATED
+                with archive.open(entry, "w", force_zip64=True) as target:
+                    text = io.TextIOWrapper(target, encoding="utf-8-sig", newline="")
+                    writer = csv.writer(text)
+                    writer.writerow(cls.columns)
+                    async for rows in cls._repository.stream_user_expenses(
+                        session=session, tg_id=tg_id, batch_size=cls.batch_size
+                    ):
+                        await asyncio.to_thread(
+                            cls._write_rows,
+                            writer=writer,
+                            rows=rows,
+                            timezone=timezone,
+                        )
+                        count += len(rows)
+                    text.flush()
+                    text.detach()
+            await cls._release_connection(session=session)
+            report.digest = await asyncio.to_thread(cls._file_digest, path=path)
+        except BaseException:
+            report.cleanup()
+            raise
+
+        cls.log.info(
+            f"Метод export_expenses. Для {tg_id=} выгружено {count} трат, "
+            f"размер архива {report.size} байт."
+        )
+        return report
+
+    @classmethod
+    def _write_rows(cls, writer, rows: Sequence[Row], timezone: int) -> None:
+        """
+        Записывает часть трат в CSV, переводя даты в местное время пользователя.
+
+        :param writer: csv.writer, связанный с файлом в архиве.
+        :param rows: Строки (дата, статья, сумма) из базы.
+        :param timezone: Часовой пояс пользователя.
+        :return: None
+        """
+        offset = timedelta(hours=timezone)
+        writer.writerows(
+            (
+                (updated_at + offset).strftime(cls.date_format),
+                cls._articles.get(category, category),
+                summ,
+            )
+            for updated_at, category, summ in rows
+        )
+
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        """
+        Считает SHA-256 файла, читая его блоками.
+
+        :param path: Путь к файлу.
+        :return: SHA-256 содержимого в шестнадцатеричном виде.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
@@ -0,0 +1,198 @@
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Awaitable, BinaryIO, Callable, Iterator
+
+import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.controller.base_controller import BaseController
+from app.api.controller.user_controller import UserController
+from app.api.servises import report_cache
+from app.api.servises.importers import ExpenseFileReader
+from app.api.servises.mapping.mapping import ExpenseArticleMapping
+from app.api.servises.validators.validators import MAX_AMOUNT, ImportValidator
+from app.core.config import settings
+from app.db.repositories.expense_articles import ExpenseArticleRepository
+from app.utils import logged
+
+__all__ = ["ImportController", "ImportResult"]
+
+
+@dataclass
+class ImportResult:
+    """
+    Итог импорта трат.
+
+    :param imported: int - сколько трат загружено.
+    :param failed: int - сколько строк не прошло проверку.
+    :param errors: list[str] - первые ошибки по строкам.
+    """
+
+    imported: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+@logged()
+class ImportController(BaseController):
+    """
+    Контроллер импорта трат из файла CSV или XLSX.
+
+    Файл читается и проверяется частями по chunk_size строк в отдельном потоке,
+    чтобы разбор не блокировал event loop. Каждая часть загружается в базу одним
+    COPY в транзакции текущего обновления. Строки с ошибками пропускаются,
+    пользователю показываются первые max_errors ошибок.
+    """
+
+    _repository = ExpenseArticleRepository
+    _report_cache = report_cache
+    chunk_size = settings.IMPORT_CHUNK_SIZE
+    max_errors = settings.IMPORT_MAX_ERRORS
+
+    @classmethod
+    async def import_expenses(
+        cls,
+        session: AsyncSession,
+        tg_id: int,
+        file: BinaryIO,
+        filename: str,
+        progress: Callable[[ImportResult], Awaitable[None]] | None = None,
+    ) -> ImportResult:
+        """
+        Импортирует траты пользователя из файла.
+
+        Строки файла: дата, статья расходов, сумма. Первая строка пропускается,
+        если это заголовок. Дата указывается по местному времени пользователя.
+
+        :param session: Сессия базы данных.
+        :param tg_id: ID пользователя в Telegram.
+        :param file: Открытый файл с тратами.
+        :param filename: Имя файла, по расширению выбирается формат.
+        :param progress: Корутина, которая получает промежуточный итог после
+        каждой загруженной части.
+        :return: Итог импорта.
+        :raises UnsupportedFileError: если формат файла не поддерживается.
+        :raises CorruptFileError: если файл поврежден. Части, загруженные до
+        ошибки, остаются в транзакции обновления.
+        """
+        cls.log.info(f"Метод import_expenses. Импорт файла {filename} для {tg_id=}.")
+        reader = ExpenseFileReader(file=file, filename=filename)
+        timezone = await UserController.get_timezone(session=session, tg_id=tg_id)
+        rows = iter(reader)
+        result = ImportResult()
+
+        done = False
+        while not done:
+            records, done = await asyncio.to_thread(
+                cls._read_chunk,
+                rows=rows,
+                tg_id=tg_id,
+                timezone=timezone,
+                result=result,
+            )
+            if records:
+                result.imported += await cls._repository.copy_many(
+                    session=session, records=records
+                )
+            if progress:
+                await progress(result)
+
+        if result.imported:
+            cls._after_commit(
+                session=session, callback=lambda: cls._report_cache.bump(tg_id)
+            )
+        cls.log.info(
+            f"Метод import_expenses. Импорт для {tg_id=} завершен: "
+            f"загружено {result.imported}, ошибок {result.failed}."
+        )
+        return result
+
+    @classmethod
+    def _read_chunk(
+        cls,
+        rows: Iterator[tuple[int, list[Any]]],
+        tg_id: int,
+        timezone: int,
+        result: ImportResult,
+    ) -> tuple[list[tuple], bool]:
+        """
+        Читает и проверяет очередную часть файла.
+
+        :param rows: Итератор строк файла с их номерами.
+        :param tg_id: ID пользователя в Telegram.
+        :param timezone: Часовой пояс пользователя.
+        :param result: Итог импорта, в который записываются ошибки.
+        :return: Записи для COPY и признак конца файла.
+        """
+        records = []
+        count = 0
+        for number, row in itertools.islice(rows, cls.chunk_size):
+            count += 1
+            if number == 1 and cls._is_header(row=row):
+                continue
+            record = cls._to_record(
+                number=number, row=row, tg_id=tg_id, timezone=timezone
+            )
+            if isinstance(record, str):
+                result.failed += 1
+                if len(result.errors) < cls.max_errors:
+                    result.errors.append(record)
+                continue
+            records.append(record)
+        return records, count < cls.chunk_size
+
+    @classmethod
+    def _to_record(
+        cls, number: int, row: list[Any], tg_id: int, timezone: int
+    ) -> tuple | str:
+        """
+        Проверяет строку файла и превращает ее в запись для COPY.
+
+        :param number: Номер строки в файле.
+        :param row: Значения ячеек строки.
+        :param tg_id: ID пользователя в Telegram.
+        :param timezone: Часовой пояс пользователя.
+        :return: Запись (user_id, category_id, summ, updated_at) или текст ошибки.
+        """
+        if len(row) < 3:
+            return f"Строка {number}: нужны дата, статья и сумма."
+
+        date, article, amount = row[:3]
+        try:
+            validated_data = ImportValidator(
+                date=date,
+                article="" if article is None else str(article),
+                amount="" if amount is None else str(amount),
+            )
+        except pydantic.ValidationError as exc:
+            ctx_error_message = exc.errors()[0]["ctx"]["error"].args[0]
+            return f"Строка {number}: {ctx_error_message}"
+
+        summ = round(Decimal(str(validated_data.amount)), 2)
+        if not summ.is_finite() or summ > MAX_AMOUNT:
+            return f"Строка {number}: Сумма должна быть числом не больше {MAX_AMOUNT}."
+
+        category_id = ExpenseArticleMapping.get_category_id_from_article_name(
+            article_name=validated_data.article
+        )
+        updated_at = validated_data.date - timedelta(hours=timezone)
+        return tg_id, category_id, summ, updated_at
+
+    @staticmethod
+    def _is_header(row: list[Any]) -> bool:
+        """
+        Проверяет, что строка - заголовок: в столбце суммы не число.
+
+        :param row: Значения ячеек строки.
+        :return: True, если строка похожа на заголовок.
+        """
+        if len(row) < 3:
+            return True
+        try:
+            float(str(row[2]).replace(",", "."))
+        except ValueError:
+            return True
+        return False
@@ -1,48 +1,57 @@
 import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controller import BaseController
+from app.api.servises import report_cache
 from app.api.servises.validators.validators import LimitsValidator
-from app.db.models import MonthlyLimits
+from app.core.config import settings
+from app.db.models import EXPENSE_CATEGORIES, MonthlyLimits
 from app.db.repositories.monthly_limits import LimitsRepository
-from app.utils import logged
+from app.utils import TTLCache, logged
 
 __all__ = ["LimitsController"]
 
 
 @logged()
 class LimitsController(BaseController):
-    """Контроллер для управления месячными лимитами пользователей."""
+    """Контроллер для управления месячными лимитами пользователей.
+
+    Лимиты кэшируются в памяти процесса по tg_id в виде словаря
+    {статья: лимит}. Изменение лимита записывается в базу, а в кэш - после
+    фиксации транзакции; до этого запись в кэше сброшена.
+    """
 
     _repository = LimitsRepository
     _model = MonthlyLimits
+    _report_cache = report_cache
+    _cache = TTLCache(maxsize=settings.LIMITS_CACHE_SIZE, ttl=settings.LIMITS_CACHE_TTL)
 
     @classmethod
-    async def init_limits(cls, tg_id: int) -> MonthlyLimits:
+    async def init_limits(cls, session: AsyncSession, tg_id: int) -> MonthlyLimits:
         """
         Инициализирует лимиты для указанного пользователя.
 
+        :param session: Сессия базы данных.
         :param tg_id: ID пользователя в Telegram.
         :return: Созданная запись с лимитами.
         """
         cls.log.info(f"Метод init_limits. Инициализация лимитов для {tg_id=}.")
-        async_session = await cls._get_connect()
-        async with async_session as session:
-            new_limits_model = cls._model(user_id=tg_id)
-            record = await cls._repository.create(
-                session=session, item=new_limits_model
-            )
-            cls.log.info(
-                f"Метод init_limits. Лимиты успешно инициализированы для tg_id={tg_id}."
-            )
-            return record
+        new_limits_model = cls._model(user_id=tg_id)
+        record = await cls._repository.create(session=session, item=new_limits_model)
+        cls._set_after_commit(session=session, tg_id=tg_id, record=record)
+        cls.log.info(
+            f"Метод init_limits. Лимиты успешно инициализированы для tg_id={tg_id}."
+        )
+        return record
 
     @classmethod
     async def update_limit(
-        cls, tg_id: int, article_name: str, article_value: str
+        cls, session: AsyncSession, tg_id: int, article_name: str, article_value: str
     ) -> MonthlyLimits | str:
         """
         Обновляет лимит для указанного пользователя по статье расходов.
 
+        :param session: Сессия базы данных.
         :param tg_id: ID пользователя в Telegram.
         :param article_name: Название статьи расходов.
         :param article_value: Новое значение лимита.
@@ -62,21 +71,79 @@ class LimitsController(BaseController):
             cls.log.error(f"Метод update_limit. Ошибка валидации: {ctx_error_message}.")
             return str(ctx_error_message)
 
-        async_session = await cls._get_connect()
-        async with async_session as session:
-            current_record = await cls._repository.read(
-                session=session, tg_id=tg_id, model=cls._model
-            )
-            cls.log.info(
-                f"Метод update_limit. "
-                f"Текущий лимит для tg_id={tg_id}: {current_record}."
-            )
-            setattr(current_record, validated_data.article, validated_data.amount)
-            updated_record = await cls._repository.update(
-                session=session, item=current_record
+        updated_record = await cls._repository.update_limit(
+            session=session,
+            tg_id=tg_id,
+            article=validated_data.article,
+            amount=validated_data.amount,
+        )
+        if updated_record:
+            cls._set_after_commit(session=session, tg_id=tg_id, record=updated_record)
+            cls._after_commit(
+                session=session, callback=lambda: cls._report_cache.bump(tg_id)
             )
-            cls.log.info(
-                f"Метод update_limit. "
-                f"Лимит обновлен для tg_id={tg_id}: {updated_record}."
+        else:
+            cls._cache.invalidate(tg_id)
+        cls.log.info(
+            f"Метод update_limit. Лимит обновлен для tg_id={tg_id}: {updated_record}."
+        )
+        return updated_record
+
+    @classmethod
+    async def get_limits(cls, session: AsyncSession, tg_id: int) -> dict | None:
+        """
+        Возвращает лимиты пользователя по статьям расходов.
+
+        :param session: Сессия базы данных.
+        :param tg_id: ID пользователя в Telegram.
+        :return: Копия словаря {статья: лимит} или None, если лимиты не заданы.
+        """
+        limits = cls._cache.get(tg_id)
+        if limits is None:
+            record = await cls._repository.read(
+                session=session, tg_id=tg_id, model=cls._model
             )
-            return updated_record
+            if not record:
+                cls.log.warning(f"Метод get_limits. Лимиты для {tg_id=} не найдены.")
+                return None
+            limits = cls._to_dict(record=record)
+            cls._cache.set(tg_id, limits)
+        return limits.copy()
+
+    @classmethod
+    def _set_after_commit(
+        cls, session: AsyncSession, tg_id: int, record: MonthlyLimits
+    ) -> None:
+        """
+        Сбрасывает лимиты пользователя в кэше и записывает новые после фиксации
+        транзакции.
+
+        :param session: Сессия базы данных.
+        :param tg_id: ID пользователя в Telegram.
+        :param record: Запись с лимитами.
+        :return: None
+        """
+        limits = cls._to_dict(record=record)
+        cls._cache.invalidate(tg_id)
+        cls._after_commit(
+            session=session, callback=lambda: cls._cache.set(tg_id, limits)
+        )
+
+    @classmethod
+    def cache_stats(cls) -> dict:
+        """
+        Возвращает статистику кэша лимитов.
+
+        :return: Словарь с попаданиями, промахами, долей попаданий и размером кэша.
+        """
+        return cls._cache.stats()
+
+    @staticmethod
+    def _to_dict(record: MonthlyLimits) -> dict:
+        """
+        Преобразует запись лимитов в словарь {статья: лимит}.
+
+        :param record: Запись с лимитами.
+        :return: Словарь лимитов по статьям расходов.
+        """
+        return {article: getattr(record, article) for article in EXPENSE_CATEGORIES}
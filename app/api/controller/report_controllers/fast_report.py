@@ -1,12 +1,11 @@
-from datetime import datetime
-from typing import Callable, Type
+from datetime import date
+from typing import Type
 
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from tabulate import tabulate
 
-from app.db import BaseArticle, MonthlyLimits
-from app.db.repositories.expense_articles import ExpenseArticleRepository
-from app.db.repositories.monthly_limits import LimitsRepository
+from app.api.controller.limits_controller import LimitsController
+from app.db.repositories.monthly_totals import MonthlyTotalsRepository
 from app.utils import logged
 
 __all__ = ["FastReport"]
@@ -19,38 +18,32 @@ class FastReport:
         cls,
         tg_id: int,
         mapping: dict,
-        models: list[Type[BaseArticle]],
-        async_session: Callable[[], sessionmaker],
-        article_repository: Type[ExpenseArticleRepository],
-        limits_repository: Type[LimitsRepository],
-        limits_model: Type[MonthlyLimits],
-        start: datetime = None,
+        session: AsyncSession,
+        totals_repository: Type[MonthlyTotalsRepository],
+        limits_controller: Type[LimitsController],
+        month: date,
     ):
         """
         Генерация быстрого отчета для пользователя.
 
         :param tg_id: ID пользователя в Telegram.
         :param mapping: Словарь с отображением статей расходов.
-        :param models: Список моделей статей расходов.
-        :param async_session: Функция для получения асинхронной сессии.
-        :param article_repository: Репозиторий для статей расходов.
-        :param limits_repository: Репозиторий для лимитов.
-        :param limits_model: Модель лимитов.
-        :param start: Дата начала отчетного периода.
+        :param session: Сессия базы данных.
+        :param totals_repository: Репозиторий месячных итогов трат.
+        :param limits_controller: Контроллер лимитов.
+        :param month: Первое число отчетного месяца по местному времени.
         :return: Строка с отчетом в формате таблицы.
         """
         cls.log.info(
-            f"Метод get_fast_report. Запуск быстрого отчета для {tg_id=}, {start=}."
+            f"Метод get_fast_report. Запуск быстрого отчета для {tg_id=}, {month=}."
         )
 
         expenses, limits = await cls._build_data_for_fast_report(
             tg_id=tg_id,
-            models=models,
-            async_session=async_session,
-            article_repository=article_repository,
-            limits_repository=limits_repository,
-            limits_model=limits_model,
-            start=start,
+            session=session,
+            totals_repository=totals_repository,
+            limits_controller=limits_controller,
+            month=month,
         )
 
         cls.log.debug(
@@ -67,65 +60,51 @@ class FastReport:
     async def _build_data_for_fast_report(
         cls,
         tg_id: int,
-        models: list[Type[BaseArticle]],
-        async_session: Callable[[], sessionmaker],
-        article_repository: Type[ExpenseArticleRepository],
-        limits_repository: Type[LimitsRepository],
-        limits_model: Type[MonthlyLimits],
-        start: datetime,
+        session: AsyncSession,
+        totals_repository: Type[MonthlyTotalsRepository],
+        limits_controller: Type[LimitsController],
+        month: date,
     ):
         """
         Сбор данных для быстрого отчета.
 
+        Суммы по всем статьям берутся из месячных итогов одним запросом, лимиты -
+        из кэша контроллера лимитов.
+
         :param tg_id: ID пользователя в Telegram.
-        :param models: Список моделей статей расходов.
-        :param async_session: Функция для получения асинхронной сессии.
-        :param article_repository: Репозиторий для статей расходов.
-        :param limits_repository: Репозиторий для лимитов.
-        :param limits_model: Модель лимитов.
-        :param start: Дата начала отчетного периода.
+        :param session: Сессия базы данных.
+        :param totals_repository: Репозиторий месячных итогов трат.
+        :param limits_controller: Контроллер лимитов.
+        :param month: Первое число отчетного месяца по местному времени.
         :return: Кортеж с расходами и лимитами.
         """
         cls.log.info(
             f"Метод build_data_for_fast_report. "
-            f"Сбор данных для tg_id={tg_id}, start={start}."
+            f"Сбор данных для tg_id={tg_id}, month={month}."
+        )
+
+        summs = await totals_repository.get_month_summs(
+            session=session, tg_id=tg_id, month=month
+        )
+        limits = await limits_controller.get_limits(session=session, tg_id=tg_id)
+
+        expenses = {
+            article: round(amount) if amount else 0 for article, amount in summs.items()
+        }
+        cls.log.debug(
+            f"Метод build_data_for_fast_report. Суммы для {tg_id=}: {expenses}."
         )
 
-        expenses = {}
-        limits = {}
-        async with async_session as session:
-            for model in models:
-                cls.log.debug(
-                    f"Метод build_data_for_fast_report. "
-                    f"Получаем сумму для модели {model.__tablename__}."
-                )
-
-                amount = await article_repository.get_summ_from_article_by_user_and_start_period(
-                    session=session, tg_id=tg_id, model=model, start=start
-                )
-                expenses[model.__tablename__] = round(amount) if amount else 0
-                cls.log.debug(
-                    f"Метод build_data_for_fast_report. "
-                    f"Сумма для модели {model.__tablename__}: "
-                    f"{expenses[model.__tablename__]}."
-                )
-
-            limits_record = await limits_repository.read(
-                session=session, tg_id=tg_id, model=limits_model
+        if limits:
+            cls.log.debug(
+                f"Метод build_data_for_fast_report. Лимиты для {tg_id=}: {limits}."
             )
-            if limits_record:
-                limits = limits_record.__dict__
-                cls.log.debug(
-                    f"Метод build_data_for_fast_report. "
-                    f"Лимиты для {tg_id=}: {limits}."
-                )
-            else:
-                cls.log.warning(
-                    f"Метод build_data_for_fast_report. "
-                    f"Лимиты для {tg_id=} не найдены."
-                )
-
-        return expenses, limits
+        else:
+            cls.log.warning(
+                f"Метод build_data_for_fast_report. Лимиты для {tg_id=} не найдены."
+            )
+
+        return expenses, limits or {}
 
     @classmethod
     def _build_fast_report_result(cls, expenses: dict, limits: dict, mapping: dict):
@@ -145,7 +124,7 @@ class FastReport:
             eng_name = mapping[key]
             name = key.capitalize()[:14] + "..." if len(key) > 17 else key.capitalize()
             expense = expenses[eng_name]
-            limit = limits[eng_name]
+            limit = limits.get(eng_name)
             line = (name, str(expense), str(limit))
             data.append(line)
 
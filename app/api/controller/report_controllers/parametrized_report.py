@@ -1,13 +1,13 @@
-from datetime import datetime
-from typing import Callable, Literal, Type
+from datetime import date, datetime
+from typing import Literal, Type
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
 
-from app.api.servises import PDFBuilder, XLSXBuilder, XMLBuilder
-from app.db import BaseArticle, MonthlyLimits
+from app.api.controller.base_controller import BaseController
+from app.api.controller.limits_controller import LimitsController
+from app.api.servises import ReportFile, report_builders
 from app.db.repositories.expense_articles import ExpenseArticleRepository
-from app.db.repositories.monthly_limits import LimitsRepository
+from app.db.repositories.monthly_totals import MonthlyTotalsRepository
 from app.utils import logged
 
 __all__ = ["ParametrizedReport"]
@@ -21,27 +21,31 @@ class ParametrizedReport:
 
     Атрибуты:
         _article_repository: Репозиторий для работы с расходами.
-        _limits_repository: Репозиторий для работы с лимитами.
-        _limits_model: Модель лимитов.
+        _totals_repository: Репозиторий месячных итогов трат.
+        _limits_controller: Контроллер лимитов.
+        _executor: Пул, в котором строятся файлы отчетов.
+        _cache: Кэш готовых отчетов.
     """
 
     _article_repository: Type[ExpenseArticleRepository] = ExpenseArticleRepository
-    _limits_repository: Type[LimitsRepository] = LimitsRepository
-    _limits_model: Type[MonthlyLimits] = MonthlyLimits
+    _totals_repository: Type[MonthlyTotalsRepository] = MonthlyTotalsRepository
+    _limits_controller: Type[LimitsController] = LimitsController
+    _executor: report_builders.ReportExecutor = report_builders.report_executor
+    _cache: report_builders.ReportCache = report_builders.report_cache
 
     def __init__(
         self,
         tg_id: int,
         mapping: dict,
         template: dict,
-        models: list[BaseArticle],
-        async_session: Callable[[], sessionmaker],
+        session: AsyncSession,
         start: datetime,
         end: datetime,
         dates_str_without_timezone: str,
         group_type: Literal["article_group_type", "period_group_type"],
         group_type_period: Literal["year_group_type", "month_group_type"],
         file_type: str,
+        months: tuple[date, date] | None = None,
     ):
         """
         Инициализирует объект отчета с параметрами.
@@ -49,47 +53,93 @@ class ParametrizedReport:
         :param tg_id: ID пользователя в Telegram.
         :param mapping: Словарь для отображения данных.
         :param template: Шаблон для отчета.
-        :param models: Модели для расчета данных.
-        :param async_session: Функция для создания сессии.
+        :param session: Сессия базы данных.
         :param start: Дата начала периода.
         :param end: Дата окончания периода.
         :param dates_str_without_timezone: Даты без учета часового пояса.
         :param group_type: Тип группировки данных (по статье или периоду).
         :param group_type_period: Период для группировки (по годам или месяцам).
-        :param file_type: Тип файла для вывода отчета.
+        :param file_type: Тип файла для вывода отчета. Несколько типов через
+        запятую (to_pdf,to_xlsx) означают отчет в нескольких форматах в ZIP-архиве.
+        :param months: Первый и последний месяц периода, если период состоит из
+        целых месяцев. Тогда данные берутся из месячных итогов.
         """
         self.tg_id = tg_id
         self.mapping = mapping
         self.template = template
-        self.models = models
-        self.session = async_session
+        self.session = session
         self.start = start
         self.end = end
         self.dates_str_without_timezone = dates_str_without_timezone
         self.group_type = group_type
         self.group_type_method = getattr(self, self.group_type)
         self.group_type_period = group_type_period
-        self.file_type_method = getattr(self, file_type)
+        self.file_type = file_type
+        self.file_type_methods = [getattr(self, name) for name in file_type.split(",")]
+        self.months = months
 
-    async def launch(self):
+    async def launch(self) -> ReportFile:
         """
         Запускает генерацию параметризованного отчета.
 
-        :return: Путь к сгенерированному отчету.
+        Данные читаются из базы асинхронно, а файл строится в пуле исполнителя,
+        чтобы не блокировать event loop. После чтения данных транзакция
+        обновления завершается (BaseController._release_connection), чтобы
+        соединение не простаивало в пуле на время построения и отправки файла.
+        Готовые отчеты берутся из кэша, пока данные пользователя не изменились.
+        Отчет в нескольких форматах строится из одних и тех же данных и приходит
+        ZIP-архивом.
+
+        :return: Файл сгенерированного отчета.
         """
         self.log.info(
             f"Метод get_parametrized_report. "
             f"Запуск отчета c параметрами для "
             f"{self.tg_id=}, {self.start=}, {self.end=} {self.group_type_method=}."
         )
+        cache_key = self._cache_key()
+        report = self._cache.get(cache_key)
+        if report:
+            self.log.debug(f"Метод launch. Отчет для {self.tg_id=} найден в кэше.")
+            return report
+
         expenses, limits = await self._get_expenses_and_limits()
         expenses, limits = self._translate(expenses=expenses, limits=limits)
+        await BaseController._release_connection(session=self.session)
+
+        builders = [method() for method in self.file_type_methods]
+        if len(builders) == 1:
+            report = await self._executor.run(
+                builder=builders[0], expenses=expenses, limits=limits, tg_id=self.tg_id
+            )
+        else:
+            report = await self._executor.run_many(
+                builders=builders, expenses=expenses, limits=limits, tg_id=self.tg_id
+            )
+        self._cache.set(cache_key, report)
+        return report
+
+    def _cache_key(self) -> tuple:
+        """
+        Строит ключ кэша отчета.
 
-        builder = self.file_type_method()
-        file_path = builder(
-            expenses=expenses, limits=limits, tg_id=self.tg_id
-        ).generate_report()
-        return file_path
+        Версия данных берется до чтения из базы, поэтому отчет, построенный
+        одновременно с изменением трат, сохраняется под старой версией. Границы
+        периода учитываются с точностью до дня через dates_str_without_timezone:
+        конец открытого периода сдвигается к текущему моменту, но новые траты и так
+        меняют версию данных.
+
+        :return: Кортеж параметров отчета и версии данных пользователя.
+        """
+        return (
+            self.tg_id,
+            self._cache.version(self.tg_id),
+            self.dates_str_without_timezone,
+            self.months,
+            self.group_type,
+            self.group_type_period,
+            self.file_type,
+        )
 
     async def _get_expenses_and_limits(self):
         """
@@ -97,17 +147,15 @@ class ParametrizedReport:
 
         :return: Кортеж с данными о расходах и лимитах.
         """
-        async with self.session as session:
-            limits = await self._limits(session=session)
-            expenses = await self.group_type_method(session=session)
+        limits = await self._limits()
+        expenses = await self.group_type_method(session=self.session)
 
         return expenses, limits
 
-    async def _limits(self, session: AsyncSession):
+    async def _limits(self):
         """
         Получает лимиты для пользователя, учитывая тип группировки.
 
-        :param session: Сессия для работы с базой данных.
         :return: Лимиты для пользователя.
         """
         if self.group_type == "article_group_type":
@@ -118,11 +166,10 @@ class ParametrizedReport:
             else:
                 months_quantity = 1
 
-        limits_record = await self._limits_repository.read(
-            session=session, tg_id=self.tg_id, model=self._limits_model
+        limits = await self._limits_controller.get_limits(
+            session=self.session, tg_id=self.tg_id
         )
-        if limits_record:
-            limits = limits_record.__dict__
+        if limits:
             for key, val in limits.items():
                 if isinstance(val, int):
                     limits[key] = val * months_quantity
@@ -151,11 +198,22 @@ class ParametrizedReport:
         """
         self.log.debug("Метод article_group_type. " f"Получаем сумму для моделей.")
 
+        if self.months:
+            start_month, end_month = self.months
+            return (
+                await self._totals_repository.get_aggregated_totals_by_start_end_months(
+                    session=session,
+                    tg_id=self.tg_id,
+                    start=start_month,
+                    end=end_month,
+                    dates_str_without_timezone=self.dates_str_without_timezone,
+                )
+            )
+
         expenses = (
             await self._article_repository.get_aggregated_articles_by_start_end_period(
                 session=session,
                 tg_id=self.tg_id,
-                models=self.models,
                 start=self.start,
                 end=self.end,
                 dates_str_without_timezone=self.dates_str_without_timezone,
@@ -172,10 +230,25 @@ class ParametrizedReport:
         :param session: Сессия для работы с базой данных.
         :return: Данные о расходах.
         """
+        if self.months:
+            start_month, end_month = self.months
+            kwargs = {
+                "session": session,
+                "tg_id": self.tg_id,
+                "start": start_month,
+                "end": end_month,
+            }
+            if self.group_type_period == "year_group_type":
+                return await self._totals_repository.get_aggregated_totals_by_years(
+                    **kwargs
+                )
+            return await self._totals_repository.get_aggregated_totals_by_months(
+                **kwargs
+            )
+
         kwargs = {
             "session": session,
             "tg_id": self.tg_id,
-            "models": self.models,
             "start": self.start,
             "end": self.end,
         }
@@ -248,7 +321,7 @@ class ParametrizedReport:
 
         :return: Класс XMLBuilder.
         """
-        return XMLBuilder
+        return report_builders.XMLBuilder
 
     @staticmethod
     def to_pdf():
@@ -257,7 +330,7 @@ class ParametrizedReport:
 
         :return: Класс PDFBuilder.
         """
-        return PDFBuilder
+        return report_builders.PDFBuilder
 
     @staticmethod
     def to_xlsx():
@@ -266,4 +339,22 @@ class ParametrizedReport:
 
         :return: Класс XLSXBuilder.
         """
-        return XLSXBuilder
+        return report_builders.XLSXBuilder
+
+    @staticmethod
+    def to_csv():
+        """
+        Возвращает класс для генерации отчета в формате CSV.
+
+        :return: Класс CSVBuilder.
+        """
+        return report_builders.CSVBuilder
+
+    @staticmethod
+    def to_jsonl():
+        """
+        Возвращает класс для генерации отчета в формате JSON Lines.
+
+        :return: Класс JSONLBuilder.
+        """
+        return report_builders.JSONLBuilder
@@ -1,18 +1,19 @@
 import calendar
-from datetime import datetime, timedelta
-from typing import Literal
+from datetime import date, datetime, timedelta
+from typing import Any, Literal
 
 import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controller import BaseController
+from app.api.controller.limits_controller import LimitsController
 from app.api.controller.report_controllers import (FastReport,
                                                    ParametrizedReport)
 from app.api.servises.validators.validators import (DayValidator,
                                                     MonthValidator,
                                                     YearValidator)
-from app.db.models import BaseArticle, MonthlyLimits, User
 from app.db.repositories.expense_articles import ExpenseArticleRepository
-from app.db.repositories.monthly_limits import LimitsRepository
+from app.db.repositories.monthly_totals import MonthlyTotalsRepository
 from app.db.repositories.user import UserRepository
 from app.utils import logged
 
@@ -22,14 +23,16 @@ class StatisticController(BaseController):
     """
     Контроллер статистики для формирования отчетов по заданным периодам и параметрам.
     Обрабатывает запросы на получение отчетов с учетом часового пояса пользователя.
+
+    Между шагами диалога контроллер хранится в данных FSM в виде JSON (to_state)
+    и на каждом шаге восстанавливается заново (from_state), поэтому диалог
+    переживает перезапуск бота и продолжается в любом процессе.
     """
 
-    _limits_repository = LimitsRepository
+    _totals_repository = MonthlyTotalsRepository
+    _limits_controller = LimitsController
     _article_repository = ExpenseArticleRepository
     _user_repository = UserRepository
-    _limits_model = MonthlyLimits
-    _article_model = BaseArticle
-    _user_model = User
     _year_validator = YearValidator
     _month_validator = MonthValidator
     _day_validator = DayValidator
@@ -39,7 +42,7 @@ class StatisticController(BaseController):
         tg_id: int,
         mapping: dict,
         report_type: Literal["fast", "parametrized"],
-        user: User,
+        timezone: int,
         template: dict = None,
     ):
         """
@@ -48,13 +51,13 @@ class StatisticController(BaseController):
         :param tg_id: ID пользователя в Telegram.
         :param mapping: Словарь с данными для отчета.
         :param report_type: Тип отчета (быстрый или параметризованный).
-        :param user: Пользователь, для которого генерируется отчет.
+        :param timezone: Часовой пояс пользователя.
         :param template: Шаблон отчета.
         """
         self.tg_id = tg_id
         self.start = datetime(year=2024, month=1, day=1)
         self.end = datetime(year=datetime.utcnow().year, month=12, day=31)
-        self.user = user
+        self.timezone = timezone
         self.report_type = report_type
         self.target_state = None
         self.group_type = None
@@ -63,6 +66,54 @@ class StatisticController(BaseController):
         self.template = template
         self.file_type = None
 
+    def to_state(self) -> dict[str, Any]:
+        """
+        Возвращает параметры отчета для хранения в данных FSM.
+
+        Сохраняются только значения, которые сериализуются в JSON. Словари
+        mapping и template берутся из текстов бота при восстановлении.
+
+        :return: Словарь с параметрами отчета.
+        """
+        return {
+            "tg_id": self.tg_id,
+            "timezone": self.timezone,
+            "report_type": self.report_type,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "target_state": self.target_state,
+            "group_type": self.group_type,
+            "group_type_period": self.group_type_period,
+            "file_type": self.file_type,
+        }
+
+    @classmethod
+    def from_state(
+        cls, data: dict[str, Any], mapping: dict, template: dict = None
+    ) -> "StatisticController":
+        """
+        Восстанавливает контроллер из параметров, сохраненных to_state.
+
+        :param data: Словарь с параметрами отчета.
+        :param mapping: Словарь с данными для отчета.
+        :param template: Шаблон отчета.
+        :return: Контроллер статистики.
+        """
+        controller = cls(
+            tg_id=data["tg_id"],
+            mapping=mapping,
+            report_type=data["report_type"],
+            timezone=data["timezone"],
+            template=template,
+        )
+        controller.start = datetime.fromisoformat(data["start"])
+        controller.end = datetime.fromisoformat(data["end"])
+        controller.target_state = data["target_state"]
+        controller.group_type = data["group_type"]
+        controller.group_type_period = data["group_type_period"]
+        controller.file_type = data["file_type"]
+        return controller
+
     def set_year(self, year: str, edge: Literal["start", "end"]):
         """
         Устанавливает год для начала или конца периода отчета.
@@ -200,10 +251,11 @@ class StatisticController(BaseController):
         days_qnt = calendar.monthrange(year, month)[1]
         return [str(day) for day in range(1, days_qnt + 1)]
 
-    async def get_report(self):
+    async def get_report(self, session: AsyncSession):
         """
         Генерирует отчет в зависимости от типа отчета (быстрый или параметризованный).
 
+        :param session: Сессия базы данных.
         :return: Сгенерированный отчет.
         """
         self.log.info(
@@ -218,25 +270,20 @@ class StatisticController(BaseController):
             f"{self.start=}, конец отчета: {self.end=}."
         )
 
-        models = self._article_model.__subclasses__()
-        self.log.debug(f"Метод get_report. " f"Список моделей статей: {models}.")
-
-        async_session = await self._get_connect()
         if self.report_type == "fast":
             self.log.info(
                 f"Метод get_report. " f"Генерация быстрого отчета для {self.tg_id=}."
             )
-            self.start = self._from_utc_to_timezone_dt(timezone=self.user.timezone)
+            local_now = datetime.utcnow() + timedelta(hours=self.timezone)
+            month = date(year=local_now.year, month=local_now.month, day=1)
 
             return await FastReport.get_fast_report(
                 tg_id=self.tg_id,
                 mapping=self.mapping,
-                models=models,
-                async_session=async_session,
-                article_repository=self._article_repository,
-                limits_repository=self._limits_repository,
-                limits_model=self._limits_model,
-                start=self.start,
+                session=session,
+                totals_repository=self._totals_repository,
+                limits_controller=self._limits_controller,
+                month=month,
             )
 
         elif self.report_type == "parametrized":
@@ -245,30 +292,31 @@ class StatisticController(BaseController):
                 f"Генерация параметризованного отчета для {self.tg_id=}."
             )
             current = datetime.utcnow()
+            months = self._whole_months(end_is_open=self.end >= current)
             self.end = self.end if self.end < current else current
             dates_str_without_timezone = (
                 f'{self.start.strftime("%d.%m.%Y")}-{self.end.strftime("%d.%m.%Y")}'
             )
             self.start = self._from_utc_to_timezone_dt(
-                timezone=self.user.timezone, utc_datetime=self.start
+                timezone=self.timezone, utc_datetime=self.start
             )
 
             self.end = self._from_utc_to_timezone_dt(
-                timezone=self.user.timezone, utc_datetime=self.end
+                timezone=self.timezone, utc_datetime=self.end
             )
 
             report = ParametrizedReport(
                 tg_id=self.tg_id,
                 mapping=self.mapping,
                 template=self.template,
-                models=models,
-                async_session=async_session,
+                session=session,
                 start=self.start,
                 end=self.end,
                 dates_str_without_timezone=dates_str_without_timezone,
                 group_type=self.group_type,
                 group_type_period=self.group_type_period,
                 file_type=self.file_type,
+                months=months,
             )
             return await report.launch()
 
@@ -278,6 +326,29 @@ class StatisticController(BaseController):
             )
             raise ValueError("Неверный тип отчета.")
 
+    def _whole_months(self, end_is_open: bool) -> tuple[date, date] | None:
+        """
+        Проверяет, состоит ли выбранный период из целых месяцев.
+
+        Для таких периодов параметризованный отчет читает месячные итоги вместо
+        отдельных трат.
+
+        :param end_is_open: Конец периода не раньше текущего момента, то есть
+        последний месяц берется целиком.
+        :return: Первый и последний месяц периода или None.
+        """
+        first_day = datetime(year=self.start.year, month=self.start.month, day=1)
+        _, last_day = calendar.monthrange(self.end.year, self.end.month)
+        if self.start != first_day or (not end_is_open and self.end.day != last_day):
+            return None
+
+        months = (
+            date(year=self.start.year, month=self.start.month, day=1),
+            date(year=self.end.year, month=self.end.month, day=1),
+        )
+        self.log.debug(f"Метод _whole_months. Период из целых месяцев: {months=}.")
+        return months
+
     def _from_utc_to_timezone_dt(
         self, timezone: int = 0, utc_datetime: datetime = None
     ) -> datetime:
@@ -1,21 +1,68 @@
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.api.controller import BaseController
+from app.api.servises import report_cache
+from app.core.config import settings
 from app.db.models.user import User
 from app.db.repositories.user import UserRepository
-from app.utils import logged
+from app.utils import TTLCache, logged
+
+__all__ = ["UserController", "UserInfo"]
+
 
-__all__ = ["UserController"]
+@dataclass(frozen=True)
+class UserInfo:
+    """
+    Неизменяемый снимок пользователя для кэша.
+
+    :param tg_id: int - ID пользователя в Telegram.
+    :param name: str - имя пользователя.
+    :param timezone: int - часовой пояс пользователя.
+    """
+
+    tg_id: int
+    name: str
+    timezone: int
+
+    @classmethod
+    def from_model(cls, user: User) -> "UserInfo":
+        """
+        Создает снимок из модели пользователя.
+
+        :param user: User - модель пользователя.
+        :return: UserInfo - снимок пользователя.
+        """
+        return cls(tg_id=user.tg_id, name=user.name, timezone=user.timezone)
 
 
 @logged()
 class UserController(BaseController):
+    """
+    Контроллер пользователей.
+
+    Пользователи кэшируются в памяти процесса по tg_id: имя и часовой пояс
+    меняются редко, а читаются почти при каждом обращении к боту. Регистрация и
+    изменение пользователя сбрасывают его запись в кэше сразу и еще раз после
+    фиксации транзакции. В кэше хранится неизменяемый снимок UserInfo, а не
+    модель: модель привязана к сессии запроса и после отката или закрытия
+    сессии не читается в других запросах.
+    """
+
     _repository = UserRepository
     _user = User
+    _report_cache = report_cache
+    _cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
 
     @classmethod
-    async def register_user(cls, tg_id: int, name: str, timezone: int):
+    async def register_user(
+        cls, session: AsyncSession, tg_id: int, name: str, timezone: int
+    ):
         """
         Регистрация нового пользователя в системе.
 
+        :param session: Сессия базы данных.
         :param tg_id: ID пользователя в Telegram.
         :param name: Имя пользователя.
         :param timezone: Часовой пояс пользователя.
@@ -25,68 +72,110 @@ class UserController(BaseController):
             f"Метод register_user. Попытка регистрации пользователя tg_id={tg_id}, "
             f"name={name}, timezone={timezone}."
         )
-        async_session = await cls._get_connect()
-        cls.log.debug("Метод register_user. Соединение получено.")
-        async with async_session as session:
-            user = await cls._repository.read(
-                session=session, tg_id=tg_id, model=cls._user
-            )
-            cls.log.debug(
-                f"Метод register_user. Проверка наличия пользователя с tg_id={tg_id}."
-            )
-            if user:
-                cls.log.info(
-                    f"Метод register_user. Пользователь с {tg_id=} уже зарегистрирован."
-                )
-                return
-            new_user = cls._user(tg_id=tg_id, name=name, timezone=timezone)
-            cls.log.debug(f"Метод register_user. Новый пользователь: {new_user}.")
-
-            user = await cls._repository.create(session=session, item=new_user)
+        user = await cls._repository.read(session=session, tg_id=tg_id, model=cls._user)
+        cls.log.debug(
+            f"Метод register_user. Проверка наличия пользователя с tg_id={tg_id}."
+        )
+        if user:
             cls.log.info(
-                f"Метод register_user. Пользователь с {tg_id=} успешно зарегистрирован."
+                f"Метод register_user. Пользователь с {tg_id=} уже зарегистрирован."
             )
+            return
+        new_user = cls._user(tg_id=tg_id, name=name, timezone=timezone)
+        cls.log.debug(f"Метод register_user. Новый пользователь: {new_user}.")
 
-            return user
+        user = await cls._repository.create(session=session, item=new_user)
+        cls._invalidate(session=session, tg_id=tg_id)
+        cls.log.info(
+            f"Метод register_user. Пользователь с {tg_id=} успешно зарегистрирован."
+        )
+
+        return user
 
     @classmethod
-    async def update_user(cls, tg_id: int, name: str, timezone: int):
+    async def update_user(
+        cls, session: AsyncSession, tg_id: int, name: str, timezone: int
+    ):
         """
         Обновление данных пользователя.
 
+        :param session: Сессия базы данных.
         :param tg_id: ID пользователя.
         :param name: Новое имя пользователя.
         :param timezone: Новый часовой пояс пользователя.
         :return: Обновленные данные пользователя.
         """
         cls.log.info(f"Метод update_user. Обновление данных пользователя {tg_id=}.")
-        async_session = await cls._get_connect()
-        async with async_session as session:
-            updated_user = cls._user(tg_id=tg_id, name=name, timezone=timezone)
-            cls.log.debug(
-                f"Метод update_user. Новый данные пользователя: {updated_user}."
-            )
+        updated_user = cls._user(tg_id=tg_id, name=name, timezone=timezone)
+        cls.log.debug(f"Метод update_user. Новый данные пользователя: {updated_user}.")
 
-            await cls._repository.update(session=session, item=updated_user)
-            cls.log.info(
-                f"Метод update_user. Данные пользователя {tg_id=} успешно обновлены."
-            )
-            return updated_user
+        await cls._repository.update(session=session, item=updated_user)
+        cls._invalidate(session=session, tg_id=tg_id)
+        cls._after_commit(
+            session=session, callback=lambda: cls._report_cache.bump(tg_id)
+        )
+        cls.log.info(
+            f"Метод update_user. Данные пользователя {tg_id=} успешно обновлены."
+        )
+        return updated_user
 
     @classmethod
-    async def get_user(cls, tg_id: int):
+    async def get_user(cls, session: AsyncSession, tg_id: int) -> UserInfo | None:
         """
         Поиск пользователя по его tg_id.
 
+        :param session: Сессия базы данных.
         :param tg_id: ID пользователя в Telegram.
-        :return: Найденный пользователь или None, если пользователь не найден.
+        :return: Снимок найденного пользователя или None, если пользователь
+        не найден.
         """
         cls.log.info(f"Метод get_user. Поиск пользователя с {tg_id=}.")
-        async_session = await cls._get_connect()
-        async with async_session as session:
-            user = await cls._repository.read(
-                session=session, tg_id=tg_id, model=cls._user
-            )
+        user = cls._cache.get(tg_id)
+        if user:
+            cls.log.debug(f"Метод get_user. Пользователь с {tg_id=} найден в кэше.")
+            return user
+
+        user = await cls._repository.read(session=session, tg_id=tg_id, model=cls._user)
         if not user:
             cls.log.warning(f"Метод get_user. Пользователь с {tg_id=} не найден.")
+            return user
+
+        user = UserInfo.from_model(user=user)
+        cls._cache.set(tg_id, user)
         return user
+
+    @classmethod
+    async def get_timezone(cls, session: AsyncSession, tg_id: int) -> int:
+        """
+        Возвращает часовой пояс пользователя.
+
+        :param session: Сессия базы данных.
+        :param tg_id: ID пользователя в Telegram.
+        :return: Часовой пояс пользователя или 0, если пользователь не найден.
+        """
+        user = await cls.get_user(session=session, tg_id=tg_id)
+        return user.timezone if user else 0
+
+    @classmethod
+    def _invalidate(cls, session: AsyncSession, tg_id: int) -> None:
+        """
+        Сбрасывает запись пользователя в кэше сейчас и после фиксации транзакции,
+        чтобы параллельное чтение не вернуло в кэш старые данные.
+
+        :param session: Сессия базы данных.
+        :param tg_id: ID пользователя в Telegram.
+        :return: None
+        """
+        cls._cache.invalidate(tg_id)
+        cls._after_commit(
+            session=session, callback=lambda: cls._cache.invalidate(tg_id)
+        )
+
+    @classmethod
+    def cache_stats(cls) -> dict:
+        """
+        Возвращает статистику кэша пользователей.
+
+        :return: Словарь с попаданиями, промахами, долей попаданий и размером кэша.
+        """
+        return cls._cache.stats()
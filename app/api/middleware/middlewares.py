@@ -5,10 +5,17 @@ from unittest.mock import _SentinelObject
 from aiogram.dispatcher.middlewares.base import BaseMiddleware
 from aiogram.fsm.storage.base import BaseStorage
 from aiogram.types import Message, TelegramObject
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
 from app.utils import logged
 
-__all__ = ["StorageMiddleware", "DeletePreviousMSGMiddleware"]
+__all__ = [
+    "StorageMiddleware",
+    "DeletePreviousMSGMiddleware",
+    "ConcurrencyLimitMiddleware",
+    "DBSessionMiddleware",
+]
 
 
 class StorageMiddleware(BaseMiddleware):
@@ -90,3 +97,90 @@ class DeletePreviousMSGMiddleware(BaseMiddleware):
         if not isinstance(result, _SentinelObject):
             await self.storage[chat_id].put(result)
         return result
+
+
+@logged()
+class ConcurrencyLimitMiddleware(BaseMiddleware):
+    """
+    Миддлвар, ограничивающий количество одновременно обрабатываемых обновлений.
+
+    В режиме вебхука каждое обновление обрабатывается в отдельной задаче, поэтому
+    без ограничения всплеск запросов создает неограниченное число обработчиков
+    и соединений с базой. Лишние обновления ждут своей очереди.
+
+    :param limit: Максимальное количество одновременно обрабатываемых обновлений.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        Ожидание свободного слота и передача события.
+
+        :param handler: Обработчик события.
+        :param event: Событие Telegram.
+        :param data: Данные, передаваемые в обработчик.
+        :return: Результат выполнения обработчика.
+        """
+        if self.semaphore.locked():
+            self.log.debug(
+                f"Обработка обновлений заполнена ({self.limit}), обновление ждет."
+            )
+        async with self.semaphore:
+            return await handler(event, data)
+
+
+@logged()
+class DBSessionMiddleware(BaseMiddleware):
+    """
+    Миддлвар, открывающий одну сессию базы данных на обновление.
+
+    Сессия передается обработчику в аргументе session. Если обработчик
+    завершился без ошибки, транзакция фиксируется, иначе откатывается. После
+    фиксации вызываются действия, отложенные контроллерами (обновление кэшей).
+    Соединение берется из пула только при первом запросе к базе, поэтому
+    обновления без обращений к базе пул не занимают. Обработчики, которые после
+    чтения из базы долго строят или отправляют файлы, завершают транзакцию
+    раньше через BaseController._release_connection.
+
+    :param session_maker: Фабрика сессий базы данных.
+    """
+
+    def __init__(self, session_maker: sessionmaker[AsyncSession]):
+        super().__init__()
+        self.session_maker = session_maker
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        Обработка события в рамках одной транзакции.
+
+        :param handler: Обработчик события.
+        :param event: Событие Telegram.
+        :param data: Данные, передаваемые в обработчик.
+        :return: Результат выполнения обработчика.
+        """
+        async with self.session_maker() as session:
+            data["session"] = session
+            try:
+                result = await handler(event, data)
+            except Exception:
+                self.log.warning("Ошибка обработки обновления, откат транзакции.")
+                await session.rollback()
+                raise
+            await session.commit()
+            for callback in session.info.pop("after_commit", []):
+                callback()
+        return result
@@ -4,6 +4,7 @@ from aiogram import F, Router
 from aiogram.filters import Command, CommandStart
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controller.user_controller import UserController
 from app.api.servises.fsm.states import StatisticStates, TimezoneStates
@@ -41,7 +42,10 @@ async def start_handler(
 @commands_router.callback_query(F.data == "statistic")
 @commands_router.message(Command("statistic"))
 async def statistic_handler(
-    event: Union[Message, CallbackQuery], state: FSMContext, texts: dict
+    event: Union[Message, CallbackQuery],
+    state: FSMContext,
+    texts: dict,
+    session: AsyncSession,
 ):
     """
     Обработчик команды /statistic.
@@ -49,10 +53,11 @@ async def statistic_handler(
     :param event: Сообщение или CallbackQuery.
     :param state: Контекст состояния FSM.
     :param texts: Словарь с текстами для ответа.
+    :param session: Сессия базы данных.
     :return: Ответное сообщение.
     """
     await state.clear()
-    user = await UserController.get_user(tg_id=event.from_user.id)
+    user = await UserController.get_user(session=session, tg_id=event.from_user.id)
     message = event.message if isinstance(event, CallbackQuery) else event
 
     if not user:
@@ -63,7 +68,7 @@ async def statistic_handler(
             ),
         )
 
-    await state.set_data({"user": user})
+    await state.set_data({"timezone": user.timezone})
     statistic_message = texts["commands"]["statistic"]
     await state.set_state(StatisticStates.waiting_for_report_type)
     return await message.answer(
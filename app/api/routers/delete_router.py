@@ -2,7 +2,9 @@ from aiogram import F, Router
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.controller import expenses_controller
 from app.api.controller.expenses_controller import ExpensesController
 from app.api.routers.commands_router import start_handler
 from app.api.servises.fsm.states import DeleteStates
@@ -34,69 +36,128 @@ async def delete_handler(callback: CallbackQuery, state: FSMContext, texts: dict
     )
 
 
-@delete_router.message(StateFilter(DeleteStates.waiting_for_chose_article))
+@delete_router.message(
+    StateFilter(
+        DeleteStates.waiting_for_chose_article, DeleteStates.waiting_for_delete_article
+    )
+)
 async def delete_waiting_for_chose_item(
-    message: Message, state: FSMContext, texts: dict
+    message: Message, state: FSMContext, texts: dict, session: AsyncSession
 ):
     """
-    Ожидает выбора статьи для удаления и выводит список записей.
+    Ожидает выбора статьи для удаления и выводит первую страницу записей.
+
+    Статью можно сменить и при просмотре записей: клавиатура статей остается у
+    пользователя.
 
     :param message: Сообщение пользователя с выбранной статьей.
     :param state: Состояние FSM.
     :param texts: Словарь с текстами для ответов.
+    :param session: Сессия базы данных.
     :return: Ответ с найденными записями или сообщением об ошибке.
     """
-    records = await ExpensesController.get_expenses(
-        tg_id=message.from_user.id, article_name=message.text
+    page = await ExpensesController.get_expenses(
+        session=session, tg_id=message.from_user.id, article_name=message.text
     )
-    if not records:
+    if isinstance(page, str):
+        return await message.answer(
+            text=page,
+            reply_markup=ReplyKeyBoard().create_kb(
+                buttons=texts["reply_buttons"]["expense_item"]
+            ),
+        )
+
+    if not page.records:
         empty_message = texts["delete_texts"]["empty"].format(article=message.text)
         await state.clear()
-        await message.answer(
+        return await message.answer(
             text=empty_message,
             reply_markup=InlineKeyBoard.create_kb(
                 buttons=texts["inline_buttons"]["ok"]
             ),
         )
 
-    if isinstance(records, str):
-        return await message.answer(
-            text=records,
-            reply_markup=ReplyKeyBoard().create_kb(
-                buttons=texts["reply_buttons"]["expense_item"]
+    await state.set_state(DeleteStates.waiting_for_delete_article)
+    await state.set_data({"page": page.to_state(), "article": message.text})
+    return await answer_page(
+        message=message, page=page, article=message.text, texts=texts
+    )
+
+
+@delete_router.callback_query(
+    StateFilter(DeleteStates.waiting_for_delete_article),
+    F.data.in_({"delete_newer", "delete_older"}),
+)
+async def delete_page_handler(
+    callback: CallbackQuery, state: FSMContext, texts: dict, session: AsyncSession
+):
+    """
+    Показывает соседнюю страницу записей статьи.
+
+    :param callback: Callback-запрос с направлением перехода.
+    :param state: Состояние FSM.
+    :param texts: Словарь с текстами для ответов.
+    :param session: Сессия базы данных.
+    :return: Ответ со страницей записей.
+    """
+    data = await state.get_data()
+    page = expenses_controller.ExpensesPage.from_state(data["page"])
+    page = await ExpensesController.get_expenses_page(
+        session=session,
+        tg_id=callback.from_user.id,
+        category_id=page.category_id,
+        page=page,
+        direction=callback.data.removeprefix("delete_"),
+    )
+    if not page.records:
+        page = await ExpensesController.get_expenses_page(
+            session=session, tg_id=callback.from_user.id, category_id=page.category_id
+        )
+    if not page.records:
+        await state.clear()
+        return await callback.message.answer(
+            text=texts["delete_texts"]["empty"].format(article=data["article"]),
+            reply_markup=InlineKeyBoard.create_kb(
+                buttons=texts["inline_buttons"]["ok"]
             ),
         )
 
-    await state.set_state(DeleteStates.waiting_for_delete_article)
-    await state.set_data({"articles_to_delete": records})
-
-    formatted_msg = texts["delete_texts"]["article"].format(item=message.text)
-    return await message.reply(
-        text=formatted_msg, reply_markup=ReplyKeyBoard().create_kb(records.values())
+    await state.update_data(page=page.to_state())
+    return await answer_page(
+        message=callback.message, page=page, article=data["article"], texts=texts
     )
 
 
-@delete_router.message(StateFilter(DeleteStates.waiting_for_delete_article))
-async def delete_waiting_for_item(message: Message, state: FSMContext, texts: dict):
+@delete_router.callback_query(
+    StateFilter(DeleteStates.waiting_for_delete_article),
+    F.data.startswith("delete_expense:"),
+)
+async def delete_waiting_for_item(
+    callback: CallbackQuery, state: FSMContext, texts: dict, session: AsyncSession
+):
     """
-    Обрабатывает подтверждение удаления статьи расходов.
+    Удаляет выбранную на странице запись.
 
-    :param message: Сообщение с подтверждением удаления.
+    :param callback: Callback-запрос с номером записи на странице.
     :param state: Состояние FSM.
     :param texts: Словарь с текстами для ответов.
+    :param session: Сессия базы данных.
     :return: Ответ с результатом удаления и кнопками для повторного удаления.
     """
     data = await state.get_data()
-    delete_record = await ExpensesController.delete_expense(
-        articles_dict=data.get("articles_to_delete"), article_value=message.text
+    deleted = await ExpensesController.delete_expense(
+        session=session,
+        tg_id=callback.from_user.id,
+        page=expenses_controller.ExpensesPage.from_state(data["page"]),
+        index=int(callback.data.split(":")[1]),
     )
-    if not delete_record:
+    if not deleted:
         delete_message = texts["delete_texts"]["error"]
     else:
         delete_message = texts["delete_texts"]["done"]
 
     await state.set_state(DeleteStates.waiting_for_repeat_deletion)
-    return await message.reply(
+    return await callback.message.answer(
         text=delete_message,
         reply_markup=InlineKeyBoard().create_kb(
             buttons=texts["inline_buttons"]["delete_yes_no"]
@@ -122,3 +183,36 @@ async def delete_waiting_for_repeat(
     else:
         await state.clear()
         return await start_handler(message=callback.message, state=state, texts=texts)
+
+
+async def answer_page(
+    message: Message, page: expenses_controller.ExpensesPage, article: str, texts: dict
+) -> Message:
+    """
+    Отправляет страницу записей: по кнопке на запись, кнопки соседних страниц и
+    возврата в меню.
+
+    :param message: Сообщение, в чат которого отправляется страница.
+    :param page: Страница записей.
+    :param article: Название статьи расходов.
+    :param texts: Словарь с текстами для ответов.
+    :return: Отправленное сообщение.
+    """
+    buttons = [
+        [label, f"delete_expense:{index}"] for index, label in enumerate(page.labels)
+    ]
+    pages = texts["inline_buttons"]["delete_pages"]
+    navigation = [
+        button
+        for button, shown in (
+            (pages["newer"], page.has_newer),
+            (pages["older"], page.has_older),
+        )
+        if shown
+    ]
+    buttons += navigation + texts["inline_buttons"]["back_to_main"]
+    adjust = [1] * len(page.labels) + ([len(navigation)] if navigation else []) + [1]
+    return await message.answer(
+        text=texts["delete_texts"]["article"].format(item=article),
+        reply_markup=InlineKeyBoard.create_kb(buttons=buttons, adjust=adjust),
+    )
@@ -0,0 +1,177 @@
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+from aiogram import F, Router
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.controller.import_controller import ImportController, ImportResult
+from app.api.servises.fsm.states import ImportStates
+from app.api.servises.importers import CorruptFileError, UnsupportedFileError
+from app.api.servises.kb_builders.inline_kb import InlineKeyBoard
+from app.core.config import settings
+
+__all__ = ["import_router"]
+
+import_router = Router()
+
+# Не чаще одного обновления сообщения о ходе импорта за этот интервал, секунды.
+PROGRESS_INTERVAL = 2.0
+
+
+@import_router.callback_query(F.data == "import")
+async def import_handler(callback: CallbackQuery, state: FSMContext, texts: dict):
+    """
+    Обработка запроса на импорт трат из файла.
+
+    :param callback: CallbackQuery, содержащий данные запроса.
+    :param state: FSMContext, контекст состояния.
+    :param texts: Словарь с текстами для сообщений.
+    :return: Отправка сообщения с описанием формата файла.
+    """
+    await state.set_state(ImportStates.waiting_for_document)
+    return await callback.message.answer(
+        text=texts["import_texts"]["document"],
+        reply_markup=InlineKeyBoard().create_kb(
+            buttons=texts["inline_buttons"]["back_to_main"]
+        ),
+    )
+
+
+@import_router.message(StateFilter(ImportStates.waiting_for_document), F.document)
+async def import_document_handler(
+    message: Message, state: FSMContext, texts: dict, session: AsyncSession
+):
+    """
+    Загрузка трат из присланного файла.
+
+    Файл скачивается во временный файл на диске и импортируется частями, о ходе
+    импорта сообщается в отдельном сообщении. Если файл оказался поврежденным,
+    уже загруженные из него траты откатываются.
+
+    :param message: Сообщение пользователя с документом.
+    :param state: FSMContext, контекст состояния.
+    :param texts: Словарь с текстами для сообщений.
+    :param session: Сессия базы данных.
+    :return: Итог импорта с ошибками по строкам.
+    """
+    document = message.document
+    back_kb = InlineKeyBoard().create_kb(
+        buttons=texts["inline_buttons"]["back_to_main"]
+    )
+    if document.file_size and document.file_size > settings.IMPORT_MAX_FILE_SIZE:
+        return await message.answer(
+            text=texts["import_texts"]["too_big"].format(
+                size=settings.IMPORT_MAX_FILE_SIZE // (1024 * 1024)
+            ),
+            reply_markup=back_kb,
+        )
+
+    progress_message = await message.answer(
+        text=texts["import_texts"]["progress"].format(imported=0, failed=0)
+    )
+    try:
+        with tempfile.TemporaryFile(dir=settings.REPORT_TEMP_DIR) as file:
+            await message.bot.download(document, destination=file)
+            file.seek(0)
+            result = await ImportController.import_expenses(
+                session=session,
+                tg_id=message.from_user.id,
+                file=file,
+                filename=document.file_name,
+                progress=make_progress(message=progress_message, texts=texts),
+            )
+    except CorruptFileError:
+        await session.rollback()
+        return await message.answer(
+            text=texts["import_texts"]["corrupt"], reply_markup=back_kb
+        )
+    except UnsupportedFileError:
+        return await message.answer(
+            text=texts["import_texts"]["unsupported"], reply_markup=back_kb
+        )
+    finally:
+        await progress_message.delete()
+
+    await state.clear()
+    return await message.answer(
+        text=import_summary(result=result, texts=texts),
+        reply_markup=InlineKeyBoard().create_kb(buttons=texts["inline_buttons"]["ok"]),
+    )
+
+
+@import_router.message(StateFilter(ImportStates.waiting_for_document))
+async def import_waiting_for_document(message: Message, texts: dict):
+    """
+    Повторный запрос файла, если пользователь прислал не документ.
+
+    :param message: Сообщение пользователя.
+    :param texts: Словарь с текстами для сообщений.
+    :return: Отправка сообщения с описанием формата файла.
+    """
+    return await message.answer(
+        text=texts["import_texts"]["document"],
+        reply_markup=InlineKeyBoard().create_kb(
+            buttons=texts["inline_buttons"]["back_to_main"]
+        ),
+    )
+
+
+def make_progress(
+    message: Message, texts: dict
+) -> Callable[[ImportResult], Awaitable[None]]:
+    """
+    Создает обработчик хода импорта, который обновляет сообщение не чаще раза
+    в PROGRESS_INTERVAL секунд.
+
+    :param message: Сообщение о ходе импорта.
+    :param texts: Словарь с текстами для сообщений.
+    :return: Корутина, принимающая промежуточный итог импорта.
+    """
+    last_update = time.monotonic()
+
+    async def progress(result: ImportResult) -> None:
+        nonlocal last_update
+        if time.monotonic() - last_update < PROGRESS_INTERVAL:
+            return
+        last_update = time.monotonic()
+        try:
+            await message.edit_text(
+                text=texts["import_texts"]["progress"].format(
+                    imported=result.imported, failed=result.failed
+                )
+            )
+        except TelegramBadRequest:
+            pass
+
+    return progress
+
+
+def import_summary(result: ImportResult, texts: dict) -> str:
+    """
+    Формирует итоговое сообщение импорта с первыми ошибками по строкам.
+
+    :param result: Итог импорта.
+    :param texts: Словарь с текстами для сообщений.
+    :return: Текст сообщения.
+    """
+    lines = [
+        texts["import_texts"]["done"].format(
+            imported=result.imported, failed=result.failed
+        )
+    ]
+    if result.errors:
+        lines.append(
+            texts["import_texts"]["errors"].format(errors="\n".join(result.errors))
+        )
+    if result.failed > len(result.errors):
+        lines.append(
+            texts["import_texts"]["more_errors"].format(
+                count=result.failed - len(result.errors)
+            )
+        )
+    return "\n\n".join(lines)
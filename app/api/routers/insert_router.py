@@ -2,6 +2,7 @@ from aiogram import F, Router
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controller.expenses_controller import ExpensesController
 from app.api.routers.commands_router import start_handler
@@ -35,15 +36,24 @@ async def insert_handler(callback: CallbackQuery, state: FSMContext, texts: dict
 
 
 @insert_router.message(StateFilter(InsertStates.waiting_for_insert_item))
-async def insert_waiting_for_item(message: Message, state: FSMContext, texts: dict):
+async def insert_waiting_for_item(
+    message: Message, state: FSMContext, texts: dict, session: AsyncSession
+):
     """
-    Ожидание ввода статьи расхода от пользователя.
+    Ожидание ввода статьи расхода от пользователя. Сообщение со строками
+    «статья сумма» добавляет все траты сразу.
 
     :param message: Сообщение пользователя с введенным текстом.
     :param state: FSMContext, контекст состояния.
     :param texts: Словарь с текстами для сообщений.
+    :param session: Сессия базы данных.
     :return: Отправка сообщения с запросом суммы расхода.
     """
+    if ExpensesController.is_batch(text=message.text):
+        return await insert_batch(
+            message=message, state=state, texts=texts, session=session
+        )
+
     formatted_msg = texts["insert_texts"]["sum"].format(item=message.text)
     await state.set_data({"expense_article": message.text})
     await state.set_state(InsertStates.waiting_for_insert_sum)
@@ -55,20 +65,59 @@ async def insert_waiting_for_item(message: Message, state: FSMContext, texts: di
     )
 
 
+async def insert_batch(
+    message: Message, state: FSMContext, texts: dict, session: AsyncSession
+):
+    """
+    Добавление нескольких трат из одного сообщения в одной транзакции.
+
+    :param message: Сообщение пользователя со строками «статья сумма».
+    :param state: FSMContext, контекст состояния.
+    :param texts: Словарь с текстами для сообщений.
+    :param session: Сессия базы данных.
+    :return: Подтверждение добавления трат или список ошибок по строкам.
+    """
+    result = await ExpensesController.add_expenses(
+        session=session, tg_id=message.from_user.id, text=message.text
+    )
+    if isinstance(result, str):
+        return await message.reply(
+            text=texts["insert_texts"]["batch_error"].format(errors=result),
+            reply_markup=ReplyKeyBoard().create_kb(
+                buttons=texts["reply_buttons"]["expense_item"]
+            ),
+        )
+
+    count, total = result
+    await state.set_state(InsertStates.waiting_for_repeat_insert)
+    return await message.reply(
+        text=texts["insert_texts"]["batch_done"].format(count=count, total=total),
+        reply_markup=InlineKeyBoard().create_kb(
+            buttons=texts["inline_buttons"]["insert_yes_no"]
+        ),
+    )
+
+
 @insert_router.message(StateFilter(InsertStates.waiting_for_insert_sum))
-async def insert_waiting_for_sum(message: Message, state: FSMContext, texts: dict):
+async def insert_waiting_for_sum(
+    message: Message, state: FSMContext, texts: dict, session: AsyncSession
+):
     """
     Ожидание ввода суммы расхода от пользователя.
 
     :param message: Сообщение пользователя с введенной суммой.
     :param state: FSMContext, контекст состояния.
     :param texts: Словарь с текстами для сообщений.
+    :param session: Сессия базы данных.
     :return: Подтверждение добавления расхода и запрос на повторение.
     """
     state_data = await state.get_data()
     expense_article = state_data.get("expense_article")
     record = await ExpensesController.add_expense(
-        tg_id=message.from_user.id, article_name=expense_article, amount=message.text
+        session=session,
+        tg_id=message.from_user.id,
+        article_name=expense_article,
+        amount=message.text,
     )
     if isinstance(record, str):
         await state.set_state(InsertStates.waiting_for_insert_item)
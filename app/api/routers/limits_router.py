@@ -2,6 +2,7 @@ from aiogram import F, Router
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controller.limits_controller import LimitsController
 from app.api.routers.commands_router import start_handler
@@ -56,17 +57,21 @@ async def limits_waiting_for_item(message: Message, state: FSMContext, texts: di
 
 
 @limits_router.message(StateFilter(LimitsStates.waiting_for_limits_sum))
-async def limits_waiting_for_sum(message: Message, state: FSMContext, texts: dict):
+async def limits_waiting_for_sum(
+    message: Message, state: FSMContext, texts: dict, session: AsyncSession
+):
     """
     Ожидание ввода суммы для статьи расходов.
 
     :param message: Сообщение от пользователя.
     :param state: Состояние FSMContext.
     :param texts: Словарь с текстами для ответа.
+    :param session: Сессия базы данных.
     :return: Ответ с кнопками.
     """
     data = await state.get_data()
     updated_record = await LimitsController.update_limit(
+        session=session,
         tg_id=message.from_user.id,
         article_name=data.get("article_name_to_update"),
         article_value=message.text,
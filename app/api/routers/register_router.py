@@ -2,6 +2,7 @@ from aiogram import F, Router
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.controller.limits_controller import LimitsController
 from app.api.controller.user_controller import UserController
@@ -16,13 +17,18 @@ register_router = Router()
 
 
 @register_router.message(StateFilter(TimezoneStates.waiting_for_add_timezone))
-async def choose_timezone_handler(message: Message, state: FSMContext, texts: dict):
+async def choose_timezone_handler(
+    message: Message, state: FSMContext, texts: dict, session: AsyncSession
+):
     """
     Обработка выбора часового пояса при регистрации пользователя.
 
+    Пользователь и его лимиты создаются в одной транзакции.
+
     :param message: Сообщение от пользователя.
     :param state: Состояние пользователя.
     :param texts: Словарь с текстами для ответов.
+    :param session: Сессия базы данных.
     :return: Ответ с текстом и клавиатурой.
     """
     try:
@@ -34,13 +40,14 @@ async def choose_timezone_handler(message: Message, state: FSMContext, texts: di
         )
 
     is_new_user_registered = await UserController.register_user(
+        session=session,
         tg_id=message.from_user.id,
         name=message.from_user.full_name,
         timezone=timezone,
     )
 
     if is_new_user_registered:
-        await LimitsController.init_limits(tg_id=message.from_user.id)
+        await LimitsController.init_limits(session=session, tg_id=message.from_user.id)
         timezone_message = texts["register_texts"]["done"]
     else:
         timezone_message = texts["register_texts"]["already_done"]
@@ -74,7 +81,7 @@ async def choose_new_timezone_handler(
 
 @register_router.message(StateFilter(TimezoneStates.waiting_for_change_timezone))
 async def change_user_timezone_handler(
-    message: Message, state: FSMContext, texts: dict
+    message: Message, state: FSMContext, texts: dict, session: AsyncSession
 ):
     """
     Обработка изменения часового пояса пользователя.
@@ -82,6 +89,7 @@ async def change_user_timezone_handler(
     :param message: Сообщение от пользователя.
     :param state: Состояние пользователя.
     :param texts: Словарь с текстами для ответов.
+    :param session: Сессия базы данных.
     :return: Ответ с текстом и клавиатурой.
     """
     try:
@@ -93,7 +101,10 @@ async def change_user_timezone_handler(
         )
 
     if await UserController.update_user(
-        tg_id=message.from_user.id, name=message.from_user.full_name, timezone=timezone
+        session=session,
+        tg_id=message.from_user.id,
+        name=message.from_user.full_name,
+        timezone=timezone,
     ):
         timezone_message = texts["timezone_texts"]["done"].format(timezone=message.text)
     else:
@@ -1,9 +1,15 @@
+import asyncio
+
 from aiogram import F, Router
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, FSInputFile, Message
+from aiogram.types import CallbackQuery, InputFile, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.controller.export_controller import ExportController
 from app.api.controller.statistic_controller import StatisticController
+from app.api.servises import ReportExecutorBusyError, ReportFile, file_id_cache
 from app.api.servises.fsm.states import StatisticStates
 from app.api.servises.kb_builders.inline_kb import InlineKeyBoard
 from app.api.servises.kb_builders.reply_kb import ReplyKeyBoard
@@ -17,7 +23,7 @@ statistic_router = Router()
     StateFilter(StatisticStates.waiting_for_report_type), F.data == "fast_report"
 )
 async def statistic_make_fast_report(
-    callback: CallbackQuery, state: FSMContext, texts: dict
+    callback: CallbackQuery, state: FSMContext, texts: dict, session: AsyncSession
 ):
     """
     Обрабатывает запрос на быстрый отчет, генерируя отчет по данным пользователя.
@@ -25,18 +31,18 @@ async def statistic_make_fast_report(
     :param callback: CallbackQuery - запрос от пользователя.
     :param state: FSMContext - состояние конечного автомата для пользователя.
     :param texts: dict - словарь с текстами для сообщений.
+    :param session: AsyncSession - сессия базы данных.
     :return: отправляет отчет пользователю.
     """
     data = await state.get_data()
-    user = data.get("user")
 
     controller = StatisticController(
         tg_id=callback.from_user.id,
         mapping=texts["mapping_rus_to_eng"],
         report_type="fast",
-        user=user,
+        timezone=data["timezone"],
     )
-    report = await controller.get_report()
+    report = await controller.get_report(session=session)
     await state.set_data({})
     return await callback.message.answer(
         text=f"```{report}```",
@@ -69,6 +75,31 @@ async def statistic_parametrized_report(
     )
 
 
+@statistic_router.callback_query(
+    StateFilter(StatisticStates.waiting_for_report_type), F.data == "export_all"
+)
+async def statistic_export_all_handler(
+    callback: CallbackQuery, state: FSMContext, texts: dict, session: AsyncSession
+):
+    """
+    Выгружает все траты пользователя в ZIP-архив с CSV.
+
+    :param callback: CallbackQuery - запрос от пользователя.
+    :param state: FSMContext - состояние конечного автомата для пользователя.
+    :param texts: dict - словарь с текстами для сообщений.
+    :param session: AsyncSession - сессия базы данных.
+    :return: отправляет архив с тратами пользователю.
+    """
+    await state.set_data({})
+    report = await ExportController.export_expenses(
+        session=session, tg_id=callback.from_user.id
+    )
+    try:
+        return await send_report(message=callback.message, report=report, texts=texts)
+    finally:
+        report.cleanup()
+
+
 @statistic_router.callback_query(
     StateFilter(StatisticStates.parametrized_start_period_years)
 )
@@ -84,17 +115,16 @@ async def statistic_start_year_handler(
     :return: отправляет запрос на выбор месяцев для указанного года.
     """
     data = await state.get_data()
-    user = data.get("user")
 
     controller = StatisticController(
         tg_id=callback.from_user.id,
         mapping=texts["mapping_eng_to_rus"],
         template=texts["parametrized_report_template"],
         report_type="parametrized",
-        user=user,
+        timezone=data["timezone"],
     )
-    controller.target_state = getattr(StatisticStates, callback.data)
-    await state.set_data({"controller": controller})
+    controller.target_state = getattr(StatisticStates, callback.data).state
+    await state.set_data({"statistic": controller.to_state()})
 
     if controller.target_state == StatisticStates.parametrized_end_period_years:
         await state.set_state(StatisticStates.parametrized_end_period_years)
@@ -119,8 +149,7 @@ async def statistic_start_month_handler(
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на выбор дней для указанного месяца.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
 
     validated_year = controller.set_year(year=message.text, edge="start")
     if isinstance(validated_year, str):
@@ -129,6 +158,7 @@ async def statistic_start_month_handler(
             reply_markup=ReplyKeyBoard.create_kb(buttons=controller.year_builder()),
         )
 
+    await save_controller(state=state, controller=controller)
     if controller.target_state == StatisticStates.parametrized_end_period_months:
         await state.set_state(StatisticStates.parametrized_end_period_years)
     else:
@@ -150,8 +180,7 @@ async def statistic_start_day_handler(message: Message, state: FSMContext, texts
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на выбор даты для указанного дня.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
 
     validated_month = controller.set_month(month=message.text, edge="start")
     if isinstance(validated_month, str):
@@ -162,6 +191,7 @@ async def statistic_start_day_handler(message: Message, state: FSMContext, texts
             ),
         )
 
+    await save_controller(state=state, controller=controller)
     await state.set_state(StatisticStates.parametrized_end_period_years)
     days_buttons = controller.day_builder(date=controller.start)
     return await message.answer(
@@ -180,8 +210,7 @@ async def statistic_end_year_handler(message: Message, state: FSMContext, texts:
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на выбор месяца для окончания периода.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
 
     if controller.target_state == StatisticStates.parametrized_end_period_years:
         possible_error = controller.set_year(year=message.text, edge="start")
@@ -206,6 +235,7 @@ async def statistic_end_year_handler(message: Message, state: FSMContext, texts:
     if possible_error:
         await state.set_state(StatisticStates.parametrized_end_period_years)
         return await message.answer(text=possible_error, reply_markup=kb)
+    await save_controller(state=state, controller=controller)
     return await message.answer(
         text=texts["statistic_texts"]["years"]["end"].format(year=message.text),
         reply_markup=ReplyKeyBoard.create_kb(buttons=controller.year_builder()),
@@ -222,8 +252,7 @@ async def statistic_end_month_handler(message: Message, state: FSMContext, texts
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на выбор дня для окончания периода.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
     validated_year = controller.set_year(year=message.text, edge="end")
 
     if isinstance(validated_year, str):
@@ -232,6 +261,7 @@ async def statistic_end_month_handler(message: Message, state: FSMContext, texts
             reply_markup=ReplyKeyBoard.create_kb(buttons=controller.year_builder()),
         )
 
+    await save_controller(state=state, controller=controller)
     if controller.target_state == StatisticStates.parametrized_end_period_months:
         await state.set_state(StatisticStates.got_dates)
     else:
@@ -253,8 +283,7 @@ async def statistic_end_day_handler(message: Message, state: FSMContext, texts:
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на завершение выбора данных для отчетности.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
     validated_month = controller.set_month(month=message.text, edge="end")
 
     if isinstance(validated_month, str):
@@ -265,6 +294,7 @@ async def statistic_end_day_handler(message: Message, state: FSMContext, texts:
             ),
         )
 
+    await save_controller(state=state, controller=controller)
     await state.set_state(StatisticStates.got_dates)
     days_buttons = controller.day_builder(date=controller.end)
     return await message.answer(
@@ -283,8 +313,7 @@ async def statistic_got_dates_handler(message: Message, state: FSMContext, texts
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на выбор типа группировки данных.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
 
     if controller.target_state == StatisticStates.parametrized_end_period_years:
         possible_error = controller.set_year(year=message.text, edge="end")
@@ -306,6 +335,7 @@ async def statistic_got_dates_handler(message: Message, state: FSMContext, texts
         await state.set_state(StatisticStates.got_dates)
         return await message.answer(text=possible_error, reply_markup=kb)
 
+    await save_controller(state=state, controller=controller)
     start_date, end_date = controller.dates_repr()
 
     dates_message = texts["statistic_texts"]["group_type"].format(
@@ -334,9 +364,9 @@ async def statistic_period_group_type_handler(
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на выбор типа файла для отчета.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
     controller.set_group_type(group_type=callback.data)
+    await save_controller(state=state, controller=controller)
 
     await state.set_state(StatisticStates.waiting_for_file_type)
 
@@ -362,9 +392,9 @@ async def statistic_article_group_type_handler(
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на выбор типа файла для отчета.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
     controller.set_group_type(group_type=callback.data)
+    await save_controller(state=state, controller=controller)
 
     await state.set_state(StatisticStates.waiting_for_file_type)
     return await statistic_file_type_handler(callback, state, texts)
@@ -382,10 +412,10 @@ async def statistic_file_type_handler(
     :param texts: dict - словарь с текстами для сообщений.
     :return: отправляет запрос на генерацию отчета.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
     if controller.group_type != callback.data:
         controller.set_group_type_period(group_type_period=callback.data)
+    await save_controller(state=state, controller=controller)
 
     await state.set_state(StatisticStates.got_all_data)
 
@@ -399,7 +429,7 @@ async def statistic_file_type_handler(
 
 @statistic_router.callback_query(StateFilter(StatisticStates.got_all_data))
 async def statistic_launch_report_handler(
-    callback: CallbackQuery, state: FSMContext, texts: dict
+    callback: CallbackQuery, state: FSMContext, texts: dict, session: AsyncSession
 ):
     """
     Обрабатывает запуск отчета и отправку документа пользователю.
@@ -407,18 +437,101 @@ async def statistic_launch_report_handler(
     :param callback: CallbackQuery - запрос на запуск отчета.
     :param state: FSMContext - состояние конечного автомата для пользователя.
     :param texts: dict - словарь с текстами для сообщений.
-    :return: отправляет готовый отчет пользователю.
+    :param session: AsyncSession - сессия базы данных.
+    :return: отправляет готовый отчет пользователю. Отчет, который уже
+    загружался в Telegram, отправляется повторно по file_id.
     """
-    data = await state.get_data()
-    controller = data.get("controller")
+    controller = await load_controller(state=state, texts=texts)
     if not controller.file_type:
         controller.set_file_type(file_type=callback.data)
 
-    file_path = await controller.get_report()
     await state.set_data({})
+    try:
+        report = await controller.get_report(session=session)
+    except (ReportExecutorBusyError, asyncio.TimeoutError) as exc:
+        error_key = (
+            "report_busy"
+            if isinstance(exc, ReportExecutorBusyError)
+            else "report_timeout"
+        )
+        return await callback.message.answer(
+            text=texts["statistic_texts"][error_key],
+            reply_markup=InlineKeyBoard.create_kb(
+                buttons=texts["inline_buttons"]["ok"]
+            ),
+        )
+
+    try:
+        return await send_report(message=callback.message, report=report, texts=texts)
+    finally:
+        report.cleanup()
 
-    return await callback.message.answer_document(
+
+async def load_controller(state: FSMContext, texts: dict) -> StatisticController:
+    """
+    Восстанавливает контроллер параметризованного отчета из данных FSM.
+
+    :param state: FSMContext - состояние конечного автомата для пользователя.
+    :param texts: dict - словарь с текстами для сообщений.
+    :return: StatisticController - контроллер с выбранными параметрами отчета.
+    """
+    data = await state.get_data()
+    return StatisticController.from_state(
+        data=data["statistic"],
+        mapping=texts["mapping_eng_to_rus"],
+        template=texts["parametrized_report_template"],
+    )
+
+
+async def save_controller(state: FSMContext, controller: StatisticController):
+    """
+    Сохраняет параметры отчета в данных FSM.
+
+    :param state: FSMContext - состояние конечного автомата для пользователя.
+    :param controller: StatisticController - контроллер отчета.
+    :return: None
+    """
+    await state.update_data(statistic=controller.to_state())
+
+
+async def send_report(message: Message, report: ReportFile, texts: dict) -> Message:
+    """
+    Отправляет отчет, по возможности используя file_id уже загруженного файла.
+
+    Если Telegram не принимает сохраненный file_id, отчет загружается заново.
+
+    :param message: Message - сообщение, в ответ на которое отправляется отчет.
+    :param report: ReportFile - файл отчета.
+    :param texts: dict - словарь с текстами для сообщений.
+    :return: Message - отправленное сообщение с документом.
+    """
+    file_id = file_id_cache.get(report)
+    if file_id:
+        try:
+            return await answer_report(message=message, document=file_id, texts=texts)
+        except TelegramBadRequest:
+            file_id_cache.invalidate(report)
+
+    sent = await answer_report(
+        message=message, document=report.as_input_file(), texts=texts
+    )
+    file_id_cache.set(report, sent.document.file_id)
+    return sent
+
+
+async def answer_report(
+    message: Message, document: InputFile | str, texts: dict
+) -> Message:
+    """
+    Отправляет документ с отчетом и клавиатурой возврата в меню.
+
+    :param message: Message - сообщение, в ответ на которое отправляется отчет.
+    :param document: InputFile | str - файл для загрузки или file_id.
+    :param texts: dict - словарь с текстами для сообщений.
+    :return: Message - отправленное сообщение с документом.
+    """
+    return await message.answer_document(
         caption=texts["statistic_texts"]["report_is_done"],
-        document=FSInputFile(file_path),
+        document=document,
         reply_markup=InlineKeyBoard.create_kb(buttons=texts["inline_buttons"]["ok"]),
     )
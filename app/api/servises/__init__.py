@@ -1,9 +1,42 @@
-from app.api.servises.report_builders import (BaseBuilder, PDFBuilder,
-                                              XLSXBuilder, XMLBuilder)
+from typing import TYPE_CHECKING
+
+from app.api.servises import report_builders
+from app.api.servises.report_builders import (FileIdCache, ReportCache,
+                                              ReportExecutor,
+                                              ReportExecutorBusyError,
+                                              ReportFile, file_id_cache,
+                                              report_cache, report_executor)
+
+if TYPE_CHECKING:
+    from app.api.servises.report_builders import (BaseBuilder, CSVBuilder,
+                                                  JSONLBuilder, PDFBuilder,
+                                                  RowBuilder, XLSXBuilder,
+                                                  XMLBuilder)
 
 __all__ = [
     "BaseBuilder",
+    "RowBuilder",
     "PDFBuilder",
     "XLSXBuilder",
     "XMLBuilder",
+    "CSVBuilder",
+    "JSONLBuilder",
+    "ReportFile",
+    "ReportExecutor",
+    "ReportExecutorBusyError",
+    "report_executor",
+    "ReportCache",
+    "report_cache",
+    "FileIdCache",
+    "file_id_cache",
 ]
+
+
+def __getattr__(name: str):
+    """
+    Загружает построители отчетов при первом обращении (см. report_builders).
+
+    :param name: str - имя атрибута пакета.
+    :return: класс построителя отчета.
+    """
+    return getattr(report_builders, name)
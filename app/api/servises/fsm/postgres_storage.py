@@ -0,0 +1,548 @@
+import asyncio
+import json
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Type
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage import base
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.db.repositories.fsm_storage import FSMRepository
+from app.utils import logged
+
+__all__ = ["PostgresStorage"]
+
+# Как часто из базы удаляются устаревшие записи, секунды.
+CLEANUP_INTERVAL = 60
+# Канал LISTEN/NOTIFY, через который процессы сообщают об измененных ключах.
+NOTIFY_CHANNEL = "fsm_storage"
+# Сколько ключей передается в одном уведомлении (NOTIFY ограничен 8000 байт).
+NOTIFY_BATCH = 100
+
+
+@dataclass
+class CachedRecord:
+    """
+    Запись состояния в кэше процесса.
+
+    :param state: str - текущее состояние или None.
+    :param data: dict - данные состояния.
+    :param deadline: float - момент (time.monotonic), после которого запись
+    устаревает, или None.
+    :param persisted: tuple - состояние и сериализованные данные, последними
+    записанные в базу, или None, если записи в базе нет.
+    :param persisted_at: float - момент (time.monotonic) последней записи в базу.
+    """
+
+    state: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    deadline: Optional[float] = None
+    persisted: Optional[tuple[Optional[str], Optional[bytes]]] = None
+    persisted_at: float = 0.0
+
+
+@logged()
+class PostgresStorage(BaseStorage):
+    """
+    Хранилище FSM в Postgres с кэшем в памяти процесса и отложенной записью.
+
+    Чтение идет из кэша, в базу обращение происходит только для ключей, которых
+    в кэше нет. Изменения накапливаются и записываются в базу одним запросом
+    раз в flush_interval секунд, а также при остановке бота. Данные сериализуются
+    в JSON и сжимаются zlib, set_data с данными, которые не сериализуются в JSON
+    (например, объектами), завершается ошибкой TypeError.
+
+    Если передан engine, хранилище подписывается на канал NOTIFY_CHANNEL: при
+    каждой записи в базу процесс рассылает измененные ключи, а остальные процессы
+    удаляют их из своего кэша и при следующем обращении читают из базы. Подписка
+    держит одно соединение пула. Изменение видно другим процессам после записи
+    в базу, поэтому при нескольких процессах бота, между которыми обновления
+    одного пользователя могут чередоваться, нужен flush_interval=0.
+
+    Роутеры изменяют объекты из state.get_data() без повторного set_data, поэтому
+    чтение данных тоже помечает ключ к записи. Запрос в базу при этом выполняется
+    только если сериализованные данные действительно изменились.
+    """
+
+    _repository: Type[FSMRepository] = FSMRepository
+
+    def __init__(
+        self,
+        session_maker: Callable[[], AsyncSession],
+        ttl: int = 0,
+        flush_interval: float = 1.0,
+        cache_size: int = 10000,
+        key_builder: base.KeyBuilder = None,
+        engine: AsyncEngine = None,
+    ):
+        """
+        Инициализирует хранилище.
+
+        :param session_maker: Callable - фабрика асинхронных сессий.
+        :param ttl: int - срок хранения состояния без обращений, секунды.
+        0 - без ограничения.
+        :param flush_interval: float - период записи изменений в базу, секунды.
+        0 - запись сразу при каждом изменении.
+        :param cache_size: int - максимальное количество записей в кэше.
+        :param key_builder: KeyBuilder - построитель ключей записей.
+        :param engine: AsyncEngine - движок для подписки на изменения записей
+        в других процессах. Без него кэш не сбрасывается при записи из других
+        процессов.
+        """
+        self.session_maker = session_maker
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+        self.key_builder = key_builder or base.DefaultKeyBuilder()
+        self._cache: OrderedDict[str, CachedRecord] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_cleanup = time.monotonic()
+        self.engine = engine
+        self._sender = uuid.uuid4().hex
+        self._listener: Optional[AsyncConnection] = None
+        self._listener_lost = False
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """
+        Устанавливает состояние для ключа.
+
+        :param key: StorageKey - ключ хранилища.
+        :param state: StateType - новое состояние.
+        :return: None
+        """
+        storage_key, record = await self._get_record(key=key)
+        record.state = state.state if isinstance(state, State) else state
+        await self._touch(storage_key=storage_key, record=record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        """
+        Возвращает состояние для ключа.
+
+        :param key: StorageKey - ключ хранилища.
+        :return: текущее состояние или None.
+        """
+        _, record = await self._get_record(key=key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        """
+        Заменяет данные для ключа.
+
+        :param key: StorageKey - ключ хранилища.
+        :param data: dict - новые данные.
+        :return: None
+        :raises TypeError: если данные не сериализуются в JSON.
+        """
+        self._dumps(data)
+        storage_key, record = await self._get_record(key=key)
+        record.data = data.copy()
+        await self._touch(storage_key=storage_key, record=record)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        """
+        Возвращает копию данных для ключа.
+
+        :param key: StorageKey - ключ хранилища.
+        :return: dict - данные состояния.
+        """
+        storage_key, record = await self._get_record(key=key)
+        await self._touch(storage_key=storage_key, record=record)
+        return record.data.copy()
+
+    async def close(self) -> None:
+        """
+        Останавливает фоновую запись и сохраняет накопленные изменения.
+
+        :return: None
+        """
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        await self._unlisten()
+        self.log.info("Метод close. Хранилище состояний остановлено.")
+
+    async def flush(self) -> None:
+        """
+        Записывает в базу изменения, накопленные с прошлой записи.
+
+        :return: None
+        """
+        async with self._flush_lock:
+            keys, self._dirty = self._dirty, set()
+            upserts, deletes = self._collect_changes(keys=keys)
+            if upserts or deletes:
+                try:
+                    async with self.session_maker() as session:
+                        if upserts:
+                            await self._notify(
+                                session=session, keys=[key for key, _ in upserts]
+                            )
+                            await self._repository.upsert(
+                                session=session,
+                                records=[record for _, record in upserts],
+                            )
+                        if deletes:
+                            await self._notify(session=session, keys=deletes)
+                            await self._repository.delete(session=session, keys=deletes)
+                except Exception as exc:
+                    self.log.error(
+                        f"Метод flush. Не удалось сохранить состояния: {exc}. "
+                        f"Повтор при следующей записи."
+                    )
+                    self._dirty.update(keys)
+                    return
+                self._mark_persisted(upserts=upserts, deletes=deletes)
+                self.log.debug(
+                    f"Метод flush. Сохранено {len(upserts)}, удалено {len(deletes)}."
+                )
+            await self._cleanup()
+
+    async def _get_record(self, key: StorageKey) -> tuple[str, CachedRecord]:
+        """
+        Возвращает запись из кэша, при промахе загружает ее из базы.
+
+        :param key: StorageKey - ключ хранилища.
+        :return: кортеж из строкового ключа и записи.
+        """
+        await self._listen()
+        storage_key = self.key_builder.build(key)
+        record = self._cache.get(storage_key)
+        if record and not self._is_expired(record=record):
+            self._cache.move_to_end(storage_key)
+            return storage_key, record
+
+        record = CachedRecord(deadline=self._deadline())
+        async with self.session_maker() as session:
+            row = await self._repository.read(
+                session=session, key=storage_key, now=datetime.utcnow()
+            )
+        if row:
+            record.state = row.state
+            try:
+                record.data = self._loads(row.data)
+            except Exception as exc:
+                self.log.warning(
+                    f"Метод _get_record. Данные {storage_key=} не читаются "
+                    f"и будут сброшены: {exc}."
+                )
+            record.persisted = (row.state, row.data)
+            record.persisted_at = time.monotonic()
+
+        self._cache[storage_key] = record
+        self._evict(keep=storage_key)
+        return storage_key, record
+
+    async def _listen(self) -> None:
+        """
+        Подписывается на изменения записей в других процессах, если подписки нет.
+
+        Если соединение подписки было потеряно, уведомления за это время могли
+        не дойти, поэтому кэш сбрасывается до переподключения.
+
+        :return: None
+        """
+        if self.engine is None or (self._listener and not self._listener_lost):
+            return
+        if self._listener_lost:
+            self.log.warning("Метод _listen. Подписка потеряна, кэш сброшен.")
+            self._drop_clean(keys=list(self._cache))
+            await self._unlisten()
+
+        connection = await self.engine.connect()
+        try:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+            driver_connection.add_termination_listener(self._on_listener_lost)
+        except Exception:
+            await connection.close()
+            raise
+        self._listener = connection
+        self._listener_lost = False
+        self.log.debug(f"Метод _listen. Подписка на канал {NOTIFY_CHANNEL}.")
+
+    async def _unlisten(self) -> None:
+        """
+        Отменяет подписку и возвращает ее соединение в пул.
+
+        :return: None
+        """
+        connection, self._listener = self._listener, None
+        self._listener_lost = False
+        if connection is None:
+            return
+        try:
+            if not connection.closed:
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.remove_listener(
+                    NOTIFY_CHANNEL, self._on_notify
+                )
+            await connection.close()
+        except Exception as exc:
+            self.log.warning(f"Метод _unlisten. Ошибка закрытия подписки: {exc}.")
+
+    async def _notify(self, session: AsyncSession, keys: list[str]) -> None:
+        """
+        Сообщает другим процессам об изменении записей.
+
+        :param session: AsyncSession - сессия, в транзакции которой записи
+        изменяются.
+        :param keys: list[str] - ключи измененных записей.
+        :return: None
+        """
+        if self.engine is None:
+            return
+        for start in range(0, len(keys), NOTIFY_BATCH):
+            await self._repository.notify(
+                session=session,
+                channel=NOTIFY_CHANNEL,
+                payload=json.dumps(
+                    {"sender": self._sender, "keys": keys[start : start + NOTIFY_BATCH]}
+                ),
+            )
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        """
+        Удаляет из кэша записи, измененные другим процессом.
+
+        :param connection: соединение подписки.
+        :param pid: int - PID серверного процесса отправителя.
+        :param channel: str - канал уведомления.
+        :param payload: str - текст уведомления.
+        :return: None
+        """
+        message = json.loads(payload)
+        if message["sender"] == self._sender:
+            return
+        self._drop_clean(keys=message["keys"])
+
+    def _on_listener_lost(self, connection) -> None:
+        """
+        Отмечает потерю соединения подписки.
+
+        :param connection: соединение подписки.
+        :return: None
+        """
+        self._listener_lost = True
+
+    def _drop_clean(self, keys: list[str]) -> None:
+        """
+        Удаляет из кэша записи без несохраненных изменений.
+
+        Несохраненные изменения этого процесса будут записаны поверх изменений
+        другого процесса.
+
+        :param keys: list[str] - ключи записей.
+        :return: None
+        """
+        for storage_key in keys:
+            if storage_key in self._dirty:
+                self.log.warning(
+                    f"Метод _drop_clean. Запись {storage_key=} изменена в двух "
+                    f"процессах, сохранится версия этого процесса."
+                )
+                continue
+            self._cache.pop(storage_key, None)
+
+    async def _touch(self, storage_key: str, record: CachedRecord) -> None:
+        """
+        Продлевает срок хранения записи и помечает ее к записи в базу.
+
+        :param storage_key: str - строковый ключ записи.
+        :param record: CachedRecord - запись.
+        :return: None
+        """
+        record.deadline = self._deadline()
+        self._dirty.add(storage_key)
+        if not self.flush_interval:
+            await self.flush()
+        elif not self._flush_task:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """
+        Периодически записывает изменения в базу.
+
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _collect_changes(
+        self, keys: set[str]
+    ) -> tuple[list[tuple[str, dict]], list[str]]:
+        """
+        Сериализует измененные записи и отбирает те, что отличаются от базы.
+
+        :param keys: set[str] - ключи измененных записей.
+        :return: кортеж из записей для вставки и ключей для удаления.
+        """
+        upserts = []
+        deletes = []
+        now = time.monotonic()
+        for storage_key in keys:
+            record = self._cache.get(storage_key)
+            if record is None:
+                continue
+            if record.state is None and not record.data:
+                if record.persisted is not None:
+                    deletes.append(storage_key)
+                continue
+            payload = (record.state, self._dumps(record.data))
+            if payload == record.persisted and not self._needs_refresh(
+                record=record, now=now
+            ):
+                continue
+            state, data = payload
+            upserts.append(
+                (
+                    storage_key,
+                    {
+                        "key": storage_key,
+                        "state": state,
+                        "data": data,
+                        "expires_at": self._expires_at(),
+                    },
+                )
+            )
+        return upserts, deletes
+
+    def _mark_persisted(self, upserts: list[tuple[str, dict]], deletes: list[str]):
+        """
+        Запоминает, какие данные записей сейчас находятся в базе.
+
+        :param upserts: list - записанные записи.
+        :param deletes: list[str] - ключи удаленных записей.
+        :return: None
+        """
+        now = time.monotonic()
+        for storage_key, values in upserts:
+            record = self._cache.get(storage_key)
+            if record:
+                record.persisted = (values["state"], values["data"])
+                record.persisted_at = now
+        for storage_key in deletes:
+            record = self._cache.get(storage_key)
+            if record:
+                record.persisted = None
+
+    async def _cleanup(self) -> None:
+        """
+        Удаляет устаревшие записи из кэша и, не чаще CLEANUP_INTERVAL, из базы.
+
+        :return: None
+        """
+        for storage_key in [
+            storage_key
+            for storage_key, record in self._cache.items()
+            if storage_key not in self._dirty and self._is_expired(record=record)
+        ]:
+            del self._cache[storage_key]
+
+        now = time.monotonic()
+        if not self.ttl or now - self._last_cleanup < CLEANUP_INTERVAL:
+            return
+        self._last_cleanup = now
+        try:
+            async with self.session_maker() as session:
+                await self._repository.delete_expired(
+                    session=session, now=datetime.utcnow()
+                )
+        except Exception as exc:
+            self.log.error(
+                f"Метод _cleanup. Не удалось удалить устаревшие записи: {exc}."
+            )
+
+    def _evict(self, keep: str) -> None:
+        """
+        Вытесняет давно не использованные записи, уже сохраненные в базе,
+        если кэш переполнен.
+
+        :param keep: str - ключ записи, которая сейчас используется.
+        :return: None
+        """
+        for storage_key in list(self._cache):
+            if len(self._cache) <= self.cache_size:
+                break
+            if storage_key != keep and storage_key not in self._dirty:
+                del self._cache[storage_key]
+
+    def _deadline(self) -> Optional[float]:
+        """
+        Вычисляет момент устаревания записи в кэше.
+
+        :return: float - момент по time.monotonic или None.
+        """
+        return time.monotonic() + self.ttl if self.ttl else None
+
+    def _expires_at(self) -> Optional[datetime]:
+        """
+        Вычисляет момент устаревания записи в базе.
+
+        :return: datetime - момент (UTC) или None.
+        """
+        return datetime.utcnow() + timedelta(seconds=self.ttl) if self.ttl else None
+
+    def _needs_refresh(self, record: CachedRecord, now: float) -> bool:
+        """
+        Проверяет, нужно ли продлить срок хранения неизмененной записи в базе.
+
+        :param record: CachedRecord - запись.
+        :param now: float - текущий момент по time.monotonic.
+        :return: bool - True, если прошло больше половины срока хранения.
+        """
+        return bool(self.ttl) and now - record.persisted_at > self.ttl / 2
+
+    @staticmethod
+    def _is_expired(record: CachedRecord) -> bool:
+        """
+        Проверяет, устарела ли запись в кэше.
+
+        :param record: CachedRecord - запись.
+        :return: bool - True, если срок хранения истек.
+        """
+        return record.deadline is not None and record.deadline <= time.monotonic()
+
+    @staticmethod
+    def _dumps(data: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Сериализует и сжимает данные состояния.
+
+        :param data: dict - данные состояния.
+        :return: bytes - сжатые данные или None для пустых данных.
+        """
+        if not data:
+            return None
+        return zlib.compress(
+            json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        )
+
+    @staticmethod
+    def _loads(payload: Optional[bytes]) -> Dict[str, Any]:
+        """
+        Распаковывает данные состояния.
+
+        :param payload: bytes - сжатые данные или None.
+        :return: dict - данные состояния.
+        :raises ValueError: если в записи не JSON-объект.
+        """
+        if not payload:
+            return {}
+        data = json.loads(zlib.decompress(payload))
+        if not isinstance(data, dict):
+            raise ValueError("Данные состояния должны быть JSON-объектом.")
+        return data
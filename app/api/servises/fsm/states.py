@@ -6,6 +6,7 @@ __all__ = [
     "LimitsStates",
     "TimezoneStates",
     "StatisticStates",
+    "ImportStates",
 ]
 
 
@@ -50,3 +51,7 @@ class StatisticStates(StatesGroup):
     waiting_for_file_type = State()
 
     got_all_data = State()
+
+
+class ImportStates(StatesGroup):
+    waiting_for_document = State()
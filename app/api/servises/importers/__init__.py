@@ -0,0 +1,5 @@
+from app.api.servises.importers.expense_file import (CorruptFileError,
+                                                     ExpenseFileReader,
+                                                     UnsupportedFileError)
+
+__all__ = ["CorruptFileError", "ExpenseFileReader", "UnsupportedFileError"]
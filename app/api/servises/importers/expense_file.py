@@ -0,0 +1,112 @@
+import csv
+import io
+import os
+import zipfile
+from typing import Any, BinaryIO, Iterator
+
+__all__ = ["CorruptFileError", "ExpenseFileReader", "UnsupportedFileError"]
+
+
+class UnsupportedFileError(ValueError):
+    """Файл импорта имеет неподдерживаемый формат."""
+
+
+class CorruptFileError(UnsupportedFileError):
+    """Файл импорта поврежден или не соответствует своему расширению."""
+
+
+class ExpenseFileReader:
+    """
+    Построчное чтение файла с тратами для импорта.
+
+    Поддерживаются CSV (разделитель определяется автоматически, кодировка UTF-8
+    или Windows-1251) и XLSX (первый лист). Файл читается потоково: CSV - через
+    csv.reader, XLSX - в режиме read_only openpyxl, поэтому в памяти находится
+    только текущая строка. Пустые строки пропускаются.
+
+    :param file: BinaryIO - открытый файл, позиция в начале.
+    :param filename: str - имя файла, по расширению выбирается формат.
+    """
+
+    extensions = (".csv", ".xlsx")
+    _sample_size = 64 * 1024
+    # Ошибки разбора поврежденного файла или файла с чужим расширением.
+    _read_errors = (
+        csv.Error,
+        UnicodeDecodeError,
+        zipfile.BadZipFile,
+        KeyError,
+        SyntaxError,
+    )
+
+    def __init__(self, file: BinaryIO, filename: str):
+        self.file = file
+        self.extension = os.path.splitext(filename or "")[1].lower()
+        if self.extension not in self.extensions:
+            raise UnsupportedFileError(
+                f"Неподдерживаемый формат файла: {self.extension or filename}."
+            )
+
+    def __iter__(self) -> Iterator[tuple[int, list[Any]]]:
+        """
+        Возвращает строки файла с их номерами.
+
+        :return: Iterator - пары (номер строки, значения ячеек).
+        :raises CorruptFileError: если файл не удается разобрать.
+        """
+        rows = self._read_csv() if self.extension == ".csv" else self._read_xlsx()
+        try:
+            for number, row in rows:
+                if any(value not in (None, "") for value in row):
+                    yield number, row
+        except self._read_errors as exc:
+            raise CorruptFileError(f"Файл не читается как {self.extension}: {exc}")
+
+    def _read_csv(self) -> Iterator[tuple[int, list[Any]]]:
+        """
+        Читает CSV, определяя кодировку и разделитель по началу файла.
+
+        :return: Iterator - пары (номер строки, значения ячеек).
+        """
+        sample = self.file.read(self._sample_size)
+        self.file.seek(0)
+        try:
+            sample.decode("utf-8")
+            encoding = "utf-8-sig"
+        except UnicodeDecodeError as exc:
+            # Начало файла могло оборваться посреди многобайтного символа.
+            encoding = "utf-8-sig" if exc.start >= len(sample) - 3 else "cp1251"
+
+        text = io.TextIOWrapper(self.file, encoding=encoding, newline="")
+        try:
+            dialect = csv.Sniffer().sniff(
+                sample.decode(encoding, errors="ignore"), delimiters=",;\t"
+            )
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(text, dialect)
+        try:
+            for row in reader:
+                yield reader.line_num, [value.strip() for value in row]
+        finally:
+            text.detach()
+
+    def _read_xlsx(self) -> Iterator[tuple[int, list[Any]]]:
+        """
+        Читает первый лист XLSX в режиме read_only.
+
+        :return: Iterator - пары (номер строки, значения ячеек).
+        """
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+
+        try:
+            workbook = load_workbook(self.file, read_only=True, data_only=True)
+        except InvalidFileException as exc:
+            raise CorruptFileError(f"Файл не читается как XLSX: {exc}")
+        try:
+            sheet = workbook.worksheets[0]
+            for number, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                yield number, list(row)
+        finally:
+            workbook.close()
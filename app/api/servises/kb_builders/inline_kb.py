@@ -1,20 +1,26 @@
+from typing import Sequence
+
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 
 class InlineKeyBoard:
     @classmethod
-    def create_kb(cls, buttons: list[list], adjust: int = 2):
+    def create_kb(cls, buttons: list[list], adjust: int | Sequence[int] = 2):
         """
         Создает клавиатуру с заданными кнопками и настройками.
 
         :param buttons: list[list] - список кнопок, каждая кнопка представлена
                         списком с текстом и callback_data.
-        :param adjust: int - количество колонок для кнопок в клавиатуре.
+        :param adjust: int | Sequence[int] - количество колонок для кнопок в
+                       клавиатуре или количество кнопок в каждом ряду.
         :return: возвращает клавиатуру в виде разметки.
         """
         builder = InlineKeyboardBuilder()
         cls._create_buttons(buttons=buttons, builder=builder)
-        builder.adjust(adjust)
+        if isinstance(adjust, Sequence):
+            builder.adjust(*adjust)
+        else:
+            builder.adjust(adjust)
         return builder.as_markup()
 
     @classmethod
@@ -1,34 +1,21 @@
 from app.api.servises.texts.texts import texts
-from app.db.models.expense_articles import (AlcoholArticle, CharityArticle,
-                                            CigarettesArticle,
-                                            CosmeticsAndCareArticle,
-                                            DebtsArticle, DevicesArticle,
-                                            EatingOutArticle, EducationArticle,
-                                            EntertainmentArticle,
-                                            FriendsAndFamilyArticle,
-                                            HealthArticle, HouseholdArticle,
-                                            PetsArticle, ProductsArticle,
-                                            PurchasesArticle, ServicesArticle,
-                                            SportArticle, TransportArticle,
-                                            TravelArticle)
+from app.db.models.expense import EXPENSE_CATEGORY_IDS
 
 
 class ExpenseArticleMapping:
-    data = texts["mapping_rus_to_classname"]
+    data = texts["mapping_rus_to_eng"]
 
     @classmethod
-    def get_class_from_article_name(cls, article_name: str):
+    def get_category_id_from_article_name(cls, article_name: str):
         """
-        Возвращает класс, соответствующий названию статьи расходов.
+        Возвращает идентификатор статьи расходов по ее названию.
 
         :param article_name: str - название статьи расходов.
-        :return: class - класс, соответствующий статье расходов, или None, если
-                класс не найден.
+        :return: int - идентификатор статьи в таблице expense_categories, или None,
+                если статья не найдена.
         """
-        class_name = cls.data.get(article_name.lower())
-        if class_name:
-            current_class = globals().get(class_name)
-            return current_class
+        category_name = cls.data.get(article_name.lower())
+        return EXPENSE_CATEGORY_IDS.get(category_name)
 
 
 class ExpenseLimitsArticleMapping:
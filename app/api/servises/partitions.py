@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.db.repositories.expense_partitions import ExpensePartitionRepository
+from app.utils import logged
+
+__all__ = ["PartitionMaintainer"]
+
+
+@logged()
+class PartitionMaintainer:
+    """
+    Заранее создает месячные секции таблицы expenses.
+
+    Миграция создает секции только до конца 2030 года, траты за более поздние
+    месяцы попали бы в expenses_default. При старте бота и затем раз в interval
+    секунд проверяется, что секции на текущий и months_ahead следующих месяцев
+    уже есть, недостающие создаются.
+    """
+
+    _repository = ExpensePartitionRepository
+
+    def __init__(
+        self,
+        session_maker: sessionmaker[AsyncSession],
+        months_ahead: int = 3,
+        interval: float = 24 * 60 * 60,
+    ):
+        """
+        :param session_maker: sessionmaker - фабрика сессий базы данных.
+        :param months_ahead: int - на сколько месяцев вперед создаются секции.
+        :param interval: float - период проверки секций, секунды.
+        0 - проверка только при старте.
+        """
+        self.session_maker = session_maker
+        self.months_ahead = months_ahead
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Создает недостающие секции и запускает периодическую проверку.
+
+        :return: None
+        """
+        await self.run()
+        if self.interval and not self._task:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """
+        Останавливает периодическую проверку.
+
+        :return: None
+        """
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> list[str]:
+        """
+        Создает секции на текущий и months_ahead следующих месяцев, если их нет.
+
+        Ошибка записывается в лог и не мешает работе бота: траты за месяц без
+        секции сохраняются в expenses_default и переносятся в секцию при
+        следующей проверке.
+
+        :return: list[str] - имена созданных секций.
+        """
+        try:
+            async with self.session_maker() as session:
+                created = await self._repository.ensure(
+                    session=session,
+                    start=datetime.now(timezone.utc).date(),
+                    months=self.months_ahead + 1,
+                )
+                await session.commit()
+        except Exception as exc:
+            self.log.error(f"Метод run. Не удалось создать секции: {exc}.")
+            return []
+        if created:
+            self.log.info(f"Метод run. Созданы секции: {', '.join(created)}.")
+        return created
+
+    async def _loop(self) -> None:
+        """
+        Периодически проверяет секции до остановки.
+
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run()
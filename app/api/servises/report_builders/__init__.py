@@ -1,11 +1,66 @@
-from app.api.servises.report_builders.base_builder import BaseBuilder
-from app.api.servises.report_builders.pdf_builder import PDFBuilder
-from app.api.servises.report_builders.xlsx_builder import XLSXBuilder
-from app.api.servises.report_builders.xml_builder import XMLBuilder
+import importlib
+from typing import TYPE_CHECKING
+
+from app.api.servises.report_builders.executor import (ReportExecutor,
+                                                       ReportExecutorBusyError,
+                                                       report_executor)
+from app.api.servises.report_builders.file_id_cache import (FileIdCache,
+                                                            file_id_cache)
+from app.api.servises.report_builders.report_cache import (ReportCache,
+                                                           report_cache)
+from app.api.servises.report_builders.report_file import ReportFile
+
+if TYPE_CHECKING:
+    from app.api.servises.report_builders.base_builder import BaseBuilder
+    from app.api.servises.report_builders.csv_builder import CSVBuilder
+    from app.api.servises.report_builders.jsonl_builder import JSONLBuilder
+    from app.api.servises.report_builders.pdf_builder import PDFBuilder
+    from app.api.servises.report_builders.row_builder import RowBuilder
+    from app.api.servises.report_builders.xlsx_builder import XLSXBuilder
+    from app.api.servises.report_builders.xml_builder import XMLBuilder
 
 __all__ = [
     "BaseBuilder",
+    "RowBuilder",
     "PDFBuilder",
     "XLSXBuilder",
     "XMLBuilder",
+    "CSVBuilder",
+    "JSONLBuilder",
+    "ReportFile",
+    "ReportExecutor",
+    "ReportExecutorBusyError",
+    "report_executor",
+    "ReportCache",
+    "report_cache",
+    "FileIdCache",
+    "file_id_cache",
 ]
+
+_LAZY_BUILDERS = {
+    "BaseBuilder": "app.api.servises.report_builders.base_builder",
+    "PDFBuilder": "app.api.servises.report_builders.pdf_builder",
+    "XLSXBuilder": "app.api.servises.report_builders.xlsx_builder",
+    "XMLBuilder": "app.api.servises.report_builders.xml_builder",
+    "RowBuilder": "app.api.servises.report_builders.row_builder",
+    "CSVBuilder": "app.api.servises.report_builders.csv_builder",
+    "JSONLBuilder": "app.api.servises.report_builders.jsonl_builder",
+}
+
+
+def __getattr__(name: str):
+    """
+    Загружает построители отчетов при первом обращении.
+
+    Построители тянут за собой pandas, reportlab, openpyxl и lxml, а файлы
+    отчетов нужны редко, поэтому эти модули не загружаются при старте бота.
+
+    :param name: str - имя атрибута пакета.
+    :return: класс построителя отчета.
+    """
+    module_name = _LAZY_BUILDERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -1,17 +1,40 @@
-import os
+import tempfile
 from abc import abstractmethod
-from typing import LiteralString
-
-import pandas as pd
+from io import BytesIO
+from typing import TYPE_CHECKING, BinaryIO
 
+from app.api.servises.report_builders.report_file import ReportFile
+from app.core.config import settings
 from app.utils import logged
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 __all__ = ["BaseBuilder"]
 
 
 @logged()
 class BaseBuilder:
-    def __init__(self, expenses: list[tuple], limits: dict, tg_id: int):
+    """
+    Базовый класс построителей отчетов.
+
+    Отчет собирается в памяти. Если он больше порога spill_threshold, содержимое
+    сбрасывается во временный файл с уникальным именем, чтобы крупные отчеты не
+    держали память до отправки. Флаг uses_tables показывает, строится ли отчет из
+    таблиц prepare_tables: при выгрузке в нескольких форматах таблицы готовятся
+    один раз и передаются всем таким построителям.
+    """
+
+    extension = ""
+    uses_tables = True
+
+    def __init__(
+        self,
+        expenses: list[tuple],
+        limits: dict,
+        tg_id: int,
+        spill_threshold: int = settings.REPORT_SPILL_THRESHOLD,
+    ):
         """
         Инициализация класса для создания отчета.
 
@@ -19,56 +42,109 @@ class BaseBuilder:
         (период, сумма, категория).
         :param limits: dict - словарь лимитов по категориям.
         :param tg_id: int - ID пользователя в Telegram.
+        :param spill_threshold: int - размер отчета в байтах, начиная с которого
+        он сбрасывается на диск.
         """
         self.expenses = expenses
         self.limits = limits
         self.data_frame = None
-        self.folder = os.path.join("/bot", "api", "static", "temp")
-        os.makedirs(self.folder, exist_ok=True)
+        self.folder = settings.REPORT_TEMP_DIR or tempfile.gettempdir()
+        self.spill_threshold = spill_threshold
         self.filename = f"Отчет для пользователя с id {tg_id}"
 
-    def generate_report(self):
+    def generate_report(self, tables: dict | None = None) -> ReportFile:
         """
         Генерирует отчет по расходам для пользователя.
 
-        :return: str - путь к файлу с отчетом.
+        :param tables: dict - готовые таблицы по периодам, если они уже
+        подготовлены для другого формата. Иначе таблицы готовятся заново.
+        :return: ReportFile - файл с отчетом.
         """
-        self.log.debug("Метод generate_report. Подготовка данных.")
-        periods = sorted(set([expense[0] for expense in self.expenses]))
-        tables_by_period = {}
-
-        for period in periods:
-            period_expenses = [
-                expense for expense in self.expenses if expense[0] == period
-            ]
-
-            df = pd.DataFrame(period_expenses, columns=["period", "summ", "category"])
-            df = df.groupby("category", as_index=False).agg({"summ": "sum"})
-            df["limit"] = df["category"].map(self.limits)
-
-            df = df[["category", "summ", "limit"]]
-            df = df.rename(
-                columns={
-                    "category": "Название статьи расходов",
-                    "summ": "Сумма трат",
-                    "limit": "Лимит",
-                }
-            )
-            df["Процент расхода"] = (
-                ((df["Сумма трат"] / df["Лимит"]) * 100).round(0).astype(int)
-            )
+        tables_by_period = tables
+        if tables_by_period is None:
+            self.log.debug("Метод generate_report. Подготовка данных.")
+            tables_by_period = self.prepare_tables()
+            self.log.debug("Метод generate_report. Данные подготовлены.")
+
+        buffer = BytesIO()
+        self.write_data(data=tables_by_period, buffer=buffer)
+        return self._to_report_file(buffer=buffer)
+
+    def prepare_tables(self) -> dict[str, "pd.DataFrame"]:
+        """
+        Группирует расходы по периодам и статьям и добавляет лимиты.
+
+        Все расходы собираются в один DataFrame, суммируются одной группировкой
+        по (период, статья) и соединяются с лимитами, после чего результат
+        делится на таблицы по периодам. Суммы и лимиты приводятся к float, процент
+        расхода для статей без лимита (лимит 0 или не задан) равен 0.
 
-            tables_by_period[period] = df
-        self.log.debug("Метод generate_report. Данные подготовлены.")
+        pandas импортируется здесь, а не в модуле: построчным построителям
+        (RowBuilder) таблицы не нужны.
 
-        return self.write_data(data=tables_by_period)
+        :return: dict - таблицы по периодам в порядке возрастания периода.
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(self.expenses, columns=["period", "summ", "category"])
+        df["summ"] = pd.to_numeric(df["summ"]).astype(float)
+        df = df.groupby(["period", "category"], as_index=False, sort=True)["summ"].sum()
+
+        limits = pd.Series(self.limits or {}, dtype=float, name="limit")
+        df = df.join(limits, on="category")
+        df["limit"] = df["limit"].fillna(0)
+        df["percent"] = (
+            (df["summ"] / df["limit"].where(df["limit"] > 0) * 100)
+            .fillna(0)
+            .round(0)
+            .astype(int)
+        )
+        df = df.rename(
+            columns={
+                "category": "Название статьи расходов",
+                "summ": "Сумма трат",
+                "limit": "Лимит",
+                "percent": "Процент расхода",
+            }
+        )
+
+        return {
+            period: table.drop(columns="period").reset_index(drop=True)
+            for period, table in df.groupby("period", sort=True)
+        }
+
+    def _to_report_file(self, buffer: BytesIO) -> ReportFile:
+        """
+        Упаковывает содержимое буфера в файл отчета, сбрасывая крупные отчеты
+        на диск.
+
+        :param buffer: BytesIO - буфер с отчетом.
+        :return: ReportFile - файл с отчетом.
+        """
+        report = ReportFile.from_buffer(
+            buffer=buffer,
+            filename=self.filename + self.extension,
+            spill_threshold=self.spill_threshold,
+            folder=self.folder,
+        )
+        if report.path:
+            self.log.debug(
+                f"Метод _to_report_file. Отчет {report.size} байт сброшен на диск: "
+                f"{report.path}."
+            )
+        else:
+            self.log.debug(
+                f"Метод _to_report_file. Отчет в памяти: {report.size} байт."
+            )
+        return report
 
     @abstractmethod
-    def write_data(self, data: dict) -> LiteralString | str | bytes:
+    def write_data(self, data: dict, buffer: BinaryIO) -> None:
         """
         Абстрактный метод для записи данных отчета.
 
         :param data: dict - словарь с данными по периодам и расходам.
+        :param buffer: BinaryIO - буфер, в который записывается отчет.
         :return: None
         """
         pass
@@ -0,0 +1,39 @@
+import csv
+import io
+from typing import BinaryIO, Iterable
+
+from app.api.servises.report_builders import RowBuilder
+from app.utils import logged
+
+__all__ = ["CSVBuilder"]
+
+
+@logged()
+class CSVBuilder(RowBuilder):
+    """
+    Построитель отчетов в формате CSV (UTF-8, разделитель - запятая).
+
+    Суммы и лимиты записываются без округления, как они хранятся в базе.
+    """
+
+    extension = ".csv"
+
+    def write_data(self, data: Iterable[tuple], buffer: BinaryIO) -> None:
+        """
+        Записывает строки отчета в буфер в формате CSV.
+
+        :param data: Iterable[tuple] - строки (период, статья, сумма, лимит,
+        процент).
+        :param buffer: BinaryIO - буфер, в который записывается отчет.
+        :return: None
+        """
+        self.log.debug("Метод write_data. Записываем данные в файл CSV.")
+
+        text = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+        writer = csv.writer(text)
+        writer.writerow(self.columns)
+        writer.writerows(data)
+        text.flush()
+        text.detach()
+
+        self.log.debug("Метод write_data. Данные записаны в CSV.")
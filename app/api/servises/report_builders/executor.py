@@ -0,0 +1,410 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import ProcessPoolExecutor
+from concurrent.futures.thread import ThreadPoolExecutor
+from io import BytesIO
+from typing import TYPE_CHECKING, Literal, Type
+
+from app.api.servises.report_builders.report_file import ReportFile
+from app.core.config import settings
+from app.utils import logged
+
+if TYPE_CHECKING:
+    from app.api.servises.report_builders.base_builder import BaseBuilder
+
+__all__ = [
+    "ReportExecutor",
+    "ReportExecutorBusyError",
+    "prepare_report_tables",
+    "render_report",
+    "pack_reports",
+    "report_executor",
+]
+
+ARCHIVE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class ReportExecutorBusyError(RuntimeError):
+    """Очередь на построение отчетов переполнена."""
+
+
+def render_report(
+    builder: Type["BaseBuilder"],
+    expenses: list[tuple],
+    limits: dict,
+    tg_id: int,
+    tables: dict | None = None,
+) -> ReportFile:
+    """
+    Строит файл отчета.
+
+    Функция выполняется в пуле исполнителя, поэтому объявлена на уровне модуля и
+    принимает только сериализуемые аргументы.
+
+    :param builder: Type["BaseBuilder"] - класс построителя отчета.
+    :param expenses: list[tuple] - расходы (период, сумма, статья).
+    :param limits: dict - лимиты по статьям.
+    :param tg_id: int - ID пользователя в Telegram.
+    :param tables: dict - таблицы по периодам, если они уже подготовлены.
+    :return: ReportFile - файл с отчетом.
+    """
+    return builder(expenses=expenses, limits=limits, tg_id=tg_id).generate_report(
+        tables=tables
+    )
+
+
+def prepare_report_tables(expenses: list[tuple], limits: dict) -> dict:
+    """
+    Готовит таблицы по периодам один раз для нескольких форматов отчета.
+
+    :param expenses: list[tuple] - расходы (период, сумма, статья).
+    :param limits: dict - лимиты по статьям.
+    :return: dict - таблицы по периодам.
+    """
+    from app.api.servises.report_builders import BaseBuilder
+
+    return BaseBuilder(expenses=expenses, limits=limits, tg_id=0).prepare_tables()
+
+
+def pack_reports(reports: list[ReportFile], filename: str) -> ReportFile:
+    """
+    Упаковывает отчеты в ZIP-архив и удаляет их временные файлы.
+
+    Время файлов в архиве фиксировано, поэтому архив из одинаковых отчетов
+    совпадает побайтно.
+
+    :param reports: list[ReportFile] - файлы отчетов.
+    :param filename: str - имя архива, которое увидит пользователь.
+    :return: ReportFile - архив с отчетами.
+    """
+    buffer = BytesIO()
+    try:
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for report in reports:
+                entry = zipfile.ZipInfo(report.filename, date_time=ARCHIVE_DATE_TIME)
+                entry.compress_type = zipfile.ZIP_DEFLATED
+                if report.content is not None:
+                    archive.writestr(entry, report.content)
+                else:
+                    with open(report.path, "rb") as source:
+                        with archive.open(entry, "w") as target:
+                            shutil.copyfileobj(source, target)
+    finally:
+        for report in reports:
+            report.cleanup()
+    return ReportFile.from_buffer(
+        buffer=buffer,
+        filename=filename,
+        spill_threshold=settings.REPORT_SPILL_THRESHOLD,
+        folder=settings.REPORT_TEMP_DIR or tempfile.gettempdir(),
+    )
+
+
+def _discard_report(future: Future) -> None:
+    """
+    Удаляет временный файл отчета, который досчитался после отмены ожидания.
+
+    :param future: Future - задача пула.
+    :return: None
+    """
+    if not future.cancelled() and future.exception() is None:
+        result = future.result()
+        if isinstance(result, ReportFile):
+            result.cleanup()
+
+
+@logged()
+class ReportExecutor:
+    """
+    Ограниченный пул для построения файлов отчетов вне event loop.
+
+    pandas, reportlab и openpyxl выполняются синхронно и могут занимать сотни
+    миллисекунд, поэтому построение файла выносится в пул процессов (или потоков).
+    Одновременно строится не больше max_workers отчетов, остальные ждут в очереди
+    не длиннее max_queue. Слот освобождается, только когда задача в пуле
+    действительно завершилась, поэтому отмененные по таймауту отчеты не
+    перегружают пул. Отчет в нескольких форматах (run_many) занимает слот на
+    подготовку таблиц, на каждый формат и на упаковку архива.
+
+    :param kind: str - тип пула: process или thread.
+    :param max_workers: int - количество исполнителей.
+    :param timeout: float - время ожидания отчета с учетом очереди, секунды.
+    0 - без ограничения.
+    :param max_queue: int - сколько отчетов может ждать свободного исполнителя.
+    0 - без ограничения.
+    """
+
+    def __init__(
+        self,
+        kind: Literal["process", "thread"],
+        max_workers: int,
+        timeout: float = 0,
+        max_queue: int = 0,
+    ):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self._wait_time = 0.0
+        self._run_time = 0.0
+        self._pool: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+
+    async def run(
+        self,
+        builder: Type["BaseBuilder"],
+        expenses: list[tuple],
+        limits: dict,
+        tg_id: int,
+    ) -> ReportFile:
+        """
+        Строит отчет в пуле и возвращает его файл.
+
+        :param builder: Type["BaseBuilder"] - класс построителя отчета.
+        :param expenses: list[tuple] - расходы (период, сумма, статья).
+        :param limits: dict - лимиты по статьям.
+        :param tg_id: int - ID пользователя в Telegram.
+        :return: ReportFile - файл с отчетом.
+        :raises ReportExecutorBusyError: если очередь переполнена.
+        :raises asyncio.TimeoutError: если отчет не построен за timeout секунд.
+        """
+        self._check_queue(tg_id=tg_id)
+        return await self._wait(
+            self._run(render_report, builder, expenses, limits, tg_id), tg_id=tg_id
+        )
+
+    async def run_many(
+        self,
+        builders: list[Type["BaseBuilder"]],
+        expenses: list[tuple],
+        limits: dict,
+        tg_id: int,
+    ) -> ReportFile:
+        """
+        Строит отчет в нескольких форматах и возвращает ZIP-архив с файлами.
+
+        Таблицы по периодам готовятся один раз, после чего форматы строятся
+        параллельно в пуле.
+
+        :param builders: list[Type["BaseBuilder"]] - классы построителей отчета.
+        :param expenses: list[tuple] - расходы (период, сумма, статья).
+        :param limits: dict - лимиты по статьям.
+        :param tg_id: int - ID пользователя в Telegram.
+        :return: ReportFile - архив с отчетами.
+        :raises ReportExecutorBusyError: если очередь переполнена.
+        :raises asyncio.TimeoutError: если отчеты не построены за timeout секунд.
+        """
+        self._check_queue(tg_id=tg_id)
+        return await self._wait(
+            self._run_many(
+                builders=builders, expenses=expenses, limits=limits, tg_id=tg_id
+            ),
+            tg_id=tg_id,
+        )
+
+    def _check_queue(self, tg_id: int) -> None:
+        """
+        Отклоняет отчет, если очередь заполнена.
+
+        :param tg_id: int - ID пользователя в Telegram.
+        :return: None
+        :raises ReportExecutorBusyError: если очередь переполнена.
+        """
+        if self.max_queue and self.queued >= self.max_queue:
+            self.rejected += 1
+            self.log.warning(
+                f"Метод run. Очередь отчетов заполнена ({self.queued}), "
+                f"отчет для {tg_id=} отклонен."
+            )
+            raise ReportExecutorBusyError("Очередь на построение отчетов заполнена.")
+
+    async def _wait(self, coroutine, tg_id: int):
+        """
+        Ожидает построения отчета не дольше timeout секунд.
+
+        :param coroutine: корутина построения отчета.
+        :param tg_id: int - ID пользователя в Telegram.
+        :return: результат корутины.
+        :raises asyncio.TimeoutError: если отчет не построен за timeout секунд.
+        """
+        try:
+            return await asyncio.wait_for(coroutine, timeout=self.timeout or None)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.log.error(
+                f"Метод run. Отчет для {tg_id=} не построен за {self.timeout} с."
+            )
+            raise
+
+    async def _run_many(
+        self,
+        builders: list[Type["BaseBuilder"]],
+        expenses: list[tuple],
+        limits: dict,
+        tg_id: int,
+    ) -> ReportFile:
+        """
+        Готовит таблицы, строит форматы параллельно и упаковывает их в архив.
+
+        Если один из форматов не построился, уже готовые файлы удаляются.
+
+        :param builders: list[Type["BaseBuilder"]] - классы построителей отчета.
+        :param expenses: list[tuple] - расходы (период, сумма, статья).
+        :param limits: dict - лимиты по статьям.
+        :param tg_id: int - ID пользователя в Telegram.
+        :return: ReportFile - архив с отчетами.
+        """
+        tables = None
+        if any(builder.uses_tables for builder in builders):
+            tables = await self._run(prepare_report_tables, expenses, limits)
+
+        results = await asyncio.gather(
+            *(
+                self._run(render_report, builder, expenses, limits, tg_id, tables)
+                for builder in builders
+            ),
+            return_exceptions=True,
+        )
+        reports = [result for result in results if isinstance(result, ReportFile)]
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            for report in reports:
+                report.cleanup()
+            raise errors[0]
+
+        filename = os.path.splitext(reports[0].filename)[0] + ".zip"
+        return await self._run(pack_reports, reports, filename)
+
+    async def _run(self, func, *args):
+        """
+        Ожидает свободного исполнителя и выполняет функцию в пуле.
+
+        :param func: функция уровня модуля, которая выполняется в пуле.
+        :param args: сериализуемые аргументы функции.
+        :return: результат функции.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        queued_at = time.monotonic()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = time.monotonic()
+        self._wait_time += started_at - queued_at
+        self.running += 1
+
+        loop = asyncio.get_running_loop()
+        future = self._get_pool().submit(func, *args)
+        future.add_done_callback(
+            lambda done: loop.call_soon_threadsafe(self._release, done, started_at)
+        )
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(_discard_report)
+            raise
+
+    def _release(self, future: Future, started_at: float) -> None:
+        """
+        Освобождает слот исполнителя и обновляет счетчики после завершения задачи.
+
+        :param future: Future - завершенная задача построения отчета.
+        :param started_at: float - момент отправки задачи в пул.
+        :return: None
+        """
+        self.running -= 1
+        self._slots.release()
+        if future.cancelled():
+            return
+        self._run_time += time.monotonic() - started_at
+        if future.exception() is None:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    def _get_pool(self) -> Executor:
+        """
+        Создает пул при первом обращении.
+
+        Процессы запускаются методом spawn: дочерний процесс не наследует
+        event loop и открытые соединения бота.
+
+        :return: Executor - пул исполнителей.
+        """
+        if self._pool is None:
+            self.log.info(
+                f"Метод _get_pool. Запуск пула {self.kind}, "
+                f"исполнителей: {self.max_workers}."
+            )
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="report"
+                )
+        return self._pool
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики пула.
+
+        :return: dict - количество исполнителей, задач в работе и в очереди,
+        максимальная глубина очереди, счетчики завершенных, упавших, отклоненных
+        и просроченных задач, среднее время ожидания и построения в секундах.
+        """
+        finished = self.completed + self.failed
+        started = finished + self.running
+        return {
+            "kind": self.kind,
+            "workers": self.max_workers,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_wait": self._wait_time / started if started else 0.0,
+            "avg_run": self._run_time / finished if finished else 0.0,
+        }
+
+    async def shutdown(self) -> None:
+        """
+        Останавливает пул, отменяя задачи, которые еще не начались.
+
+        :return: None
+        """
+        if self._pool is None:
+            return
+        self.log.info(f"Метод shutdown. Остановка пула отчетов: {self.stats()}.")
+        pool, self._pool = self._pool, None
+        await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+
+report_executor = ReportExecutor(
+    kind=settings.REPORT_EXECUTOR,
+    max_workers=settings.REPORT_WORKERS,
+    timeout=settings.REPORT_TIMEOUT,
+    max_queue=settings.REPORT_MAX_QUEUE,
+)
@@ -0,0 +1,68 @@
+from app.api.servises.report_builders.report_file import ReportFile
+from app.core.config import settings
+from app.utils import TTLCache, logged
+
+__all__ = ["FileIdCache", "file_id_cache"]
+
+
+@logged()
+class FileIdCache:
+    """
+    Кэш file_id отчетов, уже загруженных в Telegram.
+
+    Ключ записи - имя файла (в нем ID пользователя и формат) и SHA-256
+    содержимого отчета. Если такой же файл уже отправлялся, бот отправляет его
+    повторно по file_id, не загружая содержимое заново.
+
+    :param maxsize: int - максимальное количество file_id в кэше.
+    :param ttl: float - срок жизни file_id в кэше в секундах, 0 - без ограничения.
+    """
+
+    def __init__(self, maxsize: int, ttl: float = 0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, report: ReportFile) -> str | None:
+        """
+        Возвращает file_id ранее отправленного отчета с таким же содержимым.
+
+        :param report: ReportFile - отчет.
+        :return: str - file_id или None, если отчет еще не отправлялся.
+        """
+        if report.digest is None:
+            return None
+        return self._cache.get((report.filename, report.digest))
+
+    def set(self, report: ReportFile, file_id: str) -> None:
+        """
+        Запоминает file_id отправленного отчета.
+
+        :param report: ReportFile - отчет.
+        :param file_id: str - file_id документа в Telegram.
+        :return: None
+        """
+        if report.digest is not None:
+            self._cache.set((report.filename, report.digest), file_id)
+
+    def invalidate(self, report: ReportFile) -> None:
+        """
+        Удаляет file_id отчета, например, если Telegram его больше не принимает.
+
+        :param report: ReportFile - отчет.
+        :return: None
+        """
+        self.log.warning(f"Метод invalidate. file_id отчета {report.filename} сброшен.")
+        self._cache.invalidate((report.filename, report.digest))
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику кэша file_id.
+
+        :return: dict - попадания, промахи, доля попаданий, вытеснения и
+        количество записей.
+        """
+        return self._cache.stats()
+
+
+file_id_cache = FileIdCache(
+    maxsize=settings.REPORT_FILE_ID_CACHE_SIZE, ttl=settings.REPORT_FILE_ID_CACHE_TTL
+)
@@ -0,0 +1,52 @@
+import json
+from decimal import Decimal
+from typing import BinaryIO, Iterable
+
+from app.api.servises.report_builders import RowBuilder
+from app.utils import logged
+
+__all__ = ["JSONLBuilder"]
+
+
+@logged()
+class JSONLBuilder(RowBuilder):
+    """
+    Построитель отчетов в формате JSON Lines: один объект на строку.
+
+    Ключи объекта совпадают с колонками RowBuilder.columns, суммы и лимиты
+    записываются числами.
+    """
+
+    extension = ".jsonl"
+
+    def write_data(self, data: Iterable[tuple], buffer: BinaryIO) -> None:
+        """
+        Записывает строки отчета в буфер в формате JSON Lines.
+
+        :param data: Iterable[tuple] - строки (период, статья, сумма, лимит,
+        процент).
+        :param buffer: BinaryIO - буфер, в который записывается отчет.
+        :return: None
+        """
+        self.log.debug("Метод write_data. Записываем данные в файл JSONL.")
+
+        for row in data:
+            record = dict(zip(self.columns, row))
+            line = json.dumps(record, ensure_ascii=False, default=self._to_number)
+            buffer.write(line.encode("utf-8"))
+            buffer.write(b"\n")
+
+        self.log.debug("Метод write_data. Данные записаны в JSONL.")
+
+    @staticmethod
+    def _to_number(value):
+        """
+        Преобразует Decimal из результата запроса в число для JSON.
+
+        :param value: значение, которое json не умеет сериализовать.
+        :return: float - число.
+        :raises TypeError: если значение не Decimal.
+        """
+        if isinstance(value, Decimal):
+            return float(value)
+        raise TypeError(f"{type(value).__name__} не сериализуется в JSON.")
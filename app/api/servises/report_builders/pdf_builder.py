@@ -1,9 +1,9 @@
 import os
-from typing import LiteralString
+from typing import BinaryIO
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer, Table,
@@ -14,43 +14,77 @@ from app.utils import logged
 
 __all__ = ["PDFBuilder"]
 
+FONT_NAME = "Roboto-Regular"
+
 
 @logged()
 class PDFBuilder(BaseBuilder):
-    def write_data(self, data: dict) -> LiteralString | str | bytes:
+    """
+    Построитель отчетов в формате PDF.
+
+    Шрифт, стиль заголовков и стиль таблиц создаются один раз на процесс при первом
+    отчете и затем переиспользуются. Стили образца reportlab не изменяются.
+    """
+
+    extension = ".pdf"
+    _heading_style: ParagraphStyle = None
+    _table_style: TableStyle = None
+
+    @classmethod
+    def _load_resources(cls) -> None:
         """
-        Записывает данные в файл PDF и сохраняет их на диск.
+        Регистрирует шрифт и создает стили, если это еще не сделано в процессе.
 
-        :param data: dict - данные, которые будут записаны в таблицу PDF (ключи -
-        период, значения - DataFrame с данными).
-        :return: LiteralString | str | bytes - путь к созданному файлу PDF.
+        :return: None
         """
-        self.log.debug("Метод write_data. Записываем данные в файл PDF.")
+        if cls._table_style is not None:
+            return
+
+        if FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+            font_path = os.path.abspath(
+                os.path.join("app", "api", "static", f"{FONT_NAME}.ttf")
+            )
+            pdfmetrics.registerFont(TTFont(FONT_NAME, font_path))
 
-        file_path = os.path.join(self.folder, self.filename + ".pdf")
-        font_path = os.path.abspath(
-            os.path.join("app", "api", "static", "Roboto-Regular.ttf")
+        cls._heading_style = ParagraphStyle(
+            name="ReportHeading",
+            parent=getSampleStyleSheet()["Heading1"],
+            fontName=FONT_NAME,
         )
-        pdfmetrics.registerFont(TTFont("Roboto-Regular", font_path))
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        story = []
-        styles = getSampleStyleSheet()
+        cls._table_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.Color(0.87, 0.721, 0.529)),
+                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+                ("FONTNAME", (0, 0), (-1, -1), FONT_NAME),
+                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+            ]
+        )
+        cls.log.debug("Метод _load_resources. Шрифт и стили PDF загружены.")
 
-        heading_style = styles["Heading1"]
-        heading_style.fontName = "Roboto-Regular"
+    def write_data(self, data: dict, buffer: BinaryIO) -> None:
+        """
+        Записывает данные в буфер в формате PDF.
 
-        normal_style = styles["Normal"]
-        normal_style.fontName = "Roboto-Regular"
+        :param data: dict - данные, которые будут записаны в таблицу PDF (ключи -
+        период, значения - DataFrame с данными).
+        :param buffer: BinaryIO - буфер, в который записывается отчет.
+        :return: None
+        """
+        self.log.debug("Метод write_data. Записываем данные в файл PDF.")
+        self._load_resources()
 
-        story.append(Paragraph("ExpensesAccountingBot", heading_style))
-        story.append(Spacer(1, 20))
+        doc = SimpleDocTemplate(buffer, pagesize=letter, invariant=True)
+        story = [
+            Paragraph("ExpensesAccountingBot", self._heading_style),
+            Spacer(1, 20),
+        ]
+        total_width = doc.pagesize[0] - 80
 
         for period, df in data.items():
-            story.append(Paragraph(f"{period}", heading_style))
+            story.append(Paragraph(f"{period}", self._heading_style))
             story.append(Spacer(1, 12))
 
             table_data = [df.columns.to_list()] + df.values.tolist()
-            total_width = doc.pagesize[0] - 80
             col_width = total_width / len(df.columns)
 
             table = Table(
@@ -59,27 +93,10 @@ class PDFBuilder(BaseBuilder):
                 splitByRow=True,
                 spaceAfter=20,
             )
-
-            table.setStyle(
-                TableStyle(
-                    [
-                        (
-                            "BACKGROUND",
-                            (0, 0),
-                            (-1, 0),
-                            colors.Color(0.87, 0.721, 0.529),
-                        ),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("FONTNAME", (0, 0), (-1, -1), "Roboto-Regular"),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ]
-                )
-            )
+            table.setStyle(self._table_style)
 
             story.append(table)
             story.append(Spacer(1, 12))
 
         doc.build(story)
-        self.log.debug(f"Метод write_data. Данные записаны в файл {file_path}.")
-
-        return file_path
+        self.log.debug("Метод write_data. Данные записаны в PDF.")
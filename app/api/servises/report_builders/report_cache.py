@@ -0,0 +1,86 @@
+import itertools
+from typing import Hashable
+
+from app.api.servises.report_builders.report_file import ReportFile
+from app.core.config import settings
+from app.utils import TTLCache, logged
+
+__all__ = ["ReportCache", "report_cache"]
+
+
+@logged()
+class ReportCache:
+    """
+    Кэш готовых файлов параметризованных отчетов.
+
+    Ключ записи - параметры отчета и версия данных пользователя. Добавление и
+    удаление трат, изменение лимитов и часового пояса увеличивают версию, поэтому
+    старые отчеты пользователя больше не находятся и со временем вытесняются.
+    Версии выдаются из общего счетчика и не повторяются. Кэшируются только отчеты,
+    которые хранятся в памяти; размер кэша ограничен суммарным объемом файлов.
+
+    Версии и файлы хранятся в памяти процесса: при запуске нескольких процессов
+    бота каждый ведет свой кэш, а устаревшие записи ограничены сроком жизни ttl.
+
+    :param maxsize: int - максимальный суммарный размер отчетов в байтах.
+    :param ttl: float - срок жизни отчета в кэше в секундах, 0 - без ограничения.
+    """
+
+    def __init__(self, maxsize: int, ttl: float = 0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, sizeof=lambda file: file.size)
+        self._versions: dict[int, int] = {}
+        self._counter = itertools.count(1)
+
+    def version(self, tg_id: int) -> int:
+        """
+        Возвращает текущую версию данных пользователя.
+
+        :param tg_id: int - ID пользователя в Telegram.
+        :return: int - версия данных.
+        """
+        return self._versions.get(tg_id, 0)
+
+    def bump(self, tg_id: int) -> None:
+        """
+        Увеличивает версию данных пользователя после изменения его трат или
+        лимитов.
+
+        :param tg_id: int - ID пользователя в Telegram.
+        :return: None
+        """
+        self._versions[tg_id] = next(self._counter)
+        self.log.debug(f"Метод bump. Версия данных {tg_id=}: {self._versions[tg_id]}.")
+
+    def get(self, key: Hashable) -> ReportFile | None:
+        """
+        Возвращает отчет из кэша.
+
+        :param key: Hashable - параметры отчета вместе с версией данных.
+        :return: ReportFile - отчет или None, если его нет в кэше.
+        """
+        return self._cache.get(key)
+
+    def set(self, key: Hashable, report: ReportFile) -> None:
+        """
+        Сохраняет отчет в кэш, если он хранится в памяти.
+
+        :param key: Hashable - параметры отчета вместе с версией данных.
+        :param report: ReportFile - отчет.
+        :return: None
+        """
+        if report.content is not None:
+            self._cache.set(key, report)
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику кэша отчетов.
+
+        :return: dict - попадания, промахи, доля попаданий, вытеснения,
+        количество отчетов и их суммарный размер в байтах.
+        """
+        return self._cache.stats()
+
+
+report_cache = ReportCache(
+    maxsize=settings.REPORT_CACHE_SIZE, ttl=settings.REPORT_CACHE_TTL
+)
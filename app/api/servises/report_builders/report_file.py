@@ -0,0 +1,89 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from io import BytesIO
+
+from aiogram.types import BufferedInputFile, FSInputFile, InputFile
+
+__all__ = ["ReportFile"]
+
+
+@dataclass
+class ReportFile:
+    """
+    Готовый файл отчета.
+
+    Небольшие отчеты хранятся в памяти (content), крупные сбрасываются на диск во
+    временный файл с уникальным именем (path). Объект можно передавать между
+    процессами. Хэш содержимого (digest) позволяет повторно отправить уже
+    загруженный в Telegram файл по его file_id.
+
+    :param filename: str - имя файла, которое увидит пользователь.
+    :param content: bytes - содержимое отчета, если он хранится в памяти.
+    :param path: str - путь к временному файлу, если отчет сброшен на диск.
+    :param digest: str - SHA-256 содержимого отчета.
+    """
+
+    filename: str
+    content: bytes | None = None
+    path: str | None = None
+    digest: str | None = None
+
+    @classmethod
+    def from_buffer(
+        cls, buffer: BytesIO, filename: str, spill_threshold: int, folder: str
+    ) -> "ReportFile":
+        """
+        Создает файл отчета из буфера, сбрасывая крупные отчеты на диск.
+
+        :param buffer: BytesIO - буфер с отчетом.
+        :param filename: str - имя файла, которое увидит пользователь.
+        :param spill_threshold: int - размер в байтах, начиная с которого отчет
+        сбрасывается на диск.
+        :param folder: str - каталог для временного файла.
+        :return: ReportFile - файл с отчетом.
+        """
+        digest = hashlib.sha256(buffer.getbuffer()).hexdigest()
+        if buffer.getbuffer().nbytes <= spill_threshold:
+            return cls(filename=filename, content=buffer.getvalue(), digest=digest)
+
+        os.makedirs(folder, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1], dir=folder)
+        with os.fdopen(fd, "wb") as file:
+            file.write(buffer.getbuffer())
+        return cls(filename=filename, path=path, digest=digest)
+
+    @property
+    def size(self) -> int:
+        """
+        Размер отчета в байтах.
+
+        :return: int - размер отчета.
+        """
+        if self.content is not None:
+            return len(self.content)
+        return os.path.getsize(self.path)
+
+    def as_input_file(self) -> InputFile:
+        """
+        Возвращает файл для отправки в Telegram.
+
+        :return: InputFile - файл из памяти или с диска.
+        """
+        if self.content is not None:
+            return BufferedInputFile(file=self.content, filename=self.filename)
+        return FSInputFile(path=self.path, filename=self.filename)
+
+    def cleanup(self) -> None:
+        """
+        Удаляет временный файл отчета, если он был создан.
+
+        :return: None
+        """
+        if self.path:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
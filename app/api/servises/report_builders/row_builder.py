@@ -0,0 +1,45 @@
+from io import BytesIO
+from typing import Iterator
+
+from app.api.servises.report_builders import BaseBuilder, ReportFile
+from app.utils import logged
+
+__all__ = ["RowBuilder"]
+
+
+@logged()
+class RowBuilder(BaseBuilder):
+    """
+    Базовый класс построителей построчных форматов.
+
+    Строки отчета берутся прямо из результата запроса (период, сумма, статья) в
+    порядке выдачи базы и записываются в буфер по одной: таблицы pandas не
+    строятся. Каждая строка дополняется лимитом статьи и процентом расхода,
+    процент для статей без лимита равен 0.
+    """
+
+    columns = ("period", "category", "summ", "limit", "percent")
+    uses_tables = False
+
+    def generate_report(self, tables: dict | None = None) -> ReportFile:
+        """
+        Генерирует отчет по расходам для пользователя.
+
+        :param tables: dict - не используется: строки берутся из expenses.
+        :return: ReportFile - файл с отчетом.
+        """
+        buffer = BytesIO()
+        self.write_data(data=self.iter_rows(), buffer=buffer)
+        return self._to_report_file(buffer=buffer)
+
+    def iter_rows(self) -> Iterator[tuple]:
+        """
+        Дополняет строки расходов лимитами и процентом расхода.
+
+        :return: Iterator[tuple] - строки (период, статья, сумма, лимит, процент).
+        """
+        limits = self.limits or {}
+        for period, summ, category in self.expenses:
+            limit = limits.get(category) or 0
+            percent = round(summ / limit * 100) if limit > 0 else 0
+            yield period, category, summ, limit, percent
@@ -1,34 +1,119 @@
-import os
-from typing import LiteralString
+import shutil
+import zipfile
+from datetime import datetime
+from typing import BinaryIO
 
-import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.writer.excel import ExcelWriter
 
 from app.api.servises.report_builders import BaseBuilder
+from app.api.servises.report_builders.executor import ARCHIVE_DATE_TIME
 from app.utils import logged
 
 __all__ = ["XLSXBuilder"]
 
 
+class _FixedTimeZipFile(zipfile.ZipFile):
+    """
+    ZIP-архив, в котором у всех файлов одно и то же время изменения
+    ARCHIVE_DATE_TIME.
+
+    openpyxl записывает части книги через writestr и write с текущим временем,
+    из-за чего одинаковые книги отличались бы побайтно.
+    """
+
+    def _entry(self, arcname: str) -> zipfile.ZipInfo:
+        """
+        Создает описание файла архива с фиксированным временем.
+
+        :param arcname: str - имя файла в архиве.
+        :return: zipfile.ZipInfo - описание файла.
+        """
+        entry = zipfile.ZipInfo(arcname, date_time=ARCHIVE_DATE_TIME)
+        entry.compress_type = self.compression
+        entry.external_attr = 0o600 << 16
+        return entry
+
+    def writestr(self, zinfo_or_arcname, data, *args, **kwargs):
+        if not isinstance(zinfo_or_arcname, zipfile.ZipInfo):
+            zinfo_or_arcname = self._entry(arcname=zinfo_or_arcname)
+        return super().writestr(zinfo_or_arcname, data, *args, **kwargs)
+
+    def write(self, filename, arcname=None, *args, **kwargs):
+        with open(filename, "rb") as source, self.open(
+            self._entry(arcname=arcname or filename), "w", force_zip64=True
+        ) as target:
+            shutil.copyfileobj(source, target)
+
+
 @logged()
 class XLSXBuilder(BaseBuilder):
-    def write_data(self, data: dict) -> LiteralString | str | bytes:
+    """
+    Построитель отчетов в формате XLSX.
+
+    Книга открывается в режиме write-only: строки каждого листа записываются
+    по одной и сразу сбрасываются во временный файл openpyxl, поэтому память не
+    растет с количеством периодов. Заголовки оформляются так же, как в
+    pd.ExcelWriter, дробные числа округляются до двух знаков.
+    """
+
+    extension = ".xlsx"
+    _thin = Side(style="thin")
+    _header_font = Font(bold=True)
+    _header_border = Border(left=_thin, right=_thin, top=_thin, bottom=_thin)
+    _header_alignment = Alignment(horizontal="center", vertical="top")
+
+    def write_data(self, data: dict, buffer: BinaryIO) -> None:
         """
-        Записывает данные в файл XLSX.
+        Записывает данные в буфер в формате XLSX.
 
         :param data: dict - словарь с данными для записи, где ключи - периоды,
                      а значения - DataFrame с данными.
-        :return: LiteralString | str | bytes - путь к записанному файлу XLSX.
+        :param buffer: BinaryIO - буфер, в который записывается отчет.
+        :return: None
         """
         self.log.debug("Метод write_data. Записываем данные в файл XLS.")
-        file_path = os.path.join(self.folder, self.filename + ".xlsx")
 
-        with pd.ExcelWriter(file_path) as writer:
-            self.log.debug("Метод write_data. Открыли врайтер.")
+        workbook = Workbook(write_only=True)
+        for period, df in data.items():
+            self.log.debug(f"Метод write_data. Смотрим айтемы {period}.")
 
-            for period, df in data.items():
-                self.log.debug(f"Метод write_data. Смотрим айтемы {period}.")
+            sheet = workbook.create_sheet(title=period)
+            sheet.append(self._header(sheet=sheet, columns=df.columns))
+            for row in df.itertuples(index=False, name=None):
+                sheet.append(
+                    [
+                        round(value, 2) if isinstance(value, float) else value
+                        for value in row
+                    ]
+                )
 
-                df.to_excel(writer, sheet_name=period, index=False, float_format="%.2f")
-        self.log.debug(f"Метод write_data. Данные записаны в файл {file_path}.")
+        # Время создания и изменения книги фиксировано, как и время файлов в
+        # архиве, поэтому одинаковые отчеты совпадают побайтно.
+        workbook.properties.created = workbook.properties.modified = datetime(
+            *ARCHIVE_DATE_TIME
+        )
+        with _FixedTimeZipFile(
+            buffer, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True
+        ) as archive:
+            ExcelWriter(workbook, archive).save()
+        self.log.debug("Метод write_data. Данные записаны в XLSX.")
 
-        return file_path
+    def _header(self, sheet, columns) -> list[WriteOnlyCell]:
+        """
+        Создает ячейки заголовка листа.
+
+        :param sheet: WriteOnlyWorksheet - лист, для которого создается заголовок.
+        :param columns: Index - названия столбцов.
+        :return: list[WriteOnlyCell] - оформленные ячейки заголовка.
+        """
+        cells = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = self._header_font
+            cell.border = self._header_border
+            cell.alignment = self._header_alignment
+            cells.append(cell)
+        return cells
@@ -1,5 +1,6 @@
-import os
-from typing import LiteralString
+from typing import BinaryIO
+
+from lxml import etree
 
 from app.api.servises.report_builders import BaseBuilder
 from app.utils import logged
@@ -9,30 +10,58 @@ __all__ = ["XMLBuilder"]
 
 @logged()
 class XMLBuilder(BaseBuilder):
-    def write_data(self, data: dict) -> LiteralString | str | bytes:
+    """
+    Построитель отчетов в формате XML.
+
+    Документ пишется потоково через lxml etree.xmlfile: каждая запись
+    сериализуется сразу в буфер, поэтому весь XML не собирается в памяти строкой.
+    Структура прежняя: Reports - Period - Record, пробелы в названиях столбцов
+    заменяются на подчеркивания.
+    """
+
+    extension = ".xml"
+
+    def write_data(self, data: dict, buffer: BinaryIO) -> None:
         """
-        Записывает данные в файл в формате XML.
+        Записывает данные в буфер в формате XML.
 
         :param data: dict - данные для записи,
         где ключи - периоды, а значения - DataFrame.
-        :return: LiteralString | str | bytes - путь к созданному файлу XML.
+        :param buffer: BinaryIO - буфер, в который записывается отчет.
+        :return: None
         """
         self.log.debug("Метод write_data. Записываем данные в файл XML.")
-        file_path = os.path.join(self.folder, self.filename + ".xml")
 
-        xml_content = "<?xml version='1.0' encoding='utf-8'?>\n<Reports>\n"
+        with etree.xmlfile(buffer, encoding="utf-8") as xml_file:
+            xml_file.write_declaration()
+            with xml_file.element("Reports"):
+                for period, df in data.items():
+                    tags = ["index"] + [
+                        column.replace(" ", "_") for column in df.columns
+                    ]
+                    xml_file.write("\n")
+                    xml_file.write(etree.Comment(f" Отчет за {period} "))
+                    xml_file.write("\n")
+                    with xml_file.element("Period"):
+                        xml_file.write("\n")
+                        for row in df.itertuples(index=True, name=None):
+                            xml_file.write(
+                                self._record(tags=tags, row=row), pretty_print=True
+                            )
+                xml_file.write("\n")
 
-        for period, df in data.items():
-            df.columns = df.columns.str.replace(" ", "_")
-            xml_content += f"  <!-- Отчет за {period} -->\n"
-            xml_content += df.to_xml(
-                root_name="Period", row_name="Record", xml_declaration=False
-            )
+        self.log.debug("Метод write_data. Данные записаны в XML.")
 
-        xml_content += "\n</Reports>"
-
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(xml_content)
-        self.log.debug(f"Метод write_data. Данные записаны в файл {file_path}.")
+    @staticmethod
+    def _record(tags: list[str], row: tuple) -> etree._Element:
+        """
+        Создает элемент Record для строки таблицы.
 
-        return file_path
+        :param tags: list[str] - названия элементов столбцов.
+        :param row: tuple - значения строки вместе с индексом.
+        :return: etree._Element - элемент записи.
+        """
+        record = etree.Element("Record")
+        for tag, value in zip(tags, row):
+            etree.SubElement(record, tag).text = str(value)
+        return record
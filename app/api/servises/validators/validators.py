@@ -1,5 +1,8 @@
 import calendar
-from typing import Any
+import math
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, ClassVar
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -7,6 +10,13 @@ from app.api.servises.mapping.mapping import (ExpenseArticleMapping,
                                               ExpenseLimitsArticleMapping)
 from app.api.servises.texts.texts import texts
 
+# Наибольшая сумма, которая помещается в DECIMAL(10, 2).
+MAX_AMOUNT = Decimal("99999999.99")
+# Допустимый диапазон дат трат в файле импорта: за его пределами перевод в UTC
+# выходит за границы datetime, а секций таблицы трат для таких дат нет.
+MIN_IMPORT_DATE = datetime(1970, 1, 1)
+MAX_IMPORT_DATE = datetime(2100, 1, 1)
+
 months = {
     "январь": 1,
     "февраль": 2,
@@ -51,19 +61,74 @@ class InsertValidator(ArticleValidator):
     @field_validator("amount")
     def validate_amount(cls, value):
         """
-        Проверяет, что значение суммы является положительным числом.
+        Проверяет, что значение суммы является положительным конечным числом, не
+        больше MAX_AMOUNT. Дробную часть можно отделять точкой или запятой.
 
         :param value: str - сумма, которую нужно проверить.
         :return: float - возвращает сумму как число с плавающей точкой.
-        :raises ValueError: если сумма не является числом или меньше либо равна нулю.
+        :raises ValueError: если сумма не является конечным числом, меньше либо
+        равна нулю или больше MAX_AMOUNT.
         """
         try:
-            value = float(value)
+            value = float(value.strip().replace(",", "."))
         except ValueError:
             raise ValueError("Значение должно быть числом.")
 
+        if not math.isfinite(value):
+            raise ValueError("Значение должно быть числом.")
         if value <= 0:
             raise ValueError("Значение должно быть больше нуля.")
+        if round(Decimal(str(value)), 2) > MAX_AMOUNT:
+            raise ValueError(f"Сумма не должна превышать {MAX_AMOUNT}.")
+        return value
+
+
+class ImportValidator(InsertValidator):
+    date: Any
+
+    date_formats: ClassVar[tuple[str, ...]] = (
+        "%d.%m.%Y",
+        "%d.%m.%Y %H:%M",
+        "%d.%m.%Y %H:%M:%S",
+        "%Y-%m-%d",
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%d %H:%M:%S",
+    )
+
+    @field_validator("date")
+    def validate_date(cls, value):
+        """
+        Проверяет, что дата траты указана в одном из поддерживаемых форматов.
+
+        :param value: Any - дата из файла: datetime из XLSX или строка.
+        :return: datetime - дата и время траты по местному времени пользователя.
+        :raises ValueError: если дата не распознана или вне допустимого диапазона.
+        """
+        if isinstance(value, datetime):
+            return cls._check_range(value=value)
+        for date_format in cls.date_formats:
+            try:
+                parsed = datetime.strptime(str(value).strip(), date_format)
+            except ValueError:
+                continue
+            return cls._check_range(value=parsed)
+        raise ValueError("Дата должна быть в формате ДД.ММ.ГГГГ или ГГГГ-ММ-ДД.")
+
+    @staticmethod
+    def _check_range(value: datetime) -> datetime:
+        """
+        Проверяет, что дата траты попадает в допустимый диапазон.
+
+        :param value: datetime - дата траты.
+        :return: datetime - та же дата.
+        :raises ValueError: если дата раньше MIN_IMPORT_DATE или не раньше
+        MAX_IMPORT_DATE.
+        """
+        if not MIN_IMPORT_DATE <= value < MAX_IMPORT_DATE:
+            raise ValueError(
+                f"Дата должна быть не раньше {MIN_IMPORT_DATE.year} года "
+                f"и не позже {MAX_IMPORT_DATE.year - 1} года."
+            )
         return value
 
 
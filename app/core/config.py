@@ -1,4 +1,5 @@
 import os
+from typing import Literal, Optional
 
 import pydantic
 import pydantic_settings
@@ -21,6 +22,57 @@ class Settings(pydantic_settings.BaseSettings):
     :param POOL_SIZE: int - размер пула соединений для базы данных.
     :param MAX_OVERFLOW: int - максимальное количество дополнительных соединений.
     :param DEBUG: bool - флаг для режима отладки.
+    :param FSM_STORAGE: str - хранилище состояний FSM: postgres или memory.
+    :param FSM_TTL: int - срок хранения состояния без обращений, секунды.
+    0 - без ограничения.
+    :param FSM_FLUSH_INTERVAL: float - период записи состояний в базу, секунды.
+    0 - запись при каждом изменении.
+    :param FSM_CACHE_SIZE: int - количество состояний в кэше процесса.
+    :param BOT_MODE: str - способ получения обновлений: polling или webhook.
+    :param WEBHOOK_HOST: str - адрес, на котором слушает сервер вебхука.
+    :param WEBHOOK_PORT: int - порт сервера вебхука.
+    :param WEBHOOK_PATH: str - путь, на который приходят обновления.
+    :param WEBHOOK_BASE_URL: str - внешний адрес бота (за обратным прокси),
+    по которому вебхук регистрируется в Telegram. Если не задан, вебхук
+    не регистрируется.
+    :param WEBHOOK_SECRET: SecretStr - секрет для проверки запросов от Telegram.
+    :param WEBHOOK_MAX_CONCURRENCY: int - максимальное количество одновременно
+    обрабатываемых обновлений.
+    :param USER_CACHE_SIZE: int - количество пользователей в кэше процесса.
+    :param USER_CACHE_TTL: int - срок жизни пользователя в кэше, секунды.
+    :param LIMITS_CACHE_SIZE: int - количество лимитов пользователей в кэше.
+    :param LIMITS_CACHE_TTL: int - срок жизни лимитов в кэше, секунды.
+    :param REPORT_SPILL_THRESHOLD: int - размер отчета в байтах, начиная с которого
+    он сбрасывается из памяти во временный файл.
+    :param REPORT_TEMP_DIR: str - каталог для временных файлов отчетов.
+    Если не задан, используется системный каталог временных файлов.
+    :param REPORT_EXECUTOR: str - пул для построения файлов отчетов: process
+    или thread.
+    :param REPORT_WORKERS: int - количество исполнителей пула отчетов.
+    :param REPORT_TIMEOUT: float - время ожидания отчета с учетом очереди, секунды.
+    0 - без ограничения.
+    :param REPORT_MAX_QUEUE: int - сколько отчетов может ждать свободного
+    исполнителя. 0 - без ограничения.
+    :param REPORT_CACHE_SIZE: int - максимальный суммарный размер готовых отчетов
+    в кэше, байты.
+    :param REPORT_CACHE_TTL: int - срок жизни отчета в кэше, секунды.
+    :param REPORT_FILE_ID_CACHE_SIZE: int - количество file_id отправленных
+    отчетов в кэше.
+    :param REPORT_FILE_ID_CACHE_TTL: int - срок жизни file_id в кэше, секунды.
+    :param IMPORT_MAX_FILE_SIZE: int - максимальный размер файла импорта трат,
+    байты (Bot API отдает ботам файлы до 20 МБ).
+    :param IMPORT_CHUNK_SIZE: int - сколько строк файла импорта загружается в базу
+    за один COPY.
+    :param IMPORT_MAX_ERRORS: int - сколько ошибок по строкам показывается
+    пользователю после импорта.
+    :param EXPORT_BATCH_SIZE: int - сколько трат читается из курсора базы за раз
+    при выгрузке всей истории.
+    :param DELETE_PAGE_SIZE: int - сколько трат показывается на одной странице
+    при удалении.
+    :param PARTITIONS_MONTHS_AHEAD: int - на сколько месяцев вперед заранее
+    создаются секции таблицы трат.
+    :param PARTITIONS_CHECK_INTERVAL: int - период проверки секций таблицы трат,
+    секунды. 0 - проверка только при старте бота.
     :return: объект Settings с настройками проекта.
     """
 
@@ -37,6 +89,46 @@ class Settings(pydantic_settings.BaseSettings):
 
     DEBUG: bool
 
+    FSM_STORAGE: Literal["postgres", "memory"] = "postgres"
+    FSM_TTL: int = 7 * 24 * 60 * 60
+    FSM_FLUSH_INTERVAL: float = 1.0
+    FSM_CACHE_SIZE: int = 10000
+
+    BOT_MODE: Literal["polling", "webhook"] = "polling"
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_BASE_URL: Optional[str] = None
+    WEBHOOK_SECRET: Optional[pydantic.SecretStr] = None
+    WEBHOOK_MAX_CONCURRENCY: int = 100
+
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: int = 10 * 60
+    LIMITS_CACHE_SIZE: int = 10000
+    LIMITS_CACHE_TTL: int = 10 * 60
+
+    REPORT_SPILL_THRESHOLD: int = 10 * 1024 * 1024
+    REPORT_TEMP_DIR: Optional[str] = None
+    REPORT_EXECUTOR: Literal["process", "thread"] = "process"
+    REPORT_WORKERS: int = 2
+    REPORT_TIMEOUT: float = 60
+    REPORT_MAX_QUEUE: int = 100
+    REPORT_CACHE_SIZE: int = 64 * 1024 * 1024
+    REPORT_CACHE_TTL: int = 60 * 60
+    REPORT_FILE_ID_CACHE_SIZE: int = 10000
+    REPORT_FILE_ID_CACHE_TTL: int = 7 * 24 * 60 * 60
+
+    IMPORT_MAX_FILE_SIZE: int = 20 * 1024 * 1024
+    IMPORT_CHUNK_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 20
+
+    EXPORT_BATCH_SIZE: int = 1000
+
+    DELETE_PAGE_SIZE: int = 8
+
+    PARTITIONS_MONTHS_AHEAD: int = 3
+    PARTITIONS_CHECK_INTERVAL: int = 24 * 60 * 60
+
     class Config:
         env_file = os.path.abspath(os.path.join("..", ".env"))
 
@@ -1,35 +1,15 @@
-from app.db.models import (AlcoholArticle, Base, BaseArticle, CharityArticle,
-                           CigarettesArticle, CosmeticsAndCareArticle,
-                           DebtsArticle, DevicesArticle, EatingOutArticle,
-                           EducationArticle, EntertainmentArticle,
-                           FriendsAndFamilyArticle, HealthArticle,
-                           HouseholdArticle, MonthlyLimits, PetsArticle,
-                           ProductsArticle, PurchasesArticle, ServicesArticle,
-                           SportArticle, TransportArticle, TravelArticle, User)
+from app.db.models import (EXPENSE_CATEGORIES, EXPENSE_CATEGORY_IDS, Base,
+                           Expense, ExpenseCategory, FSMRecord, MonthlyLimits,
+                           MonthlyTotal, User)
 
 __all__ = [
     "Base",
     "User",
     "MonthlyLimits",
-    "BaseArticle",
-    "BaseArticle",
-    "AlcoholArticle",
-    "CharityArticle",
-    "DebtsArticle",
-    "HouseholdArticle",
-    "EatingOutArticle",
-    "HealthArticle",
-    "CosmeticsAndCareArticle",
-    "EducationArticle",
-    "PetsArticle",
-    "PurchasesArticle",
-    "ProductsArticle",
-    "TravelArticle",
-    "EntertainmentArticle",
-    "FriendsAndFamilyArticle",
-    "CigarettesArticle",
-    "SportArticle",
-    "DevicesArticle",
-    "TransportArticle",
-    "ServicesArticle",
+    "MonthlyTotal",
+    "EXPENSE_CATEGORIES",
+    "EXPENSE_CATEGORY_IDS",
+    "ExpenseCategory",
+    "Expense",
+    "FSMRecord",
 ]
@@ -0,0 +1,150 @@
+"""Add monthly totals rollup
+
+Revision ID: 3b7e2d91c4a8
+Revises: 6084ee6f7300
+Create Date: 2026-10-18 14:10:27.604113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e2d91c4a8"
+down_revision: Union[str, None] = "6084ee6f7300"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Месяц траты считается по местному времени пользователя: users.timezone - сдвиг
+# от UTC в часах, updated_at хранится в UTC.
+LOCAL_MONTH = (
+    "date_trunc('month', {updated_at} + make_interval(hours => {timezone}))::date"
+)
+
+APPLY_FUNCTION = f"""
+CREATE FUNCTION monthly_totals_apply(
+    p_user_id bigint,
+    p_category_id smallint,
+    p_updated_at timestamp,
+    p_summ numeric,
+    p_count integer
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO monthly_totals (user_id, month, category_id, total, count)
+    SELECT
+        p_user_id,
+        {LOCAL_MONTH.format(updated_at="p_updated_at", timezone="u.timezone")},
+        p_category_id,
+        p_summ,
+        p_count
+    FROM users u
+    WHERE u.tg_id = p_user_id
+    ON CONFLICT (user_id, month, category_id) DO UPDATE
+    SET total = monthly_totals.total + EXCLUDED.total,
+        count = monthly_totals.count + EXCLUDED.count;
+
+    IF p_count < 0 THEN
+        DELETE FROM monthly_totals
+        WHERE user_id = p_user_id AND count <= 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+EXPENSES_FUNCTION = """
+CREATE FUNCTION expenses_monthly_totals() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM monthly_totals_apply(
+            OLD.user_id, OLD.category_id, OLD.updated_at, -OLD.summ, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM monthly_totals_apply(
+            NEW.user_id, NEW.category_id, NEW.updated_at, NEW.summ, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+USERS_FUNCTION = f"""
+CREATE FUNCTION users_rebuild_monthly_totals() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM monthly_totals WHERE user_id = NEW.tg_id;
+    INSERT INTO monthly_totals (user_id, month, category_id, total, count)
+    SELECT
+        e.user_id,
+        {LOCAL_MONTH.format(updated_at="e.updated_at", timezone="NEW.timezone")},
+        e.category_id,
+        sum(e.summ),
+        count(*)
+    FROM expenses e
+    WHERE e.user_id = NEW.tg_id
+    GROUP BY 1, 2, 3;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+BACKFILL = f"""
+INSERT INTO monthly_totals (user_id, month, category_id, total, count)
+SELECT
+    e.user_id,
+    {LOCAL_MONTH.format(updated_at="e.updated_at", timezone="u.timezone")},
+    e.category_id,
+    sum(e.summ),
+    count(*)
+FROM expenses e
+JOIN users u ON u.tg_id = e.user_id
+GROUP BY 1, 2, 3
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_totals",
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("category_id", sa.SmallInteger(), nullable=False),
+        sa.Column("total", sa.DECIMAL(precision=12, scale=2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.tg_id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["category_id"], ["expense_categories.id"]),
+        sa.PrimaryKeyConstraint("user_id", "month", "category_id"),
+    )
+
+    op.execute(APPLY_FUNCTION)
+    op.execute(EXPENSES_FUNCTION)
+    op.execute(USERS_FUNCTION)
+
+    # Таблица expenses блокируется до конца транзакции, поэтому траты, добавленные
+    # во время заполнения итогов, не потеряются.
+    op.execute("LOCK TABLE expenses IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(BACKFILL)
+    op.execute(
+        "CREATE TRIGGER expenses_monthly_totals "
+        "AFTER INSERT OR UPDATE OR DELETE ON expenses "
+        "FOR EACH ROW EXECUTE FUNCTION expenses_monthly_totals()"
+    )
+    op.execute(
+        "CREATE TRIGGER users_rebuild_monthly_totals "
+        "AFTER UPDATE OF timezone ON users "
+        "FOR EACH ROW WHEN (OLD.timezone IS DISTINCT FROM NEW.timezone) "
+        "EXECUTE FUNCTION users_rebuild_monthly_totals()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS users_rebuild_monthly_totals ON users")
+    op.execute("DROP TRIGGER IF EXISTS expenses_monthly_totals ON expenses")
+    op.execute("DROP FUNCTION IF EXISTS users_rebuild_monthly_totals()")
+    op.execute("DROP FUNCTION IF EXISTS expenses_monthly_totals()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "monthly_totals_apply(bigint, smallint, timestamp, numeric, integer)"
+    )
+    op.drop_table("monthly_totals")
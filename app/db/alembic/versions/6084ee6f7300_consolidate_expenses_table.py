@@ -0,0 +1,157 @@
+"""Consolidate expense articles into partitioned expenses table
+
+Revision ID: 6084ee6f7300
+Revises: f9893df8b5fe
+Create Date: 2026-10-18 13:05:41.120377
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6084ee6f7300"
+down_revision: Union[str, None] = "f9893df8b5fe"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Порядок задает category_id и должен совпадать с EXPENSE_CATEGORIES.
+EXPENSE_CATEGORIES = (
+    "alcohol",
+    "charity",
+    "debts",
+    "household",
+    "eating_out",
+    "health",
+    "cosmetics_and_care",
+    "education",
+    "pets",
+    "purchases",
+    "products",
+    "travel",
+    "entertainment",
+    "friends_and_family",
+    "cigarettes",
+    "sport",
+    "devices",
+    "transport",
+    "services",
+)
+
+# Месячные секции создаются на этот диапазон, остальное попадает в expenses_default.
+# Секции на следующие месяцы создает бот при старте (PartitionMaintainer).
+FIRST_PARTITION_MONTH = date(2024, 1, 1)
+LAST_PARTITION_MONTH = date(2030, 12, 1)
+
+
+def next_month(month: date) -> date:
+    """
+    Возвращает первое число следующего месяца.
+
+    :param month: date - первое число месяца.
+    :return: date - первое число следующего месяца.
+    """
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def month_starts():
+    """
+    Перечисляет первые числа месяцев, для которых создаются секции.
+
+    :return: генератор дат начала месяцев.
+    """
+    month = FIRST_PARTITION_MONTH
+    while month <= LAST_PARTITION_MONTH:
+        yield month
+        month = next_month(month)
+
+
+def upgrade() -> None:
+    categories = op.create_table(
+        "expense_categories",
+        sa.Column("id", sa.SmallInteger(), autoincrement=False, nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.bulk_insert(
+        categories,
+        [
+            {"id": category_id, "name": name}
+            for category_id, name in enumerate(EXPENSE_CATEGORIES, start=1)
+        ],
+    )
+
+    op.execute(sa.schema.CreateSequence(sa.Sequence("expenses_id_seq")))
+    op.create_table(
+        "expenses",
+        sa.Column(
+            "id",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('expenses_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("category_id", sa.SmallInteger(), nullable=False),
+        sa.Column("summ", sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.tg_id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["category_id"], ["expense_categories.id"]),
+        sa.PrimaryKeyConstraint("id", "updated_at"),
+        postgresql_partition_by="RANGE (updated_at)",
+    )
+    op.execute("ALTER SEQUENCE expenses_id_seq OWNED BY expenses.id")
+
+    for month in month_starts():
+        op.execute(
+            f"CREATE TABLE expenses_y{month.year}m{month.month:02} "
+            f"PARTITION OF expenses "
+            f"FOR VALUES FROM ('{month}') TO ('{next_month(month)}')"
+        )
+    op.execute("CREATE TABLE expenses_default PARTITION OF expenses DEFAULT")
+
+    op.create_index(
+        "ix_expenses_user_id_updated_at",
+        "expenses",
+        ["user_id", "updated_at"],
+        postgresql_include=["category_id", "summ"],
+    )
+
+    for category_id, table in enumerate(EXPENSE_CATEGORIES, start=1):
+        op.execute(
+            f"INSERT INTO expenses (user_id, category_id, summ, updated_at) "
+            f"SELECT user_id, {category_id}, summ, "
+            f"COALESCE(updated_at, now() AT TIME ZONE 'utc') FROM {table}"
+        )
+        op.drop_table(table)
+
+
+def downgrade() -> None:
+    for category_id, table in enumerate(EXPENSE_CATEGORIES, start=1):
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.BigInteger(), nullable=False),
+            sa.Column("summ", sa.DECIMAL(precision=10, scale=2), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.tg_id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            f"ix_{table}_user_id_updated_at",
+            table,
+            ["user_id", "updated_at"],
+            postgresql_include=["summ"],
+        )
+        op.execute(
+            f"INSERT INTO {table} (user_id, summ, updated_at) "
+            f"SELECT user_id, summ, updated_at FROM expenses "
+            f"WHERE category_id = {category_id} ORDER BY updated_at"
+        )
+
+    # Секции и последовательность expenses_id_seq удаляются вместе с таблицей.
+    op.drop_table("expenses")
+    op.drop_table("expense_categories")
@@ -0,0 +1,35 @@
+"""Add fsm storage
+
+Revision ID: a41c5e7d2f60
+Revises: 3b7e2d91c4a8
+Create Date: 2026-10-18 15:02:48.310955
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a41c5e7d2f60"
+down_revision: Union[str, None] = "3b7e2d91c4a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fsm_storage",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("state", sa.String(length=255), nullable=True),
+        sa.Column("data", sa.LargeBinary(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_fsm_storage_expires_at", "fsm_storage", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fsm_storage_expires_at", table_name="fsm_storage")
+    op.drop_table("fsm_storage")
@@ -0,0 +1,32 @@
+"""Add expenses keyset index
+
+Revision ID: b5d1e8f3a927
+Revises: a41c5e7d2f60
+Create Date: 2026-10-18 16:20:31.402117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d1e8f3a927"
+down_revision: Union[str, None] = "a41c5e7d2f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_expenses_user_id_category_id_updated_at_id",
+        "expenses",
+        ["user_id", "category_id", "updated_at", "id"],
+        postgresql_include=["summ"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_expenses_user_id_category_id_updated_at_id", table_name="expenses"
+    )
@@ -0,0 +1,64 @@
+"""Add expense articles indexes
+
+Revision ID: f9893df8b5fe
+Revises: 54413cc9dd16
+Create Date: 2026-10-18 12:40:12.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f9893df8b5fe"
+down_revision: Union[str, None] = "54413cc9dd16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EXPENSE_TABLES = (
+    "alcohol",
+    "charity",
+    "cigarettes",
+    "cosmetics_and_care",
+    "debts",
+    "devices",
+    "eating_out",
+    "education",
+    "entertainment",
+    "friends_and_family",
+    "health",
+    "household",
+    "pets",
+    "products",
+    "purchases",
+    "services",
+    "sport",
+    "transport",
+    "travel",
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    with op.get_context().autocommit_block():
+        for table in EXPENSE_TABLES:
+            op.create_index(
+                f"ix_{table}_user_id_updated_at",
+                table,
+                ["user_id", "updated_at"],
+                postgresql_include=["summ"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in EXPENSE_TABLES:
+            op.drop_index(
+                f"ix_{table}_user_id_updated_at",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -1,43 +1,19 @@
 from app.db.models.base import Base
-from app.db.models.base_expense import BaseArticle
-from app.db.models.expense_articles import (AlcoholArticle, CharityArticle,
-                                            CigarettesArticle,
-                                            CosmeticsAndCareArticle,
-                                            DebtsArticle, DevicesArticle,
-                                            EatingOutArticle, EducationArticle,
-                                            EntertainmentArticle,
-                                            FriendsAndFamilyArticle,
-                                            HealthArticle, HouseholdArticle,
-                                            PetsArticle, ProductsArticle,
-                                            PurchasesArticle, ServicesArticle,
-                                            SportArticle, TransportArticle,
-                                            TravelArticle)
+from app.db.models.expense import (EXPENSE_CATEGORIES, EXPENSE_CATEGORY_IDS,
+                                   Expense, ExpenseCategory)
+from app.db.models.fsm_storage import FSMRecord
 from app.db.models.monthly_limits import MonthlyLimits
+from app.db.models.monthly_totals import MonthlyTotal
 from app.db.models.user import User
 
 __all__ = [
     "Base",
     "User",
     "MonthlyLimits",
-    "BaseArticle",
-    "BaseArticle",
-    "AlcoholArticle",
-    "CharityArticle",
-    "DebtsArticle",
-    "HouseholdArticle",
-    "EatingOutArticle",
-    "HealthArticle",
-    "CosmeticsAndCareArticle",
-    "EducationArticle",
-    "PetsArticle",
-    "PurchasesArticle",
-    "ProductsArticle",
-    "TravelArticle",
-    "EntertainmentArticle",
-    "FriendsAndFamilyArticle",
-    "CigarettesArticle",
-    "SportArticle",
-    "DevicesArticle",
-    "TransportArticle",
-    "ServicesArticle",
+    "MonthlyTotal",
+    "EXPENSE_CATEGORIES",
+    "EXPENSE_CATEGORY_IDS",
+    "ExpenseCategory",
+    "Expense",
+    "FSMRecord",
 ]
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+from sqlalchemy import DECIMAL, BigInteger, Column, DateTime, String
+from sqlalchemy.orm import relationship
+from sqlalchemy.schema import ForeignKey, Index, PrimaryKeyConstraint, Sequence
+from sqlalchemy.types import SmallInteger
+
+from app.db.models.base import Base
+
+__all__ = [
+    "EXPENSE_CATEGORIES",
+    "EXPENSE_CATEGORY_IDS",
+    "ExpenseCategory",
+    "Expense",
+]
+
+EXPENSE_CATEGORIES = (
+    "alcohol",
+    "charity",
+    "debts",
+    "household",
+    "eating_out",
+    "health",
+    "cosmetics_and_care",
+    "education",
+    "pets",
+    "purchases",
+    "products",
+    "travel",
+    "entertainment",
+    "friends_and_family",
+    "cigarettes",
+    "sport",
+    "devices",
+    "transport",
+    "services",
+)
+EXPENSE_CATEGORY_IDS = {
+    name: category_id for category_id, name in enumerate(EXPENSE_CATEGORIES, start=1)
+}
+
+expenses_id_seq = Sequence("expenses_id_seq")
+
+
+class ExpenseCategory(Base):
+    """
+    Справочник статей расходов.
+
+    :param id: int - идентификатор статьи (совпадает с EXPENSE_CATEGORY_IDS).
+    :param name: str - системное имя статьи (alcohol, charity, ...).
+    """
+
+    __tablename__ = "expense_categories"
+
+    id = Column(SmallInteger, primary_key=True, autoincrement=False)
+    name = Column(String(50), nullable=False, unique=True)
+
+
+class Expense(Base):
+    """
+    Модель траты. Таблица секционирована по месяцам по полю updated_at.
+
+    :param id: int - идентификатор траты.
+    :param user_id: int - идентификатор пользователя.
+    :param category_id: int - идентификатор статьи расходов.
+    :param summ: decimal - сумма траты.
+    :param updated_at: datetime - дата и время последнего обновления (UTC).
+    """
+
+    __tablename__ = "expenses"
+
+    id = Column(
+        BigInteger, expenses_id_seq, server_default=expenses_id_seq.next_value()
+    )
+    user_id = Column(
+        BigInteger, ForeignKey("users.tg_id", ondelete="CASCADE"), nullable=False
+    )
+    category_id = Column(
+        SmallInteger, ForeignKey("expense_categories.id"), nullable=False
+    )
+    summ = Column(DECIMAL(10, 2), nullable=False)
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    user = relationship("User", backref="expenses", passive_deletes=True)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "updated_at"),
+        Index(
+            "ix_expenses_user_id_updated_at",
+            "user_id",
+            "updated_at",
+            postgresql_include=["category_id", "summ"],
+        ),
+        Index(
+            "ix_expenses_user_id_category_id_updated_at_id",
+            "user_id",
+            "category_id",
+            "updated_at",
+            "id",
+            postgresql_include=["summ"],
+        ),
+        {"postgresql_partition_by": "RANGE (updated_at)"},
+    )
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, Index, LargeBinary, String
+
+from app.db.models.base import Base
+
+__all__ = ["FSMRecord"]
+
+
+class FSMRecord(Base):
+    """
+    Модель для хранения состояний FSM пользователей.
+
+    :param key: str - ключ записи, собранный KeyBuilder aiogram.
+    :param state: str - текущее состояние или None.
+    :param data: bytes - сжатые сериализованные данные состояния или None.
+    :param expires_at: datetime - момент (UTC), после которого запись считается
+    устаревшей, или None, если срок хранения не ограничен.
+    """
+
+    __tablename__ = "fsm_storage"
+
+    key = Column(String(255), primary_key=True)
+    state = Column(String(255), nullable=True)
+    data = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_fsm_storage_expires_at", "expires_at"),)
@@ -0,0 +1,37 @@
+from sqlalchemy import DECIMAL, BigInteger, Column, Date, Integer, SmallInteger
+from sqlalchemy.schema import ForeignKey, PrimaryKeyConstraint
+
+from app.db.models.base import Base
+
+__all__ = ["MonthlyTotal"]
+
+
+class MonthlyTotal(Base):
+    """
+    Месячные итоги трат пользователя по статьям расходов.
+
+    Таблицу ведут триггеры базы данных: expenses_monthly_totals обновляет итоги
+    при каждой вставке, изменении и удалении траты, users_rebuild_monthly_totals
+    пересчитывает итоги пользователя при смене часового пояса. Из приложения
+    таблица только читается.
+
+    :param user_id: int - идентификатор пользователя.
+    :param month: date - первое число месяца по местному времени пользователя.
+    :param category_id: int - идентификатор статьи расходов.
+    :param total: decimal - сумма трат за месяц.
+    :param count: int - количество трат за месяц.
+    """
+
+    __tablename__ = "monthly_totals"
+
+    user_id = Column(
+        BigInteger, ForeignKey("users.tg_id", ondelete="CASCADE"), nullable=False
+    )
+    month = Column(Date, nullable=False)
+    category_id = Column(
+        SmallInteger, ForeignKey("expense_categories.id"), nullable=False
+    )
+    total = Column(DECIMAL(12, 2), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (PrimaryKeyConstraint("user_id", "month", "category_id"),)
@@ -6,6 +6,13 @@ from app.db import Base
 
 
 class BaseRepository(ABC):
+    """
+    Базовый репозиторий.
+
+    Репозитории не завершают транзакцию: изменения отправляются в базу через
+    flush, а фиксирует или откатывает их владелец сессии.
+    """
+
     @abstractmethod
     async def create(self, session: AsyncSession, item: Base):
         """
@@ -1,18 +1,19 @@
 from datetime import datetime
-from typing import Type
+from typing import AsyncIterator, Sequence
 
-from sqlalchemy import and_, desc, func, literal, union
+from sqlalchemy import Row, and_, delete, desc, func, insert, literal, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
 from app import logged
-from app.db import Base
+from app.db import Base, Expense, ExpenseCategory
 from app.db.repositories.base import BaseRepository
 
 
 @logged()
 class ExpenseArticleRepository(BaseRepository):
+    _copy_columns = ("user_id", "category_id", "summ", "updated_at")
+
     @classmethod
     async def create(cls, session: AsyncSession, item: Base):
         """
@@ -24,9 +25,44 @@ class ExpenseArticleRepository(BaseRepository):
         """
         cls.log.info(f"Метод create. Добавление нового элемента в базу данных: {item}.")
         session.add(item)
-        await session.commit()
+        await session.flush()
         return item
 
+    @classmethod
+    async def create_many(cls, session: AsyncSession, rows: list[dict]) -> int:
+        """
+        Добавляет несколько трат одним многострочным INSERT.
+
+        ORM-объекты не создаются, поэтому вставка не зависит от identity map
+        сессии и не требует отдельного запроса на каждую трату.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param rows: list[dict] - значения столбцов для каждой траты.
+        :return: int - количество добавленных трат.
+        """
+        cls.log.info(f"Метод create_many. Добавление {len(rows)} трат одним запросом.")
+        result = await session.execute(insert(Expense).values(rows))
+        return result.rowcount
+
+    @classmethod
+    async def copy_many(cls, session: AsyncSession, records: list[tuple]) -> int:
+        """
+        Загружает траты через COPY (asyncpg copy_records_to_table).
+
+        COPY выполняется на соединении сессии, поэтому входит в ее транзакцию.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param records: list[tuple] - траты (user_id, category_id, summ, updated_at).
+        :return: int - количество загруженных трат.
+        """
+        cls.log.info(f"Метод copy_many. Загрузка {len(records)} трат через COPY.")
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Expense.__tablename__, records=records, columns=cls._copy_columns
+        )
+        return len(records)
+
     @classmethod
     async def read(cls, session: AsyncSession, user_id: int, model: Base):
         """
@@ -45,99 +81,125 @@ class ExpenseArticleRepository(BaseRepository):
         return result.scalars().first()
 
     @classmethod
-    async def get_last_hundred_records(
+    async def get_records_page(
         cls,
         session: AsyncSession,
         tg_id: int,
-        model: Base,
-        limit: int = 50,
-        offset: int = 0,
-    ):
+        category_id: int,
+        limit: int,
+        before: tuple[datetime, int] | None = None,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Row]:
         """
-        Получает последние записи для tg_id с учетом лимита и смещения.
+        Получает страницу трат статьи расходов для tg_id по ключу (updated_at, id).
+
+        Вместо OFFSET страница начинается сразу за ключом соседней записи, поэтому
+        запрос читает из индекса только limit строк на любой глубине истории.
 
         :param session: AsyncSession - сессия базы данных.
         :param tg_id: int - идентификатор пользователя.
-        :param model: Base - модель, для которой выполняется запрос.
-        :param limit: int - максимальное количество записей для выборки.
-        :param offset: int - смещение для выборки.
-        :return: список последних записей.
+        :param category_id: int - идентификатор статьи расходов.
+        :param limit: int - максимальное количество записей на странице.
+        :param before: tuple[datetime, int] - ключ записи, более старые чем
+        которая нужно выбрать.
+        :param after: tuple[datetime, int] - ключ записи, более новые чем которая
+        нужно выбрать.
+        :return: список записей (id, updated_at, summ) от новых к старым.
         """
         cls.log.info(
-            f"Метод get_last_hundred_records. "
-            f"Получение последних {limit} записей для tg_id={tg_id}."
+            f"Метод get_records_page. Получение {limit} записей для {tg_id=}, "
+            f"{category_id=}, {before=}, {after=}."
         )
-        stmt = (
-            select(model)
-            .options(selectinload(model.user))
-            .order_by(desc(model.updated_at))
-            .limit(limit)
-            .offset(offset)
-            .where(model.user_id == tg_id)
+        key = tuple_(Expense.updated_at, Expense.id)
+        stmt = select(Expense.id, Expense.updated_at, Expense.summ).where(
+            Expense.user_id == tg_id, Expense.category_id == category_id
         )
-        result = await session.execute(stmt)
-        return result.scalars().all()
+        if after is not None:
+            stmt = stmt.where(key > tuple_(*after)).order_by(
+                Expense.updated_at, Expense.id
+            )
+        else:
+            if before is not None:
+                stmt = stmt.where(key < tuple_(*before))
+            stmt = stmt.order_by(desc(Expense.updated_at), desc(Expense.id))
+        result = await session.execute(stmt.limit(limit))
+        records = result.all()
+        return records[::-1] if after is not None else records
 
     @classmethod
-    async def get_summ_from_article_by_user_and_start_period(
-        cls, session: AsyncSession, tg_id: int, model: Type[Base], start: datetime
-    ):
+    async def stream_user_expenses(
+        cls, session: AsyncSession, tg_id: int, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
         """
-        Получает сумму затрат для tg_id начиная с указанной даты.
+        Читает все траты пользователя частями через курсор на стороне сервера.
+
+        Запрос выполняется через session.stream, поэтому база отдает строки по
+        batch_size за раз, и в памяти находится только текущая часть.
 
         :param session: AsyncSession - сессия базы данных.
         :param tg_id: int - идентификатор пользователя.
-        :param model: Type[Base] - модель, для которой выполняется запрос.
-        :param start: datetime - дата начала периода.
-        :return: сумма затрат.
+        :param batch_size: int - количество строк в одной части.
+        :return: AsyncIterator - части строк (дата, статья, сумма) по возрастанию
+        даты.
         """
         cls.log.info(
-            f"Метод get_summ_from_article_by_user_and_start_period. "
-            f"Получение суммы затрат для tg_id={tg_id} начиная с {start}."
+            f"Метод stream_user_expenses. Чтение всех трат для {tg_id=} "
+            f"частями по {batch_size}."
         )
-        stmt = select(func.sum(model.summ)).where(
-            and_(model.user_id == tg_id, model.updated_at >= start)
+        stmt = (
+            select(Expense.updated_at, ExpenseCategory.name, Expense.summ)
+            .join(ExpenseCategory, ExpenseCategory.id == Expense.category_id)
+            .where(Expense.user_id == tg_id)
+            .order_by(Expense.updated_at, Expense.id)
+            .execution_options(yield_per=batch_size)
         )
-        result = await session.execute(stmt)
-        return result.scalar_one()
+        result = await session.stream(stmt)
+        try:
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await result.close()
 
     @classmethod
     async def get_aggregated_articles_by_start_end_period(
         cls,
         session: AsyncSession,
         tg_id: int,
-        models: list[Type[Base]],
         start: datetime,
         end: datetime,
         dates_str_without_timezone: str,
     ):
         """
-        Получает сумму затрат для tg_id за указанный период.
+        Получает сумму затрат по каждой статье для tg_id за указанный период.
 
         :param session: AsyncSession - сессия базы данных.
         :param tg_id: int - идентификатор пользователя.
-        :param models: list[Type[Base]] - список моделей для выборки.
         :param start: datetime - дата начала периода.
         :param end: datetime - дата окончания периода.
         :param dates_str_without_timezone: str - строка даты без часового пояса.
-        :return: агрегированные данные.
+        :return: агрегированные данные (период, сумма, статья).
         """
         cls.log.info(
             f"Метод get_aggregated_articles_by_start_end_period. "
             f"Получение суммы затрат для {tg_id=}"
             f" за период {start} - {end} ."
         )
-        queries = []
-
-        for model in models:
-            stmt = select(
+        summs = (
+            select(Expense.category_id, func.sum(Expense.summ).label("summ"))
+            .where(cls._user_period_clause(tg_id=tg_id, start=start, end=end))
+            .group_by(Expense.category_id)
+            .subquery()
+        )
+        stmt = (
+            select(
                 literal(dates_str_without_timezone),
-                func.sum(model.summ),
-                literal(model.__tablename__),
-            ).where(and_(model.user_id == tg_id, model.updated_at.between(start, end)))
-            queries.append(stmt)
-        combined_query = union(*queries)
-        result = await session.execute(combined_query)
+                func.coalesce(summs.c.summ, 0),
+                ExpenseCategory.name,
+            )
+            .select_from(ExpenseCategory)
+            .outerjoin(summs, summs.c.category_id == ExpenseCategory.id)
+        )
+        result = await session.execute(stmt)
         return result.fetchall()
 
     @classmethod
@@ -145,75 +207,104 @@ class ExpenseArticleRepository(BaseRepository):
         cls,
         session: AsyncSession,
         tg_id: int,
-        models: list[Type[Base]],
         start: datetime,
         end: datetime,
     ):
         """
-        Получает сумму затрат для tg_id за указанный период, сгруппированную по месяцам.
+        Получает затраты для tg_id за указанный период с меткой месяца.
 
         :param session: AsyncSession - сессия базы данных.
         :param tg_id: int - идентификатор пользователя.
-        :param models: list[Type[Base]] - список моделей для выборки.
         :param start: datetime - дата начала периода.
         :param end: datetime - дата окончания периода.
-        :return: агрегированные данные по месяцам.
+        :return: суммы по месяцам и статьям (месяц, сумма, статья).
         """
         cls.log.info(
             f"Метод get_aggregated_articles_by_start_end_period_by_months. "
             f"Получение суммы затрат для tg_id={tg_id} за период {start}-{end}."
         )
-
-        queries = []
-        for model in models:
-            stmt = select(
-                func.to_char(model.updated_at, "YYYY-MM"),
-                model.summ,
-                literal(model.__tablename__),
-            ).where(and_(model.user_id == tg_id, model.updated_at.between(start, end)))
-            queries.append(stmt)
-        combined_query = union(*queries)
-        result = await session.execute(combined_query)
-        return result.fetchall()
+        return await cls._get_articles_by_period_format(
+            session=session, tg_id=tg_id, start=start, end=end, period_format="YYYY-MM"
+        )
 
     @classmethod
     async def get_aggregated_articles_by_start_end_period_by_years(
         cls,
         session: AsyncSession,
         tg_id: int,
-        models: list[Type[Base]],
         start: datetime,
         end: datetime,
     ):
         """
-        Получает сумму затрат для tg_id за указанный период, сгруппированную по годам.
+        Получает затраты для tg_id за указанный период с меткой года.
 
         :param session: AsyncSession - сессия базы данных.
         :param tg_id: int - идентификатор пользователя.
-        :param models: list[Type[Base]] - список моделей для выборки.
         :param start: datetime - дата начала периода.
         :param end: datetime - дата окончания периода.
-        :return: агрегированные данные по годам.
+        :return: суммы по годам и статьям (год, сумма, статья).
         """
         cls.log.info(
             f"Метод get_aggregated_articles_by_start_end_period_by_years. "
             f"Получение суммы затрат для {tg_id=} за период {start} - {end}."
         )
-        queries = []
-
-        for model in models:
-            stmt = select(
-                func.to_char(model.updated_at, "YYYY"),
-                model.summ,
-                literal(model.__tablename__),
-            ).where(and_(model.user_id == tg_id, model.updated_at.between(start, end)))
+        return await cls._get_articles_by_period_format(
+            session=session, tg_id=tg_id, start=start, end=end, period_format="YYYY"
+        )
 
-            queries.append(stmt)
+    @classmethod
+    async def _get_articles_by_period_format(
+        cls,
+        session: AsyncSession,
+        tg_id: int,
+        start: datetime,
+        end: datetime,
+        period_format: str,
+    ):
+        """
+        Получает суммы затрат за период, сгруппированные в базе по метке периода
+        в формате to_char и статье расходов.
 
-        combined_query = union(*queries)
-        result = await session.execute(combined_query)
+        :param session: AsyncSession - сессия базы данных.
+        :param tg_id: int - идентификатор пользователя.
+        :param start: datetime - дата начала периода.
+        :param end: datetime - дата окончания периода.
+        :param period_format: str - формат метки периода (YYYY, YYYY-MM).
+        :return: список строк (период, сумма, статья).
+        """
+        period = func.to_char(Expense.updated_at, period_format).label("period")
+        summs = (
+            select(
+                period,
+                Expense.category_id,
+                func.sum(Expense.summ).label("summ"),
+            )
+            .where(cls._user_period_clause(tg_id=tg_id, start=start, end=end))
+            .group_by(period, Expense.category_id)
+            .subquery()
+        )
+        stmt = (
+            select(summs.c.period, summs.c.summ, ExpenseCategory.name)
+            .join(ExpenseCategory, ExpenseCategory.id == summs.c.category_id)
+            .order_by(summs.c.period, ExpenseCategory.id)
+        )
+        result = await session.execute(stmt)
         return result.fetchall()
 
+    @staticmethod
+    def _user_period_clause(tg_id: int, start: datetime, end: datetime):
+        """
+        Условие выборки трат пользователя за период.
+
+        Условие по updated_at позволяет планировщику отсечь лишние секции таблицы.
+
+        :param tg_id: int - идентификатор пользователя.
+        :param start: datetime - дата начала периода.
+        :param end: datetime - дата окончания периода.
+        :return: условие для where.
+        """
+        return and_(Expense.user_id == tg_id, Expense.updated_at.between(start, end))
+
     @classmethod
     async def update(cls, session: AsyncSession, item: Base):
         """
@@ -225,9 +316,31 @@ class ExpenseArticleRepository(BaseRepository):
         """
         cls.log.info(f"Метод update. Обновление элемента в базе данных: {item}.")
         merged_item = await session.merge(item)
-        await session.commit()
+        await session.flush()
         return merged_item
 
+    @classmethod
+    async def delete_by_key(
+        cls, session: AsyncSession, tg_id: int, expense_id: int, updated_at: datetime
+    ) -> bool:
+        """
+        Удаляет трату пользователя по первичному ключу без загрузки объекта.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param tg_id: int - идентификатор пользователя.
+        :param expense_id: int - идентификатор траты.
+        :param updated_at: datetime - дата траты, часть первичного ключа.
+        :return: bool - True, если трата удалена.
+        """
+        cls.log.info(f"Метод delete_by_key. Удаление траты {expense_id=} {tg_id=}.")
+        stmt = delete(Expense).where(
+            Expense.id == expense_id,
+            Expense.updated_at == updated_at,
+            Expense.user_id == tg_id,
+        )
+        result = await session.execute(stmt)
+        return bool(result.rowcount)
+
     @classmethod
     async def delete(cls, session: AsyncSession, item: Base):
         """
@@ -239,5 +352,5 @@ class ExpenseArticleRepository(BaseRepository):
         """
         cls.log.info(f"Метод delete. Удаление элемента: {item}.")
         await session.delete(item)
-        await session.commit()
+        await session.flush()
         return item
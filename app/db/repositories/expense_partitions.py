@@ -0,0 +1,157 @@
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import logged
+
+__all__ = ["ExpensePartitionRepository"]
+
+
+@logged()
+class ExpensePartitionRepository:
+    """
+    Обслуживание месячных секций таблицы expenses.
+
+    Секция на месяц называется expenses_yГГГГmММ, траты вне созданных секций
+    попадают в expenses_default. Пока в DEFAULT есть траты за месяц, секцию на
+    этот месяц нельзя создать обычным CREATE TABLE ... PARTITION OF, поэтому
+    такие траты сначала переносятся в новую таблицу, и только затем она
+    подключается к expenses.
+    """
+
+    _table = "expenses"
+    _default = "expenses_default"
+    _columns = "id, user_id, category_id, summ, updated_at"
+
+    @staticmethod
+    def next_month(month: date) -> date:
+        """
+        Возвращает первое число следующего месяца.
+
+        :param month: date - первое число месяца.
+        :return: date - первое число следующего месяца.
+        """
+        return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+    @classmethod
+    def partition_name(cls, month: date) -> str:
+        """
+        Возвращает имя секции на месяц.
+
+        :param month: date - первое число месяца.
+        :return: str - имя секции.
+        """
+        return f"{cls._table}_y{month.year}m{month.month:02}"
+
+    @classmethod
+    async def lock(cls, session: AsyncSession) -> None:
+        """
+        Берет транзакционную advisory-блокировку обслуживания секций, чтобы
+        несколько процессов бота не создавали одну и ту же секцию одновременно.
+
+        :param session: AsyncSession - сессия базы данных.
+        :return: None
+        """
+        await session.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"{cls._table}_partitions"},
+        )
+
+    @classmethod
+    async def exists(cls, session: AsyncSession, month: date) -> bool:
+        """
+        Проверяет, что секция на месяц уже создана.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param month: date - первое число месяца.
+        :return: bool - True, если секция есть.
+        """
+        result = await session.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"),
+            {"name": cls.partition_name(month=month)},
+        )
+        return result.scalar()
+
+    @classmethod
+    async def create(cls, session: AsyncSession, month: date) -> int:
+        """
+        Создает секцию на месяц, перенося в нее траты этого месяца из DEFAULT.
+
+        Триггер monthly_totals срабатывает на удаление трат из DEFAULT, но не на
+        вставку в еще не подключенную таблицу, поэтому после подключения секции
+        итоги по перенесенным тратам восстанавливаются.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param month: date - первое число месяца.
+        :return: int - количество перенесенных из DEFAULT трат.
+        """
+        name = cls.partition_name(month=month)
+        bounds = {"start": month, "end": cls.next_month(month=month)}
+        values = f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+        in_month = "updated_at >= :start AND updated_at < :end"
+
+        # Блокировка не дает добавить траты за этот месяц в DEFAULT, пока они
+        # переносятся в новую секцию.
+        await session.execute(
+            text(f"LOCK TABLE {cls._default} IN SHARE ROW EXCLUSIVE MODE")
+        )
+        result = await session.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {cls._default} WHERE {in_month})"),
+            bounds,
+        )
+        if not result.scalar():
+            cls.log.info(f"Метод create. Создание секции {name}.")
+            await session.execute(
+                text(f"CREATE TABLE {name} PARTITION OF {cls._table} {values}")
+            )
+            return 0
+
+        cls.log.warning(
+            f"Метод create. В {cls._default} есть траты за {month:%m.%Y}, "
+            f"они переносятся в новую секцию {name}."
+        )
+        await session.execute(
+            text(f"CREATE TABLE {name} (LIKE {cls._table} INCLUDING DEFAULTS)")
+        )
+        result = await session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {cls._default} WHERE {in_month} "
+                f"RETURNING {cls._columns}) "
+                f"INSERT INTO {name} ({cls._columns}) "
+                f"SELECT {cls._columns} FROM moved"
+            ),
+            bounds,
+        )
+        moved = result.rowcount
+        await session.execute(
+            text(f"ALTER TABLE {cls._table} ATTACH PARTITION {name} {values}")
+        )
+        await session.execute(
+            text(
+                f"SELECT count(*) FROM (SELECT monthly_totals_apply("
+                f"user_id, category_id, updated_at, summ, 1) FROM {name}) AS applied"
+            )
+        )
+        cls.log.info(f"Метод create. Секция {name} создана, перенесено {moved} трат.")
+        return moved
+
+    @classmethod
+    async def ensure(cls, session: AsyncSession, start: date, months: int) -> list[str]:
+        """
+        Создает недостающие секции на months месяцев, начиная с месяца start.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param start: date - любая дата первого месяца.
+        :param months: int - количество месяцев.
+        :return: list[str] - имена созданных секций.
+        """
+        await cls.lock(session=session)
+        created = []
+        month = start.replace(day=1)
+        for _ in range(months):
+            if not await cls.exists(session=session, month=month):
+                await cls.create(session=session, month=month)
+                created.append(cls.partition_name(month=month))
+            month = cls.next_month(month=month)
+        return created
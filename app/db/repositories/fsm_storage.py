@@ -0,0 +1,128 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import logged
+from app.db import Base, FSMRecord
+from app.db.repositories.base import BaseRepository
+
+
+@logged()
+class FSMRepository(BaseRepository):
+    @classmethod
+    async def create(cls, session: AsyncSession, item: Base):
+        """
+        Добавляет новую запись состояния в базу данных.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param item: Base - запись для добавления.
+        :return: добавленная запись.
+        """
+        cls.log.info(f"Метод create. Добавление записи состояния: {item}.")
+        session.add(item)
+        await session.commit()
+        return item
+
+    @classmethod
+    async def read(cls, session: AsyncSession, key: str, now: datetime):
+        """
+        Читает неустаревшую запись состояния по ключу.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param key: str - ключ записи.
+        :param now: datetime - текущий момент (UTC) для проверки срока хранения.
+        :return: запись состояния или None.
+        """
+        cls.log.debug(f"Метод read. Чтение записи состояния {key=}.")
+        stmt = select(FSMRecord).where(
+            FSMRecord.key == key,
+            or_(FSMRecord.expires_at.is_(None), FSMRecord.expires_at > now),
+        )
+        result = await session.execute(stmt)
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def notify(cls, session: AsyncSession, channel: str, payload: str):
+        """
+        Отправляет уведомление об изменении записей другим процессам.
+
+        Уведомление доставляется слушателям канала только после фиксации
+        транзакции, в которой оно отправлено.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param channel: str - канал уведомлений.
+        :param payload: str - текст уведомления.
+        :return: None
+        """
+        await session.execute(select(func.pg_notify(channel, payload)))
+
+    @classmethod
+    async def upsert(cls, session: AsyncSession, records: list[dict]):
+        """
+        Вставляет или обновляет записи состояний одним запросом.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param records: list[dict] - записи со значениями key, state, data,
+        expires_at.
+        :return: None
+        """
+        cls.log.debug(f"Метод upsert. Сохранение {len(records)} записей состояний.")
+        stmt = insert(FSMRecord).values(records)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FSMRecord.key],
+            set_={
+                "state": stmt.excluded.state,
+                "data": stmt.excluded.data,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        await session.execute(stmt)
+        await session.commit()
+
+    @classmethod
+    async def update(cls, session: AsyncSession, item: Base):
+        """
+        Обновляет запись состояния в базе данных.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param item: Base - запись для обновления.
+        :return: обновленная запись.
+        """
+        cls.log.info(f"Метод update. Обновление записи состояния: {item}.")
+        merged_item = await session.merge(item)
+        await session.commit()
+        return merged_item
+
+    @classmethod
+    async def delete(cls, session: AsyncSession, keys: list[str]):
+        """
+        Удаляет записи состояний по ключам.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param keys: list[str] - ключи записей.
+        :return: None
+        """
+        cls.log.debug(f"Метод delete. Удаление {len(keys)} записей состояний.")
+        await session.execute(delete(FSMRecord).where(FSMRecord.key.in_(keys)))
+        await session.commit()
+
+    @classmethod
+    async def delete_expired(cls, session: AsyncSession, now: datetime):
+        """
+        Удаляет устаревшие записи состояний.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param now: datetime - текущий момент (UTC).
+        :return: int - количество удаленных записей.
+        """
+        result = await session.execute(
+            delete(FSMRecord).where(FSMRecord.expires_at <= now)
+        )
+        await session.commit()
+        cls.log.debug(
+            f"Метод delete_expired. Удалено устаревших записей: {result.rowcount}."
+        )
+        return result.rowcount
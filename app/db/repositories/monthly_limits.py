@@ -1,8 +1,11 @@
+from decimal import Decimal
+
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app import logged
-from app.db import Base
+from app.db import Base, MonthlyLimits
 from app.db.repositories.base import BaseRepository
 
 
@@ -19,7 +22,7 @@ class LimitsRepository(BaseRepository):
         """
         cls.log.info(f"Метод create. Добавление нового элемента: {item}.")
         session.add(item)
-        await session.commit()
+        await session.flush()
         return item
 
     @classmethod
@@ -48,9 +51,36 @@ class LimitsRepository(BaseRepository):
         """
         cls.log.info(f"Метод update. Обновление элемента: {item}.")
         merged_item = await session.merge(item)
-        await session.commit()
+        await session.flush()
         return merged_item
 
+    @classmethod
+    async def update_limit(
+        cls, session: AsyncSession, tg_id: int, article: str, amount: Decimal
+    ) -> MonthlyLimits | None:
+        """
+        Обновляет лимит одной статьи одним запросом UPDATE ... RETURNING.
+
+        :param session: AsyncSession - сессия для взаимодействия с базой данных.
+        :param tg_id: int - идентификатор пользователя в Telegram.
+        :param article: str - название столбца статьи расходов.
+        :param amount: Decimal - новое значение лимита.
+        :return: обновленная запись лимитов или None, если записи нет.
+        """
+        cls.log.info(
+            f"Метод update_limit. Обновление лимита {article} для {tg_id=}: {amount}."
+        )
+        stmt = (
+            update(MonthlyLimits)
+            .where(MonthlyLimits.user_id == tg_id)
+            .values({getattr(MonthlyLimits, article): amount})
+            .returning(MonthlyLimits)
+        )
+        result = await session.execute(stmt)
+        record = result.scalars().one_or_none()
+        await session.flush()
+        return record
+
     @classmethod
     async def delete(cls, session: AsyncSession, item: Base):
         """
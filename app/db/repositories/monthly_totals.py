@@ -0,0 +1,237 @@
+from datetime import date
+
+from sqlalchemy import and_, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import logged
+from app.db import Base, ExpenseCategory, MonthlyTotal
+from app.db.repositories.base import BaseRepository
+
+
+@logged()
+class MonthlyTotalsRepository(BaseRepository):
+    """
+    Репозиторий месячных итогов трат.
+
+    Итоги ведут триггеры базы данных, поэтому репозиторий только читает их.
+    Все периоды задаются первыми числами месяцев по местному времени пользователя,
+    границы включаются в выборку.
+    """
+
+    @classmethod
+    async def create(cls, session: AsyncSession, item: Base):
+        """
+        Добавляет новый элемент в базу данных (не поддерживается, итоги ведут
+        триггеры).
+
+        :param session: AsyncSession - сессия базы данных.
+        :param item: Base - элемент для добавления.
+        :return: None.
+        """
+        cls.log.info(f"Метод create. Добавление элемента: {item}.")
+        pass
+
+    @classmethod
+    async def read(cls, session: AsyncSession, tg_id: int, model: Base):
+        """
+        Читает все месячные итоги пользователя.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param tg_id: int - идентификатор пользователя в Telegram.
+        :param model: Base - модель итогов.
+        :return: список итогов пользователя.
+        """
+        cls.log.info(f"Метод read. Чтение итогов для {tg_id=} из модели: {model}.")
+        stmt = select(model).where(model.user_id == tg_id)
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+    @classmethod
+    async def get_month_summs(cls, session: AsyncSession, tg_id: int, month: date):
+        """
+        Получает суммы затрат по всем статьям для tg_id за месяц.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param tg_id: int - идентификатор пользователя.
+        :param month: date - первое число месяца.
+        :return: словарь сумм по статьям (None для статей без трат).
+        """
+        cls.log.info(
+            f"Метод get_month_summs. "
+            f"Получение сумм затрат для {tg_id=} за месяц {month}."
+        )
+        stmt = (
+            select(ExpenseCategory.name, MonthlyTotal.total)
+            .select_from(ExpenseCategory)
+            .outerjoin(
+                MonthlyTotal,
+                and_(
+                    MonthlyTotal.category_id == ExpenseCategory.id,
+                    MonthlyTotal.user_id == tg_id,
+                    MonthlyTotal.month == month,
+                ),
+            )
+        )
+        result = await session.execute(stmt)
+        return {article: summ for article, summ in result.all()}
+
+    @classmethod
+    async def get_aggregated_totals_by_start_end_months(
+        cls,
+        session: AsyncSession,
+        tg_id: int,
+        start: date,
+        end: date,
+        dates_str_without_timezone: str,
+    ):
+        """
+        Получает сумму затрат по каждой статье для tg_id за диапазон месяцев.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param tg_id: int - идентификатор пользователя.
+        :param start: date - первый месяц периода.
+        :param end: date - последний месяц периода.
+        :param dates_str_without_timezone: str - строка даты без часового пояса.
+        :return: агрегированные данные (период, сумма, статья).
+        """
+        cls.log.info(
+            f"Метод get_aggregated_totals_by_start_end_months. "
+            f"Получение суммы затрат для {tg_id=} за месяцы {start} - {end}."
+        )
+        summs = (
+            select(MonthlyTotal.category_id, func.sum(MonthlyTotal.total).label("summ"))
+            .where(cls._user_months_clause(tg_id=tg_id, start=start, end=end))
+            .group_by(MonthlyTotal.category_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                literal(dates_str_without_timezone),
+                func.coalesce(summs.c.summ, 0),
+                ExpenseCategory.name,
+            )
+            .select_from(ExpenseCategory)
+            .outerjoin(summs, summs.c.category_id == ExpenseCategory.id)
+        )
+        result = await session.execute(stmt)
+        return result.fetchall()
+
+    @classmethod
+    async def get_aggregated_totals_by_months(
+        cls, session: AsyncSession, tg_id: int, start: date, end: date
+    ):
+        """
+        Получает суммы затрат для tg_id за диапазон месяцев с меткой месяца.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param tg_id: int - идентификатор пользователя.
+        :param start: date - первый месяц периода.
+        :param end: date - последний месяц периода.
+        :return: суммы по месяцам и статьям (месяц, сумма, статья).
+        """
+        cls.log.info(
+            f"Метод get_aggregated_totals_by_months. "
+            f"Получение суммы затрат для {tg_id=} за месяцы {start} - {end}."
+        )
+        return await cls._get_totals_by_period_format(
+            session=session, tg_id=tg_id, start=start, end=end, period_format="YYYY-MM"
+        )
+
+    @classmethod
+    async def get_aggregated_totals_by_years(
+        cls, session: AsyncSession, tg_id: int, start: date, end: date
+    ):
+        """
+        Получает суммы затрат для tg_id за диапазон месяцев с меткой года.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param tg_id: int - идентификатор пользователя.
+        :param start: date - первый месяц периода.
+        :param end: date - последний месяц периода.
+        :return: суммы по годам и статьям (год, сумма, статья).
+        """
+        cls.log.info(
+            f"Метод get_aggregated_totals_by_years. "
+            f"Получение суммы затрат для {tg_id=} за месяцы {start} - {end}."
+        )
+        return await cls._get_totals_by_period_format(
+            session=session, tg_id=tg_id, start=start, end=end, period_format="YYYY"
+        )
+
+    @classmethod
+    async def _get_totals_by_period_format(
+        cls,
+        session: AsyncSession,
+        tg_id: int,
+        start: date,
+        end: date,
+        period_format: str,
+    ):
+        """
+        Получает суммы затрат, сгруппированные по метке периода в формате to_char
+        и статье расходов.
+
+        :param session: AsyncSession - сессия базы данных.
+        :param tg_id: int - идентификатор пользователя.
+        :param start: date - первый месяц периода.
+        :param end: date - последний месяц периода.
+        :param period_format: str - формат метки периода (YYYY, YYYY-MM).
+        :return: список строк (период, сумма, статья).
+        """
+        period = func.to_char(MonthlyTotal.month, period_format).label("period")
+        summs = (
+            select(
+                period,
+                MonthlyTotal.category_id,
+                func.sum(MonthlyTotal.total).label("summ"),
+            )
+            .where(cls._user_months_clause(tg_id=tg_id, start=start, end=end))
+            .group_by(period, MonthlyTotal.category_id)
+            .subquery()
+        )
+        stmt = (
+            select(summs.c.period, summs.c.summ, ExpenseCategory.name)
+            .join(ExpenseCategory, ExpenseCategory.id == summs.c.category_id)
+            .order_by(summs.c.period, ExpenseCategory.id)
+        )
+        result = await session.execute(stmt)
+        return result.fetchall()
+
+    @staticmethod
+    def _user_months_clause(tg_id: int, start: date, end: date):
+        """
+        Условие выборки итогов пользователя за диапазон месяцев.
+
+        :param tg_id: int - идентификатор пользователя.
+        :param start: date - первый месяц периода.
+        :param end: date - последний месяц периода.
+        :return: условие для where.
+        """
+        return and_(
+            MonthlyTotal.user_id == tg_id, MonthlyTotal.month.between(start, end)
+        )
+
+    @classmethod
+    async def update(cls, session: AsyncSession, item: Base):
+        """
+        Обновляет элемент в базе данных (не поддерживается, итоги ведут триггеры).
+
+        :param session: AsyncSession - сессия базы данных.
+        :param item: Base - элемент для обновления.
+        :return: None.
+        """
+        cls.log.info(f"Метод update. Обновление элемента: {item}.")
+        pass
+
+    @classmethod
+    async def delete(cls, session: AsyncSession, item: Base):
+        """
+        Удаляет элемент из базы данных (не поддерживается, итоги ведут триггеры).
+
+        :param session: AsyncSession - сессия базы данных.
+        :param item: Base - элемент для удаления.
+        :return: None.
+        """
+        cls.log.info(f"Метод delete. Удаление элемента: {item}.")
+        pass
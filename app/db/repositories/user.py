@@ -25,7 +25,7 @@ class UserRepository(BaseRepository):
             f"Метод create. Добавление нового пользователя с tg_id={item.tg_id}."
         )
         session.add(item)
-        await session.commit()
+        await session.flush()
         cls.log.info(
             f"Метод create. Пользователь с tg_id={item.tg_id} успешно добавлен."
         )
@@ -93,7 +93,7 @@ class UserRepository(BaseRepository):
         """
         cls.log.info(f"Метод update. Обновление пользователя с tg_id={item.tg_id}.")
         merged_item = await session.merge(item)
-        await session.commit()
+        await session.flush()
         cls.log.info(
             f"Метод update. Пользователь с tg_id={item.tg_id} успешно обновлен."
         )
@@ -110,6 +110,6 @@ class UserRepository(BaseRepository):
         """
         cls.log.info(f"Метод delete. Удаление пользователя с tg_id={item.tg_id}.")
         await session.delete(item)
-        await session.commit()
+        await session.flush()
         cls.log.info(f"Метод delete. Пользователь с tg_id={item.tg_id} успешно удален.")
         return item.tg_id
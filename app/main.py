@@ -1,10 +1,13 @@
 import asyncio
 
-from api.bot import create_bot
+from aiogram import Bot, Dispatcher
+from aiohttp import web
+from api.bot import create_bot, create_storage, create_webhook_app
 from api.middleware.middlewares import (DeletePreviousMSGMiddleware,
                                         StorageMiddleware)
 from api.routers.commands_router import commands_router
 from api.routers.delete_router import delete_router
+from api.routers.import_router import import_router
 from api.routers.insert_router import insert_router
 from api.routers.limits_router import limits_router
 from api.routers.register_router import register_router
@@ -17,6 +20,7 @@ routers_list = [
     statistic_router,
     insert_router,
     delete_router,
+    import_router,
     limits_router,
     register_router,
 ]
@@ -31,10 +35,51 @@ async def start_bot(token: str):
     :param token: str - токен для подключения бота.
     :return: запускает процесс polling для бота.
     """
+    storage = create_storage(
+        storage_type=settings.FSM_STORAGE,
+        ttl=settings.FSM_TTL,
+        flush_interval=settings.FSM_FLUSH_INTERVAL,
+        cache_size=settings.FSM_CACHE_SIZE,
+    )
     bot, dp = await create_bot(
-        token=token, routers=routers_list, middlewares=middlewares, texts=texts
+        token=token,
+        routers=routers_list,
+        middlewares=middlewares,
+        texts=texts,
+        storage=storage,
+    )
+    if settings.BOT_MODE == "webhook":
+        await start_webhook(bot=bot, dp=dp)
+    else:
+        await bot.delete_webhook()
+        await dp.start_polling(bot)
+
+
+async def start_webhook(bot: Bot, dp: Dispatcher):
+    """
+    Запускает сервер aiohttp, принимающий обновления через вебхук.
+
+    :param bot: Bot - объект бота.
+    :param dp: Dispatcher - объект диспетчера.
+    :return: работает до остановки процесса.
+    """
+    secret = settings.WEBHOOK_SECRET
+    app = create_webhook_app(
+        bot=bot,
+        dp=dp,
+        path=settings.WEBHOOK_PATH,
+        max_concurrency=settings.WEBHOOK_MAX_CONCURRENCY,
+        secret_token=secret.get_secret_value() if secret else None,
+        base_url=settings.WEBHOOK_BASE_URL,
     )
-    await dp.start_polling(bot)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+    await site.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
 
 
 async def create_app():
@@ -1,3 +1,4 @@
+from app.utils.cache import TTLCache
 from app.utils.logger import logged
 
-__all__ = ["logged"]
+__all__ = ["logged", "TTLCache"]
@@ -0,0 +1,115 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+__all__ = ["TTLCache"]
+
+
+class TTLCache:
+    """
+    Ограниченный по размеру кэш в памяти процесса с вытеснением давно не
+    использованных записей (LRU) и сроком жизни записей (TTL).
+
+    Кэш не потокобезопасен и рассчитан на использование из одного event loop.
+
+    :param maxsize: int - максимальное количество записей, а если задан sizeof -
+    максимальный суммарный вес записей.
+    :param ttl: float - срок жизни записи в секундах, 0 - без ограничения.
+    :param sizeof: Callable - функция, возвращающая вес значения (например, размер
+    в байтах). По умолчанию вес каждой записи равен 1.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float = 0, sizeof: Callable[[Any], int] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.currsize = 0
+        self._data: OrderedDict[Hashable, tuple[float | None, Any, int]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Возвращает значение по ключу и учитывает попадание или промах.
+
+        :param key: Hashable - ключ.
+        :param default: Any - значение, если ключа нет или запись устарела.
+        :return: значение из кэша или default.
+        """
+        item = self._data.get(key)
+        if item is not None:
+            deadline, value, _ = item
+            if deadline is None or deadline > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.invalidate(key)
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Сохраняет значение по ключу, вытесняя самые старые записи при переполнении.
+        Значение тяжелее maxsize не сохраняется.
+
+        :param key: Hashable - ключ.
+        :param value: Any - значение.
+        :return: None
+        """
+        weight = self.sizeof(value) if self.sizeof else 1
+        self.invalidate(key)
+        if weight > self.maxsize:
+            return
+        deadline = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (deadline, value, weight)
+        self.currsize += weight
+        while self.currsize > self.maxsize:
+            _, (_, _, evicted_weight) = self._data.popitem(last=False)
+            self.currsize -= evicted_weight
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Удаляет запись по ключу, если она есть.
+
+        :param key: Hashable - ключ.
+        :return: None
+        """
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.currsize -= item[2]
+
+    def clear(self) -> None:
+        """
+        Очищает кэш и счетчики.
+
+        :return: None
+        """
+        self._data.clear()
+        self.currsize = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику использования кэша.
+
+        :return: dict - попадания, промахи, доля попаданий, вытеснения, текущее
+        количество записей и их суммарный вес.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "currsize": self.currsize,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
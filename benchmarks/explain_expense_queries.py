@@ -0,0 +1,227 @@
+"""
+EXPLAIN ANALYZE запросов ExpenseArticleRepository без индекса и с индексом.
+
+Скрипт наполняет базу синтетическими пользователями и тратами, удаляет индекс
+ix_expenses_user_id_updated_at, снимает планы всех запросов репозитория, создает
+индекс заново и снимает планы еще раз. Планы записываются в explain_before.txt и
+explain_after.txt в каталоге --output.
+
+ВАЖНО: скрипт пишет данные в базу из .env, запускать только на тестовой базе.
+
+Запуск из корня проекта:
+    PYTHONPATH=. python benchmarks/explain_expense_queries.py --users 200 --rows 500
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import EXPENSE_CATEGORIES, EXPENSE_CATEGORY_IDS, Expense
+from app.db.connector import PostgresConnector
+from app.db.repositories.expense_articles import ExpenseArticleRepository
+
+INDEX_NAME = "ix_expenses_user_id_updated_at"
+
+
+class ExplainSession:
+    """
+    Обертка над AsyncSession, которая перед каждым запросом снимает его план.
+
+    :param session: AsyncSession - сессия, в которой выполняются запросы.
+    :param plans: list[str] - список, в который складываются планы.
+    """
+
+    def __init__(self, session: AsyncSession, plans: list[str]):
+        self.session = session
+        self.plans = plans
+
+    async def execute(self, stmt):
+        """
+        Выполняет EXPLAIN ANALYZE для запроса, затем сам запрос.
+
+        :param stmt: запрос SQLAlchemy.
+        :return: результат исходного запроса.
+        """
+        sql = stmt.compile(
+            dialect=self.session.bind.dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = await self.session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))
+        self.plans.append("\n".join(row[0] for row in plan))
+        return await self.session.execute(stmt)
+
+
+async def seed(connector: PostgresConnector, users: int, rows: int):
+    """
+    Наполняет базу синтетическими данными и обновляет статистику таблиц.
+
+    :param connector: PostgresConnector - коннектор к базе данных.
+    :param users: int - количество пользователей.
+    :param rows: int - количество трат на пользователя в каждой статье.
+    :return: None
+    """
+    async with connector.engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO users (tg_id, name, timezone) "
+                "SELECT g, 'user_' || g, 3 FROM generate_series(1, :users) g "
+                "ON CONFLICT DO NOTHING"
+            ),
+            {"users": users},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO monthly_limits (user_id) "
+                "SELECT g FROM generate_series(1, :users) g ON CONFLICT DO NOTHING"
+            ),
+            {"users": users},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO expenses (user_id, category_id, summ, updated_at) "
+                "SELECT 1 + g % :users, 1 + g % :categories, "
+                "round((random() * 5000)::numeric, 2), "
+                "now() - random() * interval '730 days' "
+                "FROM generate_series(1, :total) g"
+            ),
+            {
+                "users": users,
+                "categories": len(EXPENSE_CATEGORIES),
+                "total": users * rows * len(EXPENSE_CATEGORIES),
+            },
+        )
+
+    await vacuum_analyze(connector=connector)
+
+
+async def vacuum_analyze(connector: PostgresConnector):
+    """
+    Обновляет карту видимости и статистику таблицы трат для index-only scan.
+
+    :param connector: PostgresConnector - коннектор к базе данных.
+    :return: None
+    """
+    async with connector.engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"VACUUM ANALYZE {Expense.__tablename__}"))
+
+
+async def set_index(connector: PostgresConnector, enabled: bool):
+    """
+    Создает или удаляет индекс трат по пользователю и дате.
+
+    :param connector: PostgresConnector - коннектор к базе данных.
+    :param enabled: bool - True, чтобы создать индекс, False - чтобы удалить.
+    :return: None
+    """
+    index = next(idx for idx in Expense.__table__.indexes if idx.name == INDEX_NAME)
+    async with connector.engine.begin() as conn:
+        if enabled:
+            await conn.run_sync(
+                lambda sync_conn: index.create(sync_conn, checkfirst=True)
+            )
+        else:
+            await conn.run_sync(
+                lambda sync_conn: index.drop(sync_conn, checkfirst=True)
+            )
+
+
+async def collect_plans(connector: PostgresConnector, tg_id: int) -> list[str]:
+    """
+    Выполняет все запросы репозитория трат и возвращает их планы.
+
+    :param connector: PostgresConnector - коннектор к базе данных.
+    :param tg_id: int - пользователь, для которого выполняются запросы.
+    :return: list[str] - планы запросов с заголовками.
+    """
+    repository = ExpenseArticleRepository
+    now = datetime.utcnow()
+    year_start = datetime(now.year - 1, 1, 1)
+    period = {"tg_id": tg_id, "start": year_start, "end": now}
+
+    calls = {
+        "get_last_hundred_records": lambda session: (
+            repository.get_last_hundred_records(
+                session=session,
+                tg_id=tg_id,
+                category_id=EXPENSE_CATEGORY_IDS["products"],
+            )
+        ),
+        "get_aggregated_articles_by_start_end_period": lambda session: (
+            repository.get_aggregated_articles_by_start_end_period(
+                session=session, dates_str_without_timezone="benchmark", **period
+            )
+        ),
+        "get_aggregated_articles_by_start_end_period_by_months": lambda session: (
+            repository.get_aggregated_articles_by_start_end_period_by_months(
+                session=session, **period
+            )
+        ),
+        "get_aggregated_articles_by_start_end_period_by_years": lambda session: (
+            repository.get_aggregated_articles_by_start_end_period_by_years(
+                session=session, **period
+            )
+        ),
+    }
+
+    report = []
+    async with connector.get_session() as session:
+        for name, call in calls.items():
+            plans = []
+            await call(ExplainSession(session=session, plans=plans))
+            report.append(f"===== {name} =====\n" + "\n\n".join(plans))
+    return report
+
+
+def write_report(report: list[str], output: str, label: str):
+    """
+    Записывает планы запросов в файл explain_<label>.txt.
+
+    :param report: list[str] - планы запросов.
+    :param output: str - каталог для результатов.
+    :param label: str - метка замера (before/after).
+    :return: None
+    """
+    os.makedirs(output, exist_ok=True)
+    file_path = os.path.join(output, f"explain_{label}.txt")
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("\n\n".join(report) + "\n")
+    print(f"Планы запросов ({label}) записаны в {file_path}")
+
+
+async def main(args: argparse.Namespace):
+    """
+    Наполняет базу, снимает планы без индексов и с индексами.
+
+    :param args: argparse.Namespace - параметры запуска.
+    :return: None
+    """
+    connector = PostgresConnector()
+    tg_id = max(1, args.users // 2)
+
+    if not args.skip_seed:
+        await seed(connector=connector, users=args.users, rows=args.rows)
+
+    await set_index(connector=connector, enabled=False)
+    before = await collect_plans(connector=connector, tg_id=tg_id)
+    write_report(report=before, output=args.output, label="before")
+
+    await set_index(connector=connector, enabled=True)
+    await vacuum_analyze(connector=connector)
+    after = await collect_plans(connector=connector, tg_id=tg_id)
+    write_report(report=after, output=args.output, label="after")
+
+    await connector.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--output", default="explain_results")
+    parser.add_argument("--skip-seed", action="store_true")
+    asyncio.run(main(parser.parse_args()))
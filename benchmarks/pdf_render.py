@@ -0,0 +1,115 @@
+"""
+Сравнение построения PDF: прежняя загрузка шрифта и стилей на каждый отчет и
+кэширование ресурсов reportlab в PDFBuilder.
+
+Скрипт готовит таблицы из синтетических трат и замеряет среднее время записи
+одного PDF обоими способами. База данных не нужна.
+
+Запуск из корня проекта:
+    PYTHONPATH=. python benchmarks/pdf_render.py --years 1 5 --reports 20
+"""
+
+import argparse
+import io
+import logging
+import os
+import time
+from decimal import Decimal
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+from reportlab.platypus.tables import TableStyle
+
+from app.api.servises.report_builders.pdf_builder import PDFBuilder
+from benchmarks.report_aggregation import CATEGORIES, make_expenses
+
+
+def legacy_write_data(data: dict, buffer: io.BytesIO) -> None:
+    """
+    Прежняя запись PDF: шрифт регистрируется заново, стили образца изменяются,
+    стиль таблицы создается для каждой таблицы.
+
+    :param data: dict - таблицы по периодам.
+    :param buffer: io.BytesIO - буфер для отчета.
+    :return: None
+    """
+    font_path = os.path.abspath(
+        os.path.join("app", "api", "static", "Roboto-Regular.ttf")
+    )
+    pdfmetrics.registerFont(TTFont("Roboto-Regular", font_path))
+    styles = getSampleStyleSheet()
+    styles["Heading1"].fontName = "Roboto-Regular"
+    styles["Normal"].fontName = "Roboto-Regular"
+
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    story = [Paragraph("ExpensesAccountingBot", styles["Heading1"]), Spacer(1, 20)]
+    for period, df in data.items():
+        story.append(Paragraph(f"{period}", styles["Heading1"]))
+        story.append(Spacer(1, 12))
+        table_data = [df.columns.to_list()] + df.values.tolist()
+        col_width = (doc.pagesize[0] - 80) / len(df.columns)
+        table = Table(
+            table_data,
+            colWidths=[col_width] * len(df.columns),
+            splitByRow=True,
+            spaceAfter=20,
+        )
+        table.setStyle(
+            TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.Color(0.87, 0.721, 0.529)),
+                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+                    ("FONTNAME", (0, 0), (-1, -1), "Roboto-Regular"),
+                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+                ]
+            )
+        )
+        story.append(table)
+        story.append(Spacer(1, 12))
+    doc.build(story)
+
+
+def measure(func, reports: int) -> float:
+    """
+    Возвращает среднее время построения одного отчета в миллисекундах.
+
+    :param func: функция, записывающая отчет в переданный буфер.
+    :param reports: int - количество отчетов.
+    :return: float - время в миллисекундах.
+    """
+    started = time.perf_counter()
+    for _ in range(reports):
+        func(io.BytesIO())
+    return (time.perf_counter() - started) / reports * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--reports", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.DEBUG)
+
+    limits = {category: Decimal(50000) for category in CATEGORIES}
+    print(
+        f"{'лет':>4} {'таблиц':>7} {'прежде, мс':>11} {'кэш, мс':>9} {'ускорение':>10}"
+    )
+    for years in args.years:
+        expenses = make_expenses(years=years, rows=args.rows)
+        builder = PDFBuilder(expenses=expenses, limits=limits, tg_id=0)
+        data = builder.prepare_tables()
+        legacy = measure(lambda buffer: legacy_write_data(data, buffer), args.reports)
+        cached = measure(lambda buffer: builder.write_data(data, buffer), args.reports)
+        print(
+            f"{years:>4} {len(data):>7} {legacy:>11.1f} {cached:>9.1f} "
+            f"{legacy / cached:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
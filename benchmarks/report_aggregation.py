@@ -0,0 +1,107 @@
+"""
+Сравнение подготовки таблиц отчета: старый цикл по периодам и одна группировка
+BaseBuilder.prepare_tables.
+
+Скрипт генерирует синтетические траты по месяцам за несколько лет и замеряет
+время подготовки таблиц обоими способами. База данных не нужна.
+
+Запуск из корня проекта:
+    PYTHONPATH=. python benchmarks/report_aggregation.py --years 1 5 10 --rows 300
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+
+import pandas as pd
+
+from app.api.servises.report_builders.base_builder import BaseBuilder
+
+CATEGORIES = [f"Статья {number}" for number in range(1, 13)]
+
+
+def legacy_prepare_tables(expenses: list[tuple], limits: dict) -> dict:
+    """
+    Прежняя подготовка таблиц: фильтрация всех трат и отдельный DataFrame
+    на каждый период.
+
+    :param expenses: list[tuple] - траты (период, сумма, статья).
+    :param limits: dict - лимиты по статьям.
+    :return: dict - таблицы по периодам.
+    """
+    periods = sorted(set([expense[0] for expense in expenses]))
+    tables_by_period = {}
+    for period in periods:
+        period_expenses = [expense for expense in expenses if expense[0] == period]
+        df = pd.DataFrame(period_expenses, columns=["period", "summ", "category"])
+        df = df.groupby("category", as_index=False).agg({"summ": "sum"})
+        df["limit"] = df["category"].map(limits)
+        df = df[["category", "summ", "limit"]]
+        df["percent"] = ((df["summ"] / df["limit"]) * 100).round(0).astype(int)
+        tables_by_period[period] = df
+    return tables_by_period
+
+
+def make_expenses(years: int, rows: int) -> list[tuple]:
+    """
+    Генерирует траты: rows записей на каждый месяц периода.
+
+    :param years: int - количество лет.
+    :param rows: int - количество трат в месяце.
+    :return: list[tuple] - траты (период, сумма, статья).
+    """
+    rng = random.Random(years)
+    return [
+        (
+            f"{2000 + year}-{month:02d}",
+            Decimal(rng.randint(100, 100000)) / 100,
+            rng.choice(CATEGORIES),
+        )
+        for year in range(years)
+        for month in range(1, 13)
+        for _ in range(rows)
+    ]
+
+
+def measure(func, repeat: int) -> float:
+    """
+    Возвращает лучшее время выполнения функции в миллисекундах.
+
+    :param func: функция без аргументов.
+    :param repeat: int - количество повторов.
+    :return: float - время в миллисекундах.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    limits = {category: Decimal(50000) for category in CATEGORIES}
+    print(
+        f"{'лет':>4} {'строк':>8} {'цикл, мс':>10} "
+        f"{'groupby, мс':>12} {'ускорение':>10}"
+    )
+    for years in args.years:
+        expenses = make_expenses(years=years, rows=args.rows)
+        builder = BaseBuilder(expenses=expenses, limits=limits, tg_id=0)
+        legacy = measure(lambda: legacy_prepare_tables(expenses, limits), args.repeat)
+        vectorized = measure(builder.prepare_tables, args.repeat)
+        print(
+            f"{years:>4} {len(expenses):>8} {legacy:>10.1f} {vectorized:>12.1f} "
+            f"{legacy / vectorized:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Время импорта main.py и потребление памяти процессом бота сразу после старта.
+
+Каждый замер выполняется в отдельном процессе интерпретатора. Режим lazy
+импортирует только main.py (как при запуске бота), режим eager дополнительно
+загружает все построители отчетов - так стартовал бот, пока построители
+импортировались вместе с пакетом app.api.servises. Скрипт выводит медианное время
+импорта, медианный пик RSS и тяжелые библиотеки, оказавшиеся в sys.modules.
+
+Нужны переменные окружения из .env (как для запуска бота), подключение к базе
+не выполняется.
+
+Запуск из корня проекта:
+    PYTHONPATH=. python benchmarks/startup_footprint.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["pandas", "numpy", "reportlab", "openpyxl", "lxml"]
+
+BUILDER_MODULES = [
+    "app.api.servises.report_builders.base_builder",
+    "app.api.servises.report_builders.pdf_builder",
+    "app.api.servises.report_builders.xlsx_builder",
+    "app.api.servises.report_builders.xml_builder",
+]
+
+PROBE = """
+import importlib, json, resource, sys, time
+started = time.perf_counter()
+import main
+for module in {builders}:
+    importlib.import_module(module)
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [name for name in {heavy} if name in sys.modules],
+}}))
+"""
+
+
+def run_probe(root: str, eager: bool) -> dict:
+    """
+    Запускает замер в новом процессе.
+
+    :param root: str - корень проекта.
+    :param eager: bool - загружать ли построители отчетов сразу.
+    :return: dict - время импорта, пик RSS и загруженные тяжелые библиотеки.
+    """
+    code = PROBE.format(builders=BUILDER_MODULES if eager else [], heavy=HEAVY_MODULES)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([root, os.path.join(root, "app")])
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    print(f"{'режим':<6} {'импорт, с':>10} {'RSS, МБ':>9}  библиотеки")
+    for mode in ("lazy", "eager"):
+        probes = [run_probe(root=root, eager=mode == "eager") for _ in range(args.runs)]
+        seconds = statistics.median(probe["seconds"] for probe in probes)
+        rss = statistics.median(probe["rss_mb"] for probe in probes)
+        heavy = ", ".join(probes[-1]["heavy"]) or "-"
+        print(f"{mode:<6} {seconds:>10.2f} {rss:>9.1f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
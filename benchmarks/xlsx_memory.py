@@ -0,0 +1,110 @@
+"""
+Пиковая память при записи XLSX: pd.ExcelWriter и потоковая запись XLSXBuilder.
+
+Каждый замер выполняется в отдельном процессе интерпретатора. Таблицы по
+периодам готовятся заранее, замеряется прирост пикового RSS и время записи
+книги в буфер. Периодов может быть много: отчет за несколько лет с разбивкой
+по месяцам и большим количеством статей. База данных не нужна.
+
+Запуск из корня проекта:
+    PYTHONPATH=. python benchmarks/xlsx_memory.py --years 5 20 --categories 500
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROBE = """
+import io, json, logging, random, resource, time
+from decimal import Decimal
+
+import pandas as pd
+
+from app.api.servises.report_builders.xlsx_builder import XLSXBuilder
+
+logging.disable(logging.DEBUG)
+rng = random.Random(0)
+categories = [f"Статья {{number}}" for number in range({categories})]
+expenses = [
+    (
+        f"{{2000 + year}}-{{month:02d}}",
+        Decimal(rng.randint(100, 100000)) / 100,
+        category,
+    )
+    for year in range({years})
+    for month in range(1, 13)
+    for category in categories
+]
+builder = XLSXBuilder(
+    expenses=expenses, limits={{name: Decimal(50000) for name in categories}}, tg_id=0
+)
+data = builder.prepare_tables()
+del expenses
+
+buffer = io.BytesIO()
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+if "{mode}" == "pandas":
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for period, df in data.items():
+            df.to_excel(writer, sheet_name=period, index=False, float_format="%.2f")
+else:
+    builder.write_data(data=data, buffer=buffer)
+elapsed = time.perf_counter() - started
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "seconds": elapsed,
+    "peak_mb": (after - before) / 1024,
+    "size_mb": buffer.getbuffer().nbytes / 1024 / 1024,
+    "sheets": len(data),
+}}))
+"""
+
+
+def run_probe(root: str, mode: str, years: int, categories: int) -> dict:
+    """
+    Запускает замер в новом процессе.
+
+    :param root: str - корень проекта.
+    :param mode: str - способ записи: pandas или stream.
+    :param years: int - количество лет в отчете.
+    :param categories: int - количество статей в каждом месяце.
+    :return: dict - время записи, прирост пикового RSS, размер файла и число листов.
+    """
+    code = PROBE.format(mode=mode, years=years, categories=categories)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = root
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--categories", type=int, default=500)
+    args = parser.parse_args()
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    print(f"{'лет':>4} {'листов':>7} {'режим':<7} {'пик RSS, МБ':>12} {'время, с':>9}")
+    for years in args.years:
+        for mode in ("pandas", "stream"):
+            probe = run_probe(
+                root=root, mode=mode, years=years, categories=args.categories
+            )
+            print(
+                f"{years:>4} {probe['sheets']:>7} {mode:<7} "
+                f"{probe['peak_mb']:>12.1f} {probe['seconds']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
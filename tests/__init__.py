@@ -0,0 +1,16 @@
+import os
+
+# Настройки приложения обязательны при импорте, для тестов подойдут любые
+# значения: тесты не подключаются ни к Telegram, ни к базе данных.
+for name, value in {
+    "TG_BOT_TOKEN": "123:test",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB_NAME": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POOL_SIZE": "1",
+    "MAX_OVERFLOW": "0",
+    "DEBUG": "False",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,72 @@
+import unittest
+from datetime import date
+from unittest import mock
+
+from app.db.repositories.expense_partitions import ExpensePartitionRepository
+
+
+class FakeSession:
+    """Сессия, которая запоминает SQL и отвечает на проверки из ответов."""
+
+    def __init__(self, existing: set[str] = (), in_default: bool = False):
+        self.existing = set(existing)
+        self.in_default = in_default
+        self.sql: list[str] = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.sql.append(sql)
+        if "to_regclass" in sql:
+            return mock.Mock(scalar=lambda: params["name"] in self.existing)
+        if sql.startswith("SELECT EXISTS"):
+            return mock.Mock(scalar=lambda: self.in_default)
+        return mock.Mock(rowcount=3)
+
+
+class ExpensePartitionRepositoryTestCase(unittest.IsolatedAsyncioTestCase):
+    def test_next_month(self):
+        self.assertEqual(
+            ExpensePartitionRepository.next_month(date(2030, 11, 1)), date(2030, 12, 1)
+        )
+        self.assertEqual(
+            ExpensePartitionRepository.next_month(date(2030, 12, 1)), date(2031, 1, 1)
+        )
+
+    async def test_ensure_creates_missing_months(self):
+        session = FakeSession(existing={"expenses_y2030m12"})
+        created = await ExpensePartitionRepository.ensure(
+            session=session, start=date(2030, 12, 15), months=3
+        )
+
+        self.assertEqual(created, ["expenses_y2031m01", "expenses_y2031m02"])
+        self.assertIn("pg_advisory_xact_lock", session.sql[0])
+        self.assertIn(
+            "CREATE TABLE expenses_y2031m01 PARTITION OF expenses "
+            "FOR VALUES FROM ('2031-01-01') TO ('2031-02-01')",
+            session.sql,
+        )
+        self.assertFalse(any("ATTACH PARTITION" in sql for sql in session.sql))
+
+    async def test_create_moves_rows_from_default(self):
+        session = FakeSession(in_default=True)
+        moved = await ExpensePartitionRepository.create(
+            session=session, month=date(2031, 1, 1)
+        )
+
+        self.assertEqual(moved, 3)
+        self.assertFalse(any("PARTITION OF" in sql for sql in session.sql))
+        statements = [
+            "DELETE FROM expenses_default",
+            "ATTACH PARTITION expenses_y2031m01 "
+            "FOR VALUES FROM ('2031-01-01') TO ('2031-02-01')",
+            "monthly_totals_apply",
+        ]
+        positions = [
+            next(i for i, sql in enumerate(session.sql) if statement in sql)
+            for statement in statements
+        ]
+        self.assertEqual(positions, sorted(positions))
+
+
+if __name__ == "__main__":
+    unittest.main()
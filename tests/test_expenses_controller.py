@@ -0,0 +1,82 @@
+import unittest
+
+from app.api.controller.expenses_controller import ExpensesController
+
+
+class IsBatchTestCase(unittest.TestCase):
+    def test_article_only(self):
+        self.assertFalse(ExpensesController.is_batch(text="продукты"))
+        self.assertFalse(ExpensesController.is_batch(text="еда вне дома"))
+
+    def test_single_line_with_amount(self):
+        self.assertTrue(ExpensesController.is_batch(text="продукты 100"))
+        self.assertTrue(ExpensesController.is_batch(text="еда вне дома 60,5"))
+
+    def test_several_lines(self):
+        self.assertTrue(ExpensesController.is_batch(text="продукты\nтранспорт"))
+
+    def test_message_without_text(self):
+        self.assertFalse(ExpensesController.is_batch(text=None))
+        self.assertFalse(ExpensesController.is_batch(text=""))
+
+
+class ParseBatchTestCase(unittest.TestCase):
+    def parse(self, text: str):
+        return ExpensesController.parse_batch(text=text)
+
+    def test_valid_lines(self):
+        expenses, errors = self.parse("продукты 100\n\nеда вне дома 60.5")
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [(expense.article, expense.amount) for expense in expenses],
+            [("продукты", 100.0), ("еда вне дома", 60.5)],
+        )
+
+    def test_decimal_comma(self):
+        expenses, errors = self.parse("продукты 60,5")
+        self.assertEqual(errors, [])
+        self.assertEqual(expenses[0].amount, 60.5)
+
+    def test_non_finite_amounts(self):
+        for amount in ("nan", "NaN", "inf", "-inf", "infinity"):
+            with self.subTest(amount=amount):
+                expenses, errors = self.parse(f"продукты {amount}")
+                self.assertEqual(expenses, [])
+                self.assertEqual(errors, ["Строка 1: Значение должно быть числом."])
+
+    def test_overflow(self):
+        for amount in ("1e12", "100000000", "99999999.999"):
+            with self.subTest(amount=amount):
+                expenses, errors = self.parse(f"продукты {amount}")
+                self.assertEqual(expenses, [])
+                self.assertEqual(
+                    errors, ["Строка 1: Сумма не должна превышать 99999999.99."]
+                )
+
+    def test_max_amount(self):
+        expenses, errors = self.parse("продукты 99999999.99")
+        self.assertEqual(errors, [])
+        self.assertEqual(expenses[0].amount, 99999999.99)
+
+    def test_not_positive_and_not_number(self):
+        expenses, errors = self.parse("продукты 0\nпродукты -5\nпродукты abc")
+        self.assertEqual(expenses, [])
+        self.assertEqual(
+            errors,
+            [
+                "Строка 1: Значение должно быть больше нуля.",
+                "Строка 2: Значение должно быть больше нуля.",
+                "Строка 3: Значение должно быть числом.",
+            ],
+        )
+
+    def test_errors_keep_line_numbers(self):
+        expenses, errors = self.parse("продукты 10\nкосмос 5\nпродукты")
+        self.assertEqual(len(expenses), 1)
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(errors[0].startswith("Строка 2: "))
+        self.assertEqual(errors[1], "Строка 3: нужно указать статью и сумму.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.controller import expenses_controller
+from app.api.controller.expenses_controller import ExpensesController
+from app.api.controller.user_controller import UserController
+from app.api.servises.fsm.postgres_storage import PostgresStorage
+from app.db.repositories.expense_articles import ExpenseArticleRepository
+
+# Траты (id, updated_at, summ) от новых к старым, у пар трат совпадает время.
+EXPENSES = sorted(
+    (
+        (number, datetime(2025, 1, 1) + timedelta(hours=number // 2), Decimal(number))
+        for number in range(1, 21)
+    ),
+    key=lambda record: (record[1], record[0]),
+    reverse=True,
+)
+
+
+async def get_records_page(session, tg_id, category_id, limit, before=None, after=None):
+    """Выборка страницы из EXPENSES по тем же правилам, что и запрос в базу."""
+
+    def key(record):
+        return record[1], record[0]
+
+    if after is not None:
+        newer = sorted((record for record in EXPENSES if key(record) > after), key=key)
+        return newer[:limit][::-1]
+    return [record for record in EXPENSES if before is None or key(record) < before][
+        :limit
+    ]
+
+
+class GetRecordsPageQueryTestCase(unittest.IsolatedAsyncioTestCase):
+    async def query(self, **kwargs) -> str:
+        session = mock.Mock(
+            execute=mock.AsyncMock(return_value=mock.Mock(all=lambda: []))
+        )
+        await ExpenseArticleRepository.get_records_page(
+            session=session, tg_id=1, category_id=2, limit=9, **kwargs
+        )
+        stmt = session.execute.await_args.args[0]
+        return str(stmt.compile(dialect=postgresql.dialect()))
+
+    async def test_first_page(self):
+        sql = await self.query()
+        self.assertNotIn("OFFSET", sql)
+        self.assertNotIn("(expenses.updated_at, expenses.id) <", sql)
+        self.assertIn("ORDER BY expenses.updated_at DESC, expenses.id DESC", sql)
+
+    async def test_older_page(self):
+        sql = await self.query(before=(datetime(2025, 1, 1), 5))
+        self.assertIn("(expenses.updated_at, expenses.id) < (", sql)
+        self.assertIn("ORDER BY expenses.updated_at DESC, expenses.id DESC", sql)
+
+    async def test_newer_page(self):
+        sql = await self.query(after=(datetime(2025, 1, 1), 5))
+        self.assertIn("(expenses.updated_at, expenses.id) > (", sql)
+        self.assertIn("ORDER BY expenses.updated_at, expenses.id", sql)
+        self.assertNotIn("OFFSET", sql)
+
+
+class GetExpensesPageTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patches = (
+            mock.patch.object(
+                ExpenseArticleRepository, "get_records_page", get_records_page
+            ),
+            mock.patch.object(
+                UserController, "get_timezone", mock.AsyncMock(return_value=3)
+            ),
+            mock.patch.object(ExpensesController, "page_size", 8),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def get_page(self, page=None, direction="older"):
+        return await ExpensesController.get_expenses_page(
+            session=None, tg_id=1, category_id=1, page=page, direction=direction
+        )
+
+    @staticmethod
+    def ids(page) -> list[int]:
+        return [record[0] for record in page.records]
+
+    async def test_walk_older_and_back(self):
+        first = await self.get_page()
+        self.assertEqual(self.ids(first), list(range(20, 12, -1)))
+        self.assertEqual((first.has_newer, first.has_older), (False, True))
+        self.assertEqual(first.labels[0], "20 - 01.01.2025 13:00")
+
+        second = await self.get_page(page=first)
+        self.assertEqual(self.ids(second), list(range(12, 4, -1)))
+        self.assertEqual((second.has_newer, second.has_older), (True, True))
+
+        last = await self.get_page(page=second)
+        self.assertEqual(self.ids(last), [4, 3, 2, 1])
+        self.assertEqual((last.has_newer, last.has_older), (True, False))
+
+        back = await self.get_page(page=last, direction="newer")
+        self.assertEqual(self.ids(back), self.ids(second))
+        self.assertEqual((back.has_newer, back.has_older), (True, True))
+
+        top = await self.get_page(page=back, direction="newer")
+        self.assertEqual(self.ids(top), self.ids(first))
+        self.assertEqual((top.has_newer, top.has_older), (False, True))
+
+    async def test_page_survives_fsm_storage(self):
+        page = await self.get_page()
+        data = PostgresStorage._loads(PostgresStorage._dumps({"page": page.to_state()}))
+        self.assertEqual(
+            expenses_controller.ExpensesPage.from_state(data["page"]), page
+        )
+
+    async def test_exact_page_boundary(self):
+        with mock.patch.object(ExpensesController, "page_size", 10):
+            first = await self.get_page()
+            second = await self.get_page(page=first)
+        self.assertEqual(self.ids(second), list(range(10, 0, -1)))
+        self.assertFalse(second.has_older)
+
+
+if __name__ == "__main__":
+    unittest.main()
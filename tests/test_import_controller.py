@@ -0,0 +1,179 @@
+import io
+import unittest
+import zipfile
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from app.api.controller.import_controller import ImportController, ImportResult
+from app.api.controller.user_controller import UserController
+from app.api.servises.importers import CorruptFileError, ExpenseFileReader
+from app.db.models.expense import EXPENSE_CATEGORY_IDS
+from app.db.repositories.expense_articles import ExpenseArticleRepository
+
+PRODUCTS = EXPENSE_CATEGORY_IDS["products"]
+
+
+class ToRecordTestCase(unittest.TestCase):
+    def to_record(self, row: list, timezone: int = 0):
+        return ImportController._to_record(
+            number=2, row=row, tg_id=1, timezone=timezone
+        )
+
+    def test_valid_row(self):
+        self.assertEqual(
+            self.to_record(["01.05.2025 12:30", "Продукты", "100.5"], timezone=3),
+            (1, PRODUCTS, Decimal("100.50"), datetime(2025, 5, 1, 9, 30)),
+        )
+
+    def test_xlsx_cells(self):
+        record = self.to_record([datetime(2025, 5, 1), "продукты", 60.5])
+        self.assertEqual(record[2:], (Decimal("60.50"), datetime(2025, 5, 1)))
+
+    def test_decimal_comma(self):
+        record = self.to_record(["2025-05-01", "продукты", "60,5"])
+        self.assertEqual(record[2], Decimal("60.50"))
+
+    def test_non_finite_amounts(self):
+        for amount in ("nan", "inf", "-inf"):
+            with self.subTest(amount=amount):
+                self.assertEqual(
+                    self.to_record(["2025-05-01", "продукты", amount]),
+                    "Строка 2: Значение должно быть числом.",
+                )
+
+    def test_overflow(self):
+        for amount in ("1e12", "99999999.999", 10**9):
+            with self.subTest(amount=amount):
+                self.assertEqual(
+                    self.to_record(["2025-05-01", "продукты", amount]),
+                    "Строка 2: Сумма не должна превышать 99999999.99.",
+                )
+
+    def test_zero_amount(self):
+        self.assertEqual(
+            self.to_record(["2025-05-01", "продукты", 0]),
+            "Строка 2: Значение должно быть больше нуля.",
+        )
+
+    def test_bad_date_and_article(self):
+        self.assertEqual(
+            self.to_record(["31.02.2025", "продукты", "1"]),
+            "Строка 2: Дата должна быть в формате ДД.ММ.ГГГГ или ГГГГ-ММ-ДД.",
+        )
+        self.assertTrue(
+            self.to_record(["2025-05-01", "космос", "1"]).startswith(
+                "Строка 2: Статья расходов"
+            )
+        )
+
+    def test_date_out_of_range(self):
+        error = "Строка 2: Дата должна быть не раньше 1970 года и не позже 2099 года."
+        self.assertEqual(
+            self.to_record(["01.01.0001", "продукты", "1"], timezone=3), error
+        )
+        self.assertEqual(
+            self.to_record([datetime(9999, 12, 31, 23), "продукты", "1"], timezone=-12),
+            error,
+        )
+
+    def test_short_row(self):
+        self.assertEqual(
+            self.to_record(["2025-05-01", "продукты"]),
+            "Строка 2: нужны дата, статья и сумма.",
+        )
+
+
+class ReadChunkTestCase(unittest.TestCase):
+    def test_header_is_skipped_and_errors_are_capped(self):
+        rows = iter(
+            [(1, ["Дата", "Статья", "Сумма"]), (2, ["2025-05-01", "продукты", "1"])]
+            + [(number, ["2025-05-01", "продукты", "nan"]) for number in range(3, 8)]
+        )
+        result = ImportResult()
+        with mock.patch.object(ImportController, "max_errors", 2):
+            records, done = ImportController._read_chunk(
+                rows=rows, tg_id=1, timezone=0, result=result
+            )
+        self.assertTrue(done)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(result.failed, 5)
+        self.assertEqual(len(result.errors), 2)
+
+    def test_numeric_first_row_is_data(self):
+        rows = iter([(1, ["2025-05-01", "продукты", "60,5"])])
+        records, _ = ImportController._read_chunk(
+            rows=rows, tg_id=1, timezone=0, result=ImportResult()
+        )
+        self.assertEqual(len(records), 1)
+
+
+class ExpenseFileReaderTestCase(unittest.TestCase):
+    def test_corrupt_files(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as file:
+            file.writestr("readme.txt", "not a workbook")
+        files = {
+            "broken.xlsx": b"not a zip",
+            "empty.xlsx": archive.getvalue(),
+            "broken.csv": b"\x98\x98;1;2\n",
+        }
+        for name, content in files.items():
+            with self.subTest(name=name):
+                with self.assertRaises(CorruptFileError):
+                    list(ExpenseFileReader(io.BytesIO(content), name))
+
+
+class ImportExpensesTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_csv_is_loaded_in_chunks(self):
+        lines = ["Дата;Статья;Сумма"]
+        lines += [f"01.05.2025;продукты;{number},5" for number in range(1, 8)]
+        lines += ["01.05.2025;продукты;nan"]
+        file = io.BytesIO("\n".join(lines).encode("cp1251"))
+        copy_many = mock.AsyncMock(side_effect=lambda session, records: len(records))
+        session = mock.Mock(info={})
+
+        with mock.patch.object(
+            UserController, "get_timezone", mock.AsyncMock(return_value=0)
+        ), mock.patch.object(
+            ExpenseArticleRepository, "copy_many", copy_many
+        ), mock.patch.object(
+            ImportController, "chunk_size", 3
+        ):
+            result = await ImportController.import_expenses(
+                session=session, tg_id=1, file=file, filename="expenses.csv"
+            )
+
+        self.assertEqual((result.imported, result.failed), (7, 1))
+        self.assertEqual(result.errors, ["Строка 9: Значение должно быть числом."])
+        self.assertEqual(
+            [len(call.kwargs["records"]) for call in copy_many.await_args_list],
+            [2, 3, 2],
+        )
+        self.assertEqual(len(session.info["after_commit"]), 1)
+
+
+class CopyManyTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_copy_records_to_expenses(self):
+        driver_connection = mock.Mock(copy_records_to_table=mock.AsyncMock())
+        raw_connection = mock.Mock(driver_connection=driver_connection)
+        connection = mock.Mock(
+            get_raw_connection=mock.AsyncMock(return_value=raw_connection)
+        )
+        session = mock.Mock(connection=mock.AsyncMock(return_value=connection))
+        records = [(1, PRODUCTS, Decimal("1.00"), datetime(2025, 5, 1))]
+
+        count = await ExpenseArticleRepository.copy_many(
+            session=session, records=records
+        )
+
+        self.assertEqual(count, 1)
+        driver_connection.copy_records_to_table.assert_awaited_once_with(
+            "expenses",
+            records=records,
+            columns=("user_id", "category_id", "summ", "updated_at"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from app.api.controller.report_controllers import ParametrizedReport
+
+
+class LaunchTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_connection_is_released_before_building_file(self):
+        calls = []
+        session = mock.Mock(
+            info={"after_commit": [lambda: calls.append("after_commit")]},
+            commit=mock.AsyncMock(side_effect=lambda: calls.append("commit")),
+        )
+        executor = mock.Mock(
+            run=mock.AsyncMock(side_effect=lambda **kwargs: calls.append("run"))
+        )
+        cache = mock.Mock(get=lambda key: None, version=lambda tg_id: 0)
+        report = ParametrizedReport(
+            tg_id=1,
+            mapping={"products": "Продукты"},
+            template={},
+            session=session,
+            start=datetime(2025, 1, 1),
+            end=datetime(2025, 1, 31),
+            dates_str_without_timezone="01.01.2025-31.01.2025",
+            group_type="article_group_type",
+            group_type_period=None,
+            file_type="to_csv",
+        )
+
+        with mock.patch.object(
+            ParametrizedReport,
+            "_get_expenses_and_limits",
+            mock.AsyncMock(side_effect=lambda: calls.append("read") or ([], {})),
+        ), mock.patch.object(
+            ParametrizedReport, "_executor", executor
+        ), mock.patch.object(
+            ParametrizedReport, "_cache", cache
+        ):
+            await report.launch()
+
+        self.assertEqual(calls, ["read", "commit", "after_commit", "run"])
+        self.assertNotIn("after_commit", session.info)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import pickle
+import unittest
+import zlib
+from unittest import mock
+
+from aiogram.fsm.storage.base import StorageKey
+
+from app.api.servises.fsm.postgres_storage import CachedRecord, PostgresStorage
+from app.db.repositories.fsm_storage import FSMRepository
+
+
+class SerializationTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        data = {"expense_article": "продукты", "page": {"records": [[1, "x"]]}}
+        self.assertEqual(PostgresStorage._loads(PostgresStorage._dumps(data)), data)
+
+    def test_empty_data(self):
+        self.assertIsNone(PostgresStorage._dumps({}))
+        self.assertEqual(PostgresStorage._loads(None), {})
+
+    def test_objects_are_not_serialized(self):
+        with self.assertRaises(TypeError):
+            PostgresStorage._dumps({"controller": object()})
+
+    def test_pickle_payload_is_not_executed(self):
+        payload = zlib.compress(pickle.dumps({"key": "value"}))
+        with self.assertRaises(ValueError):
+            PostgresStorage._loads(payload)
+
+    def test_payload_must_be_object(self):
+        with self.assertRaises(ValueError):
+            PostgresStorage._loads(zlib.compress(b"[1, 2]"))
+
+
+class StorageTestCase(unittest.IsolatedAsyncioTestCase):
+    def make_storage(self, **kwargs) -> PostgresStorage:
+        session = mock.MagicMock()
+        session.__aenter__.return_value = session
+        return PostgresStorage(
+            session_maker=lambda: session, flush_interval=60, **kwargs
+        )
+
+    async def test_set_data_rejects_objects(self):
+        storage = self.make_storage()
+        key = StorageKey(bot_id=1, chat_id=2, user_id=3)
+
+        with mock.patch.object(
+            FSMRepository, "read", mock.AsyncMock(return_value=None)
+        ), self.assertRaises(TypeError):
+            await storage.set_data(key=key, data={"controller": object()})
+
+        self.assertFalse(storage._dirty)
+        await storage.close()
+
+    async def test_flush_notifies_other_processes(self):
+        storage = self.make_storage(engine=mock.Mock())
+        storage._cache["fsm:1"] = CachedRecord(state="state", data={"page": 1})
+        storage._dirty.add("fsm:1")
+        notify = mock.AsyncMock()
+
+        with mock.patch.object(FSMRepository, "notify", notify), mock.patch.object(
+            FSMRepository, "upsert", mock.AsyncMock()
+        ):
+            await storage.flush()
+
+        payload = json.loads(notify.await_args.kwargs["payload"])
+        self.assertEqual(payload, {"sender": storage._sender, "keys": ["fsm:1"]})
+
+    def test_notification_drops_clean_records(self):
+        storage = self.make_storage()
+        storage._cache["fsm:1"] = CachedRecord(state="state")
+        storage._cache["fsm:2"] = CachedRecord(state="state")
+        storage._dirty.add("fsm:2")
+
+        storage._on_notify(
+            None, 0, "fsm_storage", json.dumps({"sender": "other", "keys": ["fsm:1"]})
+        )
+        storage._on_notify(
+            None, 0, "fsm_storage", json.dumps({"sender": "other", "keys": ["fsm:2"]})
+        )
+
+        self.assertEqual(list(storage._cache), ["fsm:2"])
+
+    def test_own_notification_is_ignored(self):
+        storage = self.make_storage()
+        storage._cache["fsm:1"] = CachedRecord(state="state")
+
+        storage._on_notify(
+            None,
+            0,
+            "fsm_storage",
+            json.dumps({"sender": storage._sender, "keys": ["fsm:1"]}),
+        )
+
+        self.assertIn("fsm:1", storage._cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
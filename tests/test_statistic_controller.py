@@ -0,0 +1,32 @@
+import json
+import unittest
+from datetime import datetime
+
+from app.api.controller.statistic_controller import StatisticController
+from app.api.servises.fsm.states import StatisticStates
+
+
+class StateTestCase(unittest.TestCase):
+    def test_round_trip_through_json(self):
+        controller = StatisticController(
+            tg_id=1, mapping={}, report_type="parametrized", timezone=3, template={}
+        )
+        controller.target_state = StatisticStates.parametrized_end_period_days.state
+        controller.set_year(year="2025", edge="start")
+        controller.set_month(month="Март", edge="start")
+        controller.set_group_type(group_type="period_group_type")
+        controller.set_group_type_period(group_type_period="month_group_type")
+
+        data = json.loads(json.dumps(controller.to_state()))
+        restored = StatisticController.from_state(data=data, mapping={}, template={})
+
+        self.assertEqual(restored.to_state(), controller.to_state())
+        self.assertEqual(restored.start, datetime(2025, 3, 1))
+        self.assertEqual(restored.timezone, 3)
+        self.assertEqual(
+            restored.target_state, StatisticStates.parametrized_end_period_days
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from unittest import mock
+
+from app.api.controller.user_controller import UserController, UserInfo
+from app.db.models import User
+from app.db.repositories.user import UserRepository
+
+
+class GetUserTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        UserController._cache.clear()
+
+    async def test_cache_keeps_snapshot_instead_of_model(self):
+        model = User(tg_id=1, name="test", timezone=3)
+        read = mock.AsyncMock(return_value=model)
+        session = mock.Mock(info={})
+
+        with mock.patch.object(UserRepository, "read", read):
+            user = await UserController.get_user(session=session, tg_id=1)
+            # Модель из сессии запроса после отката или закрытия сессии не читается.
+            model.timezone = None
+            cached = await UserController.get_user(session=session, tg_id=1)
+
+        self.assertEqual(user, UserInfo(tg_id=1, name="test", timezone=3))
+        self.assertIs(cached, user)
+        self.assertEqual(read.await_count, 1)
+
+    async def test_missing_user_is_not_cached(self):
+        read = mock.AsyncMock(return_value=None)
+        session = mock.Mock(info={})
+
+        with mock.patch.object(UserRepository, "read", read):
+            self.assertIsNone(await UserController.get_user(session=session, tg_id=2))
+            self.assertEqual(
+                await UserController.get_timezone(session=session, tg_id=2), 0
+            )
+
+        self.assertEqual(read.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import io
+import unittest
+import zipfile
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from openpyxl import load_workbook
+
+from app.api.servises.report_builders import XLSXBuilder
+
+EXPENSES = [
+    (f"2025-{month:02}", Decimal(month * 10) / 3, "products") for month in range(1, 4)
+]
+
+
+class XLSXBuilderTestCase(unittest.TestCase):
+    def build(self):
+        builder = XLSXBuilder(
+            expenses=EXPENSES, limits={"products": Decimal(100)}, tg_id=1
+        )
+        return builder.generate_report()
+
+    def test_same_data_gives_same_bytes(self):
+        first = self.build()
+        with mock.patch("time.time", return_value=2_000_000_000):
+            second = self.build()
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first.digest, second.digest)
+
+    def test_fixed_times(self):
+        content = self.build().content
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertEqual(
+                {entry.date_time for entry in archive.infolist()},
+                {(1980, 1, 1, 0, 0, 0)},
+            )
+        workbook = load_workbook(io.BytesIO(content))
+        self.assertEqual(workbook.properties.modified, datetime(1980, 1, 1))
+        self.assertEqual(workbook.sheetnames, ["2025-01", "2025-02", "2025-03"])
+
+
+if __name__ == "__main__":
+    unittest.main()